@@ -2,9 +2,14 @@ from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import time
+import asyncio
 import logging
 from app.config import Settings, EurekaClient
 from app.utils.db_utils import initialize_database
+from app.utils.blob_utils import close_blob_clients
+from app.utils.http_utils import close_http_client
+from app.utils.handwritten_utils import close_form_recognizer_clients
+from app.utils.transcription_utils import preload_whisper_models
 import sys
 
 # Set up logging
@@ -76,6 +81,9 @@ async def startup_event():
         logger.info("Application will continue running without database initialization")
         # Continue running even if database initialization fails
 
+    # Load the Whisper models in the background so the first YouTube request finds them warm
+    asyncio.get_running_loop().run_in_executor(None, preload_whisper_models)
+
     # Register with Eureka with retry logic
     try:
         registered = False
@@ -105,6 +113,22 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error deregistering from Eureka: {str(e)}")
 
+    # Close pooled blob storage, HTTP and Form Recognizer connections; one failure must not skip the others
+    try:
+        await close_blob_clients()
+    except Exception as e:
+        logger.error(f"Error closing blob storage clients: {str(e)}")
+
+    try:
+        await close_http_client()
+    except Exception as e:
+        logger.error(f"Error closing HTTP client: {str(e)}")
+
+    try:
+        await close_form_recognizer_clients()
+    except Exception as e:
+        logger.error(f"Error closing Form Recognizer clients: {str(e)}")
+
 
 @app.get("/")
 async def root():
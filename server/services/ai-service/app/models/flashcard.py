@@ -107,6 +107,7 @@ class FlashcardCreate(BaseModel):
     focus_areas: Optional[List[str]] = None
     card_count: int = 20
     content_type: Optional[ContentType] = None  # If None, type will be auto-detected
+    pages: Optional[List[str]] = None  # Image URLs / blob names of a handwritten-notes bundle; content_url names it
 
     model_config = {
         "json_schema_extra": {
@@ -36,6 +36,12 @@ class ContentType(str, Enum):
     IMAGE = "image"
     UNKNOWN = "unknown"
 
+class SummaryStrategy(str, Enum):
+    """Enum for summarization strategies"""
+    AUTO = "auto"  # One call if the document fits the context window, map_reduce otherwise
+    MAP_REDUCE = "map_reduce"
+    REFINE = "refine"
+
 class Summary(BaseModel):
     """
     Data model for a document summary.
@@ -90,6 +96,8 @@ class SummaryCreate(BaseModel):
     summary_length: str = "medium"
     tags: List[str] = []
     content_type: Optional[ContentType] = None  # If None, type will be auto-detected
+    strategy: Optional[SummaryStrategy] = None  # If None, chosen from the document's token count
+    pages: Optional[List[str]] = None  # Image URLs / blob names of a handwritten-notes bundle; content_url names it
 
     model_config = {
         "json_schema_extra": {
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Query, Header
 from app.models.flashcard import FlashcardCreate, FlashcardResponse, FlashcardUpdateRequest, FlashcardReviewRequest
 from app.services.flashcard_service import (
@@ -45,15 +46,18 @@ async def create_flashcards(flashcard_data: FlashcardCreate):
     # User ID comes directly from the request payload
     user_id = flashcard_data.user_id
 
-    # Process the content synchronously (client waits for complete processing)
-    result = create_flashcards_from_content(
+    # Process the content synchronously (client waits for complete processing) on a worker
+    # thread: sniffing, downloading and the LLM calls would otherwise block the event loop
+    result = await asyncio.to_thread(
+        create_flashcards_from_content,
         content_url=flashcard_data.content_url,
         user_id=user_id,
         difficulty_level=flashcard_data.difficulty_level,
         tags=flashcard_data.tags,
         focus_areas=flashcard_data.focus_areas,
         card_count=flashcard_data.card_count,
-        content_type=flashcard_data.content_type
+        content_type=flashcard_data.content_type,
+        pages=flashcard_data.pages
     )
 
     print(result)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from fastapi import APIRouter, HTTPException, Header
@@ -19,13 +20,17 @@ async def create_summary(summary_data: SummaryCreate, x_user_id: str = Header(..
     """
     # User ID comes from the header
     user_id = x_user_id
-    # Process the content synchronously (client waits for complete processing)
-    result = summarize_content(
+    # Process the content synchronously (client waits for complete processing) on a worker
+    # thread: sniffing, downloading and the LLM calls would otherwise block the event loop
+    result = await asyncio.to_thread(
+        summarize_content,
         content_url=summary_data.content_url,
         user_id=user_id,
         prompt=summary_data.prompt,
         summary_length=summary_data.summary_length,
-        content_type=summary_data.content_type
+        content_type=summary_data.content_type,
+        strategy=summary_data.strategy,
+        pages=summary_data.pages
     )
 
     # Check if processing was successful
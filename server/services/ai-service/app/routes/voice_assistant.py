@@ -64,13 +64,56 @@ class ProcessedPresentationResponse(BaseModel):
     total_slides: int
     slides: List[Dict[str, Any]]
 
+# Minimum change in download percentage between progress messages
+DOWNLOAD_PROGRESS_STEP = 5
+
+
+def make_download_progress_callback(session_id: str):
+    """
+    Creates a blob download progress callback that reports to the session's websocket.
+    Messages are only sent every DOWNLOAD_PROGRESS_STEP percent to avoid flooding the client.
+
+    Args:
+        session_id: Session whose websocket receives the progress
+
+    Returns:
+        Coroutine function receiving (bytes downloaded, total bytes)
+    """
+    last_reported = {"percent": -DOWNLOAD_PROGRESS_STEP}
+
+    async def report_progress(current: int, total: Optional[int]):
+        if not total or not websocket_manager.is_connected(session_id):
+            return
+
+        percent = int(current * 100 / total)
+        if percent - last_reported["percent"] < DOWNLOAD_PROGRESS_STEP and current < total:
+            return
+        last_reported["percent"] = percent
+
+        await websocket_manager.send_json(session_id, {
+            "type": "processing_status",
+            "data": {
+                "status": "downloading",
+                "message": f"Downloading presentation... {percent}%",
+                "progress": percent,
+                "bytes_downloaded": current,
+                "total_bytes": total
+            }
+        })
+
+    return report_progress
+
+
 # Helper function for background processing
 async def process_presentation_in_background(session_id: str, presentation_url: str):
     """Process a presentation in the background to avoid blocking"""
     try:
         # Process the PowerPoint from Azure Blob Storage URL
         logger.info(f"Processing PowerPoint from URL: {presentation_url}")
-        presentation_extract = await process_powerpoint_from_url(presentation_url)
+        presentation_extract = await process_powerpoint_from_url(
+            presentation_url,
+            progress_callback=make_download_progress_callback(session_id)
+        )
 
         # Convert to response format
         slides_data = []
@@ -190,7 +233,10 @@ async def process_presentation(
 
         # For synchronous API, we'll process enough to return a response
         # This performs a minimal initial processing for immediate response
-        presentation_extract = await process_powerpoint_from_url(request.presentation_url)
+        presentation_extract = await process_powerpoint_from_url(
+            request.presentation_url,
+            progress_callback=make_download_progress_callback(request.session_id)
+        )
 
         # Create a minimal initial response
         initial_slides = []
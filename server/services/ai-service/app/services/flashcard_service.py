@@ -526,7 +526,8 @@ def create_flashcards_from_content(
         tags: List[str] = None,
         focus_areas: List[str] = None,
         card_count: int = 20,
-        content_type: str = None
+        content_type: str = None,
+        pages: List[str] = None
 ) -> dict:
     """
     Generates flashcards from any content type, optimized for effective learning.
@@ -539,18 +540,22 @@ def create_flashcards_from_content(
         focus_areas: Optional list of topics to focus on when generating flashcards
         card_count: Target number of flashcards to generate
         content_type: Type of content. If None, will be auto-detected
+        pages: Image URLs or blob names of a handwritten-notes bundle, in page order;
+               content_url then names the bundle
 
     Returns:
         dict: Dictionary containing flashcard data, status, and any error messages
     """
     try:
-        # 1. Auto-detect content type if not provided
-        if not content_type:
+        # 1. Auto-detect content type if not provided; a page list is a bundle of note images
+        if pages:
+            content_type = "image"
+        elif not content_type:
             content_type = detect_content_type(content_url)
             print(f"Auto-detected content type: {content_type}")
 
         # 2. Load content from URL using the appropriate loader
-        documents = load_content(content_url, content_type)
+        documents = load_content(content_url, content_type, pages=pages)
         if not documents:
             return {
                 "status": "error",
@@ -563,6 +568,7 @@ def create_flashcards_from_content(
             "url": content_url,
             "content_type": content_type,
             "page_count": len(documents),
+            "content_hash": documents[0].metadata.get("content_hash"),
             "uploaded_at": datetime.datetime.utcnow()
         }
 
@@ -634,6 +640,11 @@ def create_flashcards_from_content(
 
         if existing_doc:
             document_id = existing_doc["_id"]
+
+            # Keep the recorded content hash in sync with the bytes we just loaded
+            content_hash = doc_metadata["content_hash"]
+            if content_hash and existing_doc.get("content_hash") != content_hash:
+                docs_collection.update_one({"_id": document_id}, {"$set": {"content_hash": content_hash}})
         else:
             document_result = docs_collection.insert_one(doc_metadata)
             document_id = document_result.inserted_id
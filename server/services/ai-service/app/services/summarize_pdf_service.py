@@ -230,6 +230,7 @@ def summarize_pdf_notes(pdf_url: str, user_id: str, prompt: str = None, summary_
             "title": os.path.basename(pdf_url),
             "url": pdf_url,
             "page_count": len(documents),
+            "content_hash": documents[0].metadata.get("content_hash"),
             "uploaded_at": datetime.datetime.utcnow()
         }
 
@@ -382,6 +383,11 @@ def summarize_pdf_notes(pdf_url: str, user_id: str, prompt: str = None, summary_
 
         if existing_doc:
             document_id = existing_doc["_id"]
+
+            # Keep the recorded content hash in sync with the bytes we just loaded
+            content_hash = doc_metadata["content_hash"]
+            if content_hash and existing_doc.get("content_hash") != content_hash:
+                docs_collection.update_one({"_id": document_id}, {"$set": {"content_hash": content_hash}})
         else:
             document_result = docs_collection.insert_one(doc_metadata)
             document_id = document_result.inserted_id
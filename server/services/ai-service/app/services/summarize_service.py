@@ -4,14 +4,54 @@ from langchain.chains.summarize import load_summarize_chain
 from langchain_openai import ChatOpenAI
 
 from langchain.prompts import PromptTemplate
-from app.utils.content_loader import load_content, detect_content_type
+from langchain.schema import Document
+from app.utils.content_loader import iter_content, detect_content_type, get_content_identity
 from app.utils.db_utils import get_mongodb_client
+from app.utils.async_utils import iterate_in_thread, run_coroutine_sync
 from bson import ObjectId
 import os
+import re
+import json
+import asyncio
+import hashlib
 import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, AsyncIterator
 from functools import lru_cache
 
+# Shared summary cache settings: one summary per (content, prompt, length, model, templates)
+# is reused across users until it expires. Entries are never changed, and the summary
+# records of users point at them, so expired entries stay readable.
+SUMMARY_MODEL = "gpt-4o-mini"
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() == "true"
+SUMMARY_CACHE_TTL_HOURS = int(os.getenv("SUMMARY_CACHE_TTL_HOURS", "168"))
+SUMMARY_TEMPLATE_VERSION = "1"  # Bump when summary output changes outside the prompt templates
+UNCACHEABLE_DOCUMENT_TYPES = ("youtube_error", "youtube_metadata_only")  # Loader fallbacks, not the content
+
+# Streaming summarization settings
+SUMMARY_STRATEGIES = ("auto", "map_reduce", "refine")
+# Documents up to this many tokens are summarized by one "stuff" call (gpt-4o-mini has a 128k window)
+STUFF_MAX_TOKENS = int(os.getenv("SUMMARY_STUFF_MAX_TOKENS", "96000"))
+MAP_BATCH_SIZE = 6
+LARGE_DOCUMENT_CHUNKS = 20  # Above this many chunks, map batches grow to LARGE_MAP_BATCH_SIZE
+LARGE_MAP_BATCH_SIZE = 8
+
+# Chunk packing settings: pages, slides and sections are packed into chunks of up to
+# SUMMARY_CHUNK_TOKENS tokens, so each map call fills its budget instead of a fixed character count
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
+SUMMARY_CHUNK_OVERLAP_TOKENS = int(os.getenv("SUMMARY_CHUNK_OVERLAP_TOKENS", "200"))  # Only when a page is split
+SUMMARY_TOKENIZER_MODEL = os.getenv("SUMMARY_TOKENIZER_MODEL", "gpt-4o-mini")
+CHARS_PER_TOKEN = 4  # Estimate used when tiktoken is not installed
+
+# Map phase settings: batch summaries run concurrently, each retried on its own
+MAP_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))  # LLM calls in flight per document
+MAP_MAX_RETRIES = int(os.getenv("SUMMARY_MAP_RETRIES", "2"))  # Extra attempts for a failed batch
+MAP_RETRY_BACKOFF_SECONDS = float(os.getenv("SUMMARY_MAP_RETRY_BACKOFF_SECONDS", "2"))
+
+# Reduce phase settings: intermediate summaries are collapsed in parallel groups of at most
+# SUMMARY_REDUCE_FAN_IN until they fit SUMMARY_REDUCE_TOKENS for the final combine
+REDUCE_FAN_IN = max(2, int(os.getenv("SUMMARY_REDUCE_FAN_IN", "8")))
+REDUCE_TOKEN_BUDGET = int(os.getenv("SUMMARY_REDUCE_TOKENS", "12000"))
+
 
 def get_summary_by_id(summary_id: str) -> dict:
     """
@@ -36,6 +76,9 @@ def get_summary_by_id(summary_id: str) -> dict:
                 "message": f"Summary with ID {summary_id} not found"
             }
 
+        # Shared summaries are stored once, in the summary cache
+        attach_shared_summary_texts([summary])
+
         # Convert ObjectId to string for JSON serialization
         summary["_id"] = str(summary["_id"])
         summary["document_id"] = str(summary["document_id"])
@@ -75,12 +118,12 @@ def get_summaries_for_user(user_id: str, limit: int = 10) -> dict:
             {"user_id": user_id}
         ).sort("created_at", -1).limit(limit)
 
-        summaries = []
-        for summary in cursor:
+        summaries = list(cursor)
+        attach_shared_summary_texts(summaries)
+        for summary in summaries:
             # Convert ObjectId to string for JSON serialization
             summary["_id"] = str(summary["_id"])
             summary["document_id"] = str(summary["document_id"])
-            summaries.append(summary)
 
         return {
             "status": "success",
@@ -102,32 +145,104 @@ def split_into_chunks(documents: List[Any],
                       chunk_overlap: int = None,
                       content_type: str = "pdf") -> List[Any]:
     """
-    Splits documents into smaller chunks suitable for LLM processing with content-specific optimization.
+    Packs documents into chunks that fill the token budget of one LLM call.
 
     Args:
         documents: List of document objects from content loader
-        chunk_size: Maximum size of each chunk in characters (auto-optimized if None)
-        chunk_overlap: Overlap between chunks in characters (auto-optimized if None)
+        chunk_size: Token budget of each chunk (SUMMARY_CHUNK_TOKENS if None)
+        chunk_overlap: Token overlap when a single document has to be split (SUMMARY_CHUNK_OVERLAP_TOKENS if None)
         content_type: Type of content for optimization
 
     Returns:
         List of document chunks
     """
-    # Optimized chunking parameters based on content type
-    if chunk_size is None or chunk_overlap is None:
-        chunk_configs = {
-            'pdf': {'chunk_size': 2000, 'chunk_overlap': 200},
-            'youtube': {'chunk_size': 3000, 'chunk_overlap': 300},  # Longer for transcripts
-            'powerpoint': {'chunk_size': 1200, 'chunk_overlap': 120},  # Shorter for slides
-            'image': {'chunk_size': 1500, 'chunk_overlap': 150},
-            'webpage': {'chunk_size': 2000, 'chunk_overlap': 200},
-            'default': {'chunk_size': 1800, 'chunk_overlap': 180}
-        }
-        config = chunk_configs.get(content_type, chunk_configs['default'])
-        chunk_size = chunk_size or config['chunk_size']
-        chunk_overlap = chunk_overlap or config['chunk_overlap']
+    return list(iter_chunks(documents, chunk_size, chunk_overlap, content_type))
+
+
+@lru_cache(maxsize=1)
+def get_token_encoder() -> Any:
+    """
+    Returns the tiktoken encoding of the summarization model, or None if tiktoken
+    is unavailable and token counts are estimated from the text length
+
+    Returns:
+        tiktoken.Encoding: Encoding used to count tokens
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        print("tiktoken not installed, estimating token counts from text length")
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(SUMMARY_TOKENIZER_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"Could not load tokenizer for {SUMMARY_TOKENIZER_MODEL} ({e}), estimating token counts")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts the tokens of a text with the summarization model's tokenizer
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Token count
+    """
+    encoder = get_token_encoder()
+    if encoder is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def _build_chunk(documents: List[Any]) -> Document:
+    """
+    Joins consecutive documents into one chunk, keeping the first document's metadata
+    and recording how many documents and tokens the chunk holds
+
+    Args:
+        documents: Documents (pages, slides, sections) packed into the chunk
+
+    Returns:
+        Document: Chunk with token_count and document_count metadata
+    """
+    text = "\n\n".join(document.page_content for document in documents)
+    metadata = dict(documents[0].metadata or {})
+    metadata["document_count"] = len(documents)
+    metadata["token_count"] = count_tokens(text)
+    return Document(page_content=text, metadata=metadata)
+
 
-    # Content-specific separators for better chunking
+def iter_chunks(documents: Iterable[Any],
+                chunk_size: int = None,
+                chunk_overlap: int = None,
+                content_type: str = "pdf") -> Iterator[Any]:
+    """
+    Incremental variant of split_into_chunks: packs documents as they arrive, so a
+    streaming loader's output can be chunked while later pages are still extracting.
+
+    Consecutive documents are packed whole until the next one would exceed the token
+    budget, so chunks break on page, slide and section boundaries. Only a document that
+    is larger than the budget by itself is split, along content-specific separators.
+
+    Args:
+        documents: Iterable of document objects from content loader
+        chunk_size: Token budget of each chunk (SUMMARY_CHUNK_TOKENS if None)
+        chunk_overlap: Token overlap when a single document has to be split (SUMMARY_CHUNK_OVERLAP_TOKENS if None)
+        content_type: Type of content for optimization
+
+    Yields:
+        Document chunks in document order, with token_count in their metadata
+    """
+    token_budget = chunk_size or SUMMARY_CHUNK_TOKENS
+    if chunk_overlap is None:
+        chunk_overlap = SUMMARY_CHUNK_OVERLAP_TOKENS
+
+    # Content-specific separators for splitting documents larger than the budget
     separators_by_type = {
         'pdf': ["\n\n", "\n", ". ", " ", ""],
         'youtube': ["\n\n", ". ", "\n", " ", ""],
@@ -138,32 +253,195 @@ def split_into_chunks(documents: List[Any],
     }
     separators = separators_by_type.get(content_type, separators_by_type['default'])
 
-    # Initialize text splitter with optimized parameters
+    # Initialize text splitter measuring pieces in tokens
     text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=separators
+        chunk_size=token_budget,
+        chunk_overlap=min(chunk_overlap, token_budget // 2),
+        separators=separators,
+        length_function=count_tokens
     )
 
-    # Split documents into chunks
-    return text_splitter.split_documents(documents)
+    # Pack documents one at a time
+    pack = []
+    pack_tokens = 0
+    for document in documents:
+        if not document.page_content.strip():
+            continue
+
+        document_tokens = count_tokens(document.page_content)
+        if pack and pack_tokens + document_tokens > token_budget:
+            yield _build_chunk(pack)
+            pack = []
+            pack_tokens = 0
+
+        if document_tokens > token_budget:
+            for piece in text_splitter.split_documents([document]):
+                yield _build_chunk([piece])
+            continue
+
+        pack.append(document)
+        pack_tokens += document_tokens
+
+    if pack:
+        yield _build_chunk(pack)
+
+
+async def summarize_batch(chain: Any,
+                          batch: List[Any],
+                          prompt_to_use: str,
+                          batch_number: int,
+                          limit: asyncio.Semaphore) -> str:
+    """
+    Summarizes one map batch, retrying it with exponential backoff if the LLM call fails.
+
+    Args:
+        chain: LangChain map_reduce chain
+        batch: Document chunks of the batch
+        prompt_to_use: User prompt passed to the chain
+        batch_number: 1-based position of the batch, for logging
+        limit: Semaphore capping the concurrent map calls
+
+    Returns:
+        str: Intermediate summary of the batch
+
+    Raises:
+        Exception: The last error once all attempts have failed
+    """
+    for attempt in range(MAP_MAX_RETRIES + 1):
+        try:
+            async with limit:
+                print(f"Processing batch {batch_number} with {len(batch)} chunks")
+                result = await chain.ainvoke({"input_documents": batch, "user_prompt": prompt_to_use})
+            return result["output_text"]
+        except Exception as e:
+            if attempt == MAP_MAX_RETRIES:
+                raise
+            delay = MAP_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+            print(f"Batch {batch_number} failed ({e}), retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+
+
+async def gather_batch_summaries(tasks: List["asyncio.Task"]) -> List[str]:
+    """
+    Waits for the map tasks and returns their summaries in batch order. If a batch
+    still fails after its retries, the remaining tasks are cancelled.
+
+    Args:
+        tasks: Tasks running summarize_batch, in batch order
+
+    Returns:
+        List[str]: Intermediate summaries in batch order
+    """
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def get_combine_chain(chain: Any) -> Any:
+    """
+    Returns the combine step of a map_reduce chain, which stuffs documents into the
+    reduce prompt without mapping them again. Other chains are returned unchanged.
+
+    Args:
+        chain: LangChain summarize chain
+
+    Returns:
+        LangChain chain that combines documents into one summary
+    """
+    reduce_chain = getattr(chain, "reduce_documents_chain", None)
+    return getattr(reduce_chain, "combine_documents_chain", None) or chain
+
+
+def group_summaries(summaries: List[str], fan_in: int, token_budget: int) -> List[List[str]]:
+    """
+    Groups consecutive summaries for one collapse level. A group holds at most fan_in
+    summaries and stays within token_budget, but always takes at least two summaries
+    so every level shrinks the list.
+
+    Args:
+        summaries: Intermediate summaries in document order
+        fan_in: Maximum summaries combined by one call
+        token_budget: Maximum tokens of one group
+
+    Returns:
+        List[List[str]]: Groups in document order
+    """
+    groups = []
+    group = []
+    group_tokens = 0
+    for summary in summaries:
+        summary_tokens = count_tokens(summary)
+        if len(group) >= 2 and (len(group) >= fan_in or group_tokens + summary_tokens > token_budget):
+            groups.append(group)
+            group = []
+            group_tokens = 0
+        group.append(summary)
+        group_tokens += summary_tokens
+
+    if group:
+        groups.append(group)
+    return groups
+
+
+async def reduce_summaries(chain: Any, summaries: List[str], prompt_to_use: str) -> str:
+    """
+    Runs the reduce phase as a tree: while the intermediate summaries are more than
+    REDUCE_FAN_IN or exceed REDUCE_TOKEN_BUDGET, consecutive groups are collapsed in
+    parallel into one summary each. The remaining summaries are combined by a final call,
+    so the number of levels grows logarithmically with the document size.
+
+    Args:
+        chain: LangChain map_reduce chain
+        summaries: Intermediate summaries in batch order
+        prompt_to_use: User prompt passed to the chain
+
+    Returns:
+        str: Final summary
+    """
+    combine_chain = get_combine_chain(chain)
+    limit = asyncio.Semaphore(MAP_MAX_CONCURRENCY)
+
+    def to_documents(texts: List[str]) -> List[Document]:
+        return [Document(page_content=text, metadata={"source": "intermediate_summary"}) for text in texts]
+
+    level = 0
+    while len(summaries) > 1 and (
+            len(summaries) > REDUCE_FAN_IN
+            or sum(count_tokens(summary) for summary in summaries) > REDUCE_TOKEN_BUDGET
+    ):
+        level += 1
+        groups = group_summaries(summaries, REDUCE_FAN_IN, REDUCE_TOKEN_BUDGET)
+        print(f"Collapsing {len(summaries)} summaries into {len(groups)} (reduce level {level})")
+        tasks = [
+            asyncio.ensure_future(summarize_batch(combine_chain, to_documents(group), prompt_to_use, i + 1, limit))
+            for i, group in enumerate(groups)
+        ]
+        summaries = await gather_batch_summaries(tasks)
+
+    if len(summaries) == 1:
+        return summaries[0]
+
+    result = await combine_chain.ainvoke({"input_documents": to_documents(summaries), "user_prompt": prompt_to_use})
+    return result["output_text"]
 
 
 def process_document_in_chunks(documents: List[Any],
                                chain: Any,
                                user_prompt: str = None,
-                               max_chunks_per_batch: int = 8,  # Reduced batch size for better performance
-                               chain_type: str = "map_reduce") -> str:
+                               chain_type: str = "refine") -> str:
     """
-    Processes documents in manageable batches to avoid context length issues.
+    Summarizes document chunks with a blocking chain: the refine chain walks the chunks
+    one after another, other chains get all chunks in one call. Documents too large for
+    one call go through summarize_chunk_stream, which maps and reduces concurrently.
     FIXED: Corrected refine chain logic to replace instead of concatenate summaries.
 
     Args:
         documents: List of document chunks
         chain: LangChain chain that's already been configured with the appropriate prompts
         user_prompt: User-provided prompt to guide summarization
-        max_chunks_per_batch: Maximum number of chunks to process in a single batch
-        chain_type: Type of chain being used ("map_reduce" or "refine")
+        chain_type: Type of chain being used ("refine", or any chain taking all chunks at once)
 
     Returns:
         Final summarized text
@@ -192,44 +470,12 @@ def process_document_in_chunks(documents: List[Any],
 
         return current_summary
 
-    # For small documents, process directly
-    if len(documents) <= max_chunks_per_batch:
-        return chain.invoke({
-            "input_documents": documents,
-            "user_prompt": prompt_to_use
-        })["output_text"]
-
-    # For larger documents, use improved batching strategy
-    batch_size = max_chunks_per_batch
-    batches = [documents[i:i + batch_size]
-               for i in range(0, len(documents), batch_size)]
-
-    # Process batches to get intermediate summaries
-    intermediate_results = []
-    for i, batch in enumerate(batches):
-        print(f"Processing batch {i + 1}/{len(batches)} with {len(batch)} chunks")
-
-        batch_summary = chain.invoke({
-            "input_documents": batch,
-            "user_prompt": prompt_to_use
-        })["output_text"]
-        intermediate_results.append(batch_summary)
-
-    # Convert intermediate summaries back to document format for final consolidation
-    from langchain.schema import Document
-    intermediate_docs = [
-        Document(page_content=result, metadata={"source": "intermediate_summary"})
-        for result in intermediate_results
-    ]
-
-    # Create final combined summary
-    final_summary = chain.invoke({
-        "input_documents": intermediate_docs,
+    # Other chains summarize all chunks in one call
+    return chain.invoke({
+        "input_documents": documents,
         "user_prompt": prompt_to_use
     })["output_text"]
 
-    return final_summary
-
 
 @lru_cache(maxsize=20)
 def get_content_specific_prompt(content_type: str, chain_type: str = "map_reduce") -> Tuple[str, str]:
@@ -446,8 +692,344 @@ Add important new information while maintaining accuracy and flow."""
         return initial_template, refine_template
 
 
+def build_summarize_chain(llm: Any, content_type: str, chain_type: str) -> Any:
+    """
+    Builds the summarization chain with the content-specific prompts.
+
+    Args:
+        llm: Language model used by the chain
+        content_type: The type of content ('pdf', 'youtube', etc.)
+        chain_type: Type of chain to build ("stuff", "map_reduce" or "refine")
+
+    Returns:
+        LangChain summarize chain
+    """
+    if chain_type == "stuff":
+        # One call over the whole document, with the prompt that starts a refine summary
+        initial_template, _ = get_content_specific_prompt(content_type, "refine")
+        return load_summarize_chain(
+            llm,
+            chain_type=chain_type,
+            prompt=PromptTemplate.from_template(initial_template)
+        )
+
+    primary_template, secondary_template = get_content_specific_prompt(content_type, chain_type)
+
+    if chain_type == "refine":
+        initial_prompt = PromptTemplate.from_template(primary_template)
+        refine_prompt = PromptTemplate.from_template(secondary_template)
+
+        return load_summarize_chain(
+            llm,
+            chain_type=chain_type,
+            question_prompt=initial_prompt,
+            refine_prompt=refine_prompt,
+        )
+
+    map_prompt = PromptTemplate.from_template(primary_template)
+    combine_prompt = PromptTemplate.from_template(secondary_template)
+
+    return load_summarize_chain(
+        llm,
+        chain_type=chain_type,
+        map_prompt=map_prompt,
+        combine_prompt=combine_prompt
+    )
+
+
+def estimate_map_reduce_calls(chunk_count: int, batch_count: int) -> int:
+    """
+    Estimates the LLM calls of a map_reduce summary: one per chunk, one combine per
+    batch, and the collapse levels and final call of the reduce tree
+
+    Args:
+        chunk_count: Number of chunks mapped
+        batch_count: Number of map batches
+
+    Returns:
+        int: Estimated number of LLM calls
+    """
+    calls = chunk_count + batch_count
+    if batch_count <= 1:
+        return calls
+
+    remaining = batch_count
+    while remaining > REDUCE_FAN_IN:
+        remaining = -(-remaining // REDUCE_FAN_IN)
+        calls += remaining
+    return calls + 1
+
+
+async def summarize_chunk_stream(chunks: AsyncIterator[Any],
+                                 llm: Any,
+                                 content_type: str,
+                                 user_prompt: str = None,
+                                 strategy: str = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Summarizes chunks while they are still being produced by the loader.
+
+    The strategy follows the measured token count. Chunks are buffered while the document
+    still fits STUFF_MAX_TOKENS, and a document that ends within that budget is summarized
+    by a single "stuff" call. Once the budget is exceeded the document switches to
+    map_reduce: each batch is mapped as soon as it fills up, concurrently with later
+    batches (up to MAP_MAX_CONCURRENCY calls) and with the remaining extraction, and the
+    intermediate summaries are combined in batch order once the stream ends. Refine, one
+    sequential call per chunk, is only used when requested.
+
+    Args:
+        chunks: Async iterator of document chunks in document order
+        llm: Language model used by the chains
+        content_type: The type of content ('pdf', 'youtube', etc.)
+        user_prompt: User-provided prompt to guide summarization
+        strategy: "auto" (default), "map_reduce" or "refine"
+
+    Returns:
+        Tuple[str, Dict]: Final summary and processing stats
+    """
+    default_prompt = "Provide a comprehensive summary of the key points and main ideas"
+    prompt_to_use = user_prompt if user_prompt else default_prompt
+
+    strategy = getattr(strategy, "value", strategy) or "auto"
+    if strategy not in SUMMARY_STRATEGIES:
+        raise ValueError(f"Unknown summary strategy: {strategy}")
+
+    chain = None
+    chain_type = None
+    chunk_count = 0
+    tokens_total = 0
+    batch_size = MAP_BATCH_SIZE
+    batch = []
+    map_tasks = []
+    map_limit = asyncio.Semaphore(MAP_MAX_CONCURRENCY)
+
+    def map_batch(batch_to_map: List[Any]) -> None:
+        map_tasks.append(asyncio.ensure_future(
+            summarize_batch(chain, batch_to_map, prompt_to_use, len(map_tasks) + 1, map_limit)
+        ))
+
+    try:
+        async for chunk in chunks:
+            chunk_count += 1
+            tokens_total += chunk.metadata.get("token_count") or count_tokens(chunk.page_content)
+            batch.append(chunk)
+
+            if chain is None:
+                if strategy == "refine" or (strategy == "auto" and tokens_total <= STUFF_MAX_TOKENS):
+                    continue
+                chain_type = "map_reduce"
+                chain = build_summarize_chain(llm, content_type, chain_type)
+                if strategy == "auto":
+                    print(f"Summary strategy: map_reduce, document exceeded {STUFF_MAX_TOKENS} tokens "
+                          f"after {chunk_count} chunks")
+
+            batch_size = MAP_BATCH_SIZE if chunk_count <= LARGE_DOCUMENT_CHUNKS else LARGE_MAP_BATCH_SIZE
+            # Chunks buffered before the switch may fill several batches at once
+            while len(batch) >= batch_size:
+                map_batch(batch[:batch_size])
+                batch = batch[batch_size:]
+    except BaseException:
+        # The loader failed; don't leave map calls running for a summary nobody will read
+        for task in map_tasks:
+            task.cancel()
+        raise
+
+    if chain is None:
+        chain_type = "refine" if strategy == "refine" else "stuff"
+    elif batch:
+        map_batch(batch)
+
+    if chain_type == "map_reduce":
+        llm_calls = estimate_map_reduce_calls(chunk_count, len(map_tasks))
+    else:
+        llm_calls = chunk_count if chain_type == "refine" else 1
+
+    stats = {
+        "chunks_created": chunk_count,
+        "tokens_total": tokens_total,
+        "chain_type_used": chain_type,
+        "batch_size_used": batch_size if chain_type == "map_reduce" else chunk_count,
+        "llm_calls_estimated": llm_calls if chunk_count else 0
+    }
+
+    if not chunk_count:
+        return "No document content to process.", stats
+
+    print(f"Summary strategy: {chain_type} (requested: {strategy}), {tokens_total} tokens "
+          f"in {chunk_count} chunks, ~{llm_calls} LLM calls")
+
+    # Requested refine: one sequential call per chunk
+    if chain_type == "refine":
+        chain = build_summarize_chain(llm, content_type, "refine")
+        summary = await asyncio.to_thread(
+            process_document_in_chunks, batch, chain, user_prompt, chain_type="refine"
+        )
+        return summary, stats
+
+    # The whole document fits the budget: one call
+    if chain_type == "stuff":
+        chain = build_summarize_chain(llm, content_type, "stuff")
+        result = await chain.ainvoke({"input_documents": batch, "user_prompt": prompt_to_use})
+        return result["output_text"], stats
+
+    intermediate_results = await gather_batch_summaries(map_tasks)
+
+    # A single batch was already summarized end to end by the chain
+    if len(intermediate_results) == 1:
+        return intermediate_results[0], stats
+
+    return await reduce_summaries(chain, intermediate_results, prompt_to_use), stats
+
+
+def is_shareable_content(documents: List[Document]) -> bool:
+    """
+    Checks that loaded documents hold the content itself, so their summary can be
+    shared under the content's identity
+
+    Args:
+        documents: Documents produced by the loader
+
+    Returns:
+        bool: False if the loader produced an error or metadata-only placeholder or
+              only part of a bundle
+    """
+    if not documents:
+        return False
+
+    for document in documents:
+        metadata = document.metadata or {}
+        if metadata.get("error") or metadata.get("type") in UNCACHEABLE_DOCUMENT_TYPES:
+            return False
+        if metadata.get("missing_pages"):
+            # Part of a bundle is not the bundle
+            return False
+    return True
+
+
+def build_summary_cache_key(content_id: str, prompt: str, summary_length: str, content_type: str,
+                            strategy: str = None) -> str:
+    """
+    Builds the shared cache key of a summary from everything that determines its text:
+    the content, the normalized prompt, the length, the model, the strategy and the
+    version of the prompt templates
+
+    Args:
+        content_id: Content identity from get_content_identity
+        prompt: User-provided prompt (None for the standard summary)
+        summary_length: Desired summary length
+        content_type: The type of content ('pdf', 'youtube', etc.)
+        strategy: Requested summarization strategy
+
+    Returns:
+        str: Cache key
+    """
+    templates = get_content_specific_prompt(content_type, "map_reduce") + get_content_specific_prompt(content_type, "refine")
+    template_version = hashlib.md5(
+        json.dumps([SUMMARY_TEMPLATE_VERSION, templates]).encode("utf-8")
+    ).hexdigest()
+
+    key_parts = {
+        "content": content_id,
+        "prompt": re.sub(r"\s+", " ", prompt or "").strip().lower(),
+        "length": summary_length,
+        "model": SUMMARY_MODEL,
+        "strategy": getattr(strategy, "value", strategy) or "auto",
+        "templates": template_version
+    }
+    return hashlib.sha256(json.dumps(key_parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_cached_summary(cache_key: str) -> Dict[str, Any]:
+    """
+    Looks up an unexpired shared summary and counts the hit
+
+    Args:
+        cache_key: Key from build_summary_cache_key
+
+    Returns:
+        Dict: Cache entry with "_id", "text", "title", "page_count" and "processing_stats", or None on a miss
+    """
+    if not SUMMARY_CACHE_ENABLED:
+        return None
+
+    try:
+        now = datetime.datetime.utcnow()
+        return get_mongodb_client()["ai_service"]["summary_cache"].find_one_and_update(
+            {"cache_key": cache_key, "expires_at": {"$gt": now}},
+            {"$inc": {"hits": 1}, "$set": {"last_hit_at": now}},
+            sort=[("expires_at", -1)]
+        )
+    except Exception as e:
+        print(f"Could not read summary cache: {e}")
+        return None
+
+
+def cache_summary(cache_key: str, summary_text: str, title: str, page_count: int,
+                  processing_stats: Dict[str, Any]) -> Optional[ObjectId]:
+    """
+    Stores a successfully generated summary as a new shared cache entry. A summary
+    regenerated after an entry expired gets its own entry, so the text that earlier
+    records point at never changes.
+
+    Args:
+        cache_key: Key from build_summary_cache_key
+        summary_text: Final summary text
+        title: Title of the summarized content
+        page_count: Number of documents the loader produced
+        processing_stats: Stats of the run that produced the summary
+
+    Returns:
+        ObjectId: ID of the new entry, or None if it was not stored
+    """
+    if not SUMMARY_CACHE_ENABLED:
+        return None
+
+    now = datetime.datetime.utcnow()
+    try:
+        return get_mongodb_client()["ai_service"]["summary_cache"].insert_one({
+            "cache_key": cache_key,
+            "text": summary_text,
+            "title": title,
+            "word_count": len(summary_text.split()),
+            "page_count": page_count,
+            "processing_stats": processing_stats,
+            "model": SUMMARY_MODEL,
+            "hits": 0,
+            "created_at": now,
+            "expires_at": now + datetime.timedelta(hours=SUMMARY_CACHE_TTL_HOURS)
+        }).inserted_id
+    except Exception as e:
+        print(f"Could not write summary cache: {e}")
+        return None
+
+
+def attach_shared_summary_texts(summaries: List[Dict[str, Any]]) -> None:
+    """
+    Fills in the text of summary records that point at a shared cache entry instead of
+    holding a copy. A record edited by its user holds its own text and is left as is.
+
+    Args:
+        summaries: Summary records as stored in MongoDB
+    """
+    entry_ids = [
+        summary["summary_cache_id"] for summary in summaries
+        if "text" not in summary and summary.get("summary_cache_id")
+    ]
+    if entry_ids:
+        entries = get_mongodb_client()["ai_service"]["summary_cache"].find(
+            {"_id": {"$in": entry_ids}}, projection={"text": 1}
+        )
+        texts = {entry["_id"]: entry["text"] for entry in entries}
+        for summary in summaries:
+            if "text" not in summary and summary.get("summary_cache_id"):
+                summary["text"] = texts.get(summary["summary_cache_id"], "")
+
+    for summary in summaries:
+        if summary.get("summary_cache_id"):
+            summary["summary_cache_id"] = str(summary["summary_cache_id"])
+
+
 def summarize_content(content_url: str, user_id: str, prompt: str = None, summary_length: str = "medium",
-                      content_type: str = None) -> dict:
+                      content_type: str = None, strategy: str = None, pages: List[str] = None) -> dict:
     """
     Summarizes content from a URL with performance optimizations and bug fixes.
     IMPROVED: Better model selection, smarter processing strategy, and length optimization.
@@ -458,90 +1040,88 @@ def summarize_content(content_url: str, user_id: str, prompt: str = None, summar
         prompt: (Optional) User-provided prompt to guide summarization
         summary_length: (Optional) Desired summary length ("short", "medium", "long")
         content_type: (Optional) Type of content. If None, will be auto-detected
+        strategy: (Optional) "auto" (chosen by token count), "map_reduce" or "refine"
+        pages: (Optional) Image URLs or blob names of a handwritten-notes bundle, in page order;
+               content_url then names the bundle
 
     Returns:
         dict: Dictionary containing summary, status, and any error messages
     """
     try:
-        # 1. Auto-detect content type if not provided
-        if not content_type:
+        # 1. Auto-detect content type if not provided; a page list is a bundle of note images
+        if pages:
+            content_type = "image"
+        elif not content_type:
             content_type = detect_content_type(content_url)
             print(f"Auto-detected content type: {content_type}")
 
-        # 2. Load content from URL using the appropriate loader
-        documents = load_content(content_url, content_type)
-        if not documents:
-            return {
-                "status": "error",
-                "summary": None,
-                "error_message": f"Failed to load content from URL: {content_url}. See logs for details."
-            }
-
-        # Extract content metadata
-        doc_metadata = {
-            "title": documents[0].metadata.get("title", os.path.basename(content_url)),
-            "url": content_url,
-            "content_type": content_type,
-            "page_count": len(documents),
-            "uploaded_at": datetime.datetime.utcnow()
-        }
-
-        # 3. Initialize Language Model with optimized settings
+        # 2. Initialize Language Model with optimized settings
         llm = ChatOpenAI(
             openai_api_key=os.environ.get("OPENAI_API_KEY"),
-            model_name="gpt-4o-mini",  # IMPROVED: Faster and more cost-effective
+            model_name=SUMMARY_MODEL,  # IMPROVED: Faster and more cost-effective
             temperature=0.3,  # IMPROVED: Lower temperature for more focused summaries
             max_tokens=4000,  # IMPROVED: Explicit token limit
             request_timeout=60  # IMPROVED: Timeout to prevent hanging
         )
 
-        # 4. Split text into optimized chunks
-        chunks = split_into_chunks(documents, content_type=content_type)
-        print(f"Created {len(chunks)} chunks for processing")
-
-        # 5. IMPROVED: Smarter processing strategy based on document size
-        num_chunks = len(chunks)
-        if num_chunks <= 5:
-            chain_type = "refine"
-            max_batch_size = num_chunks
-        elif num_chunks <= 20:
-            chain_type = "map_reduce"
-            max_batch_size = 6
+        # 3. Reuse a summary another user already generated for the same content and request.
+        # The content is identified before loading, so the same key is used to look the
+        # summary up and to store it, and a hit skips the download entirely.
+        content_id = get_content_identity(content_url, content_type, pages=pages)
+        cache_key = build_summary_cache_key(content_id, prompt, summary_length, content_type, strategy) if content_id else None
+        cached_summary = get_cached_summary(cache_key) if cache_key else None
+
+        documents = []
+        if cached_summary:
+            print(f"Summary cache hit for {content_url}")
+            summary_output = cached_summary["text"]
+            title = cached_summary.get("title")
+            page_count = cached_summary.get("page_count", 0)
+            processing_stats = dict(cached_summary.get("processing_stats") or {}, cache_hit=True)
         else:
-            chain_type = "map_reduce"
-            max_batch_size = 8
-
-        summary_type = "custom" if prompt else "standard"
-
-        # 6. Set up optimized prompts
-        primary_template, secondary_template = get_content_specific_prompt(content_type, chain_type)
+            # 4. Stream content from the appropriate loader, keeping the documents for metadata
+            document_iterator = iter_content(content_url, content_type, pages=pages)
+            try:
+                documents.append(next(document_iterator))
+            except Exception as e:
+                print(f"Error loading content from {content_url}: {e}")
+
+            if not documents:
+                return {
+                    "status": "error",
+                    "summary": None,
+                    "error_message": f"Failed to load content from URL: {content_url}. See logs for details."
+                }
+
+            def stream_documents():
+                yield documents[0]
+                for document in document_iterator:
+                    documents.append(document)
+                    yield document
+
+            # 5. Chunk and summarize while later pages are still being extracted
+            chunk_stream = iterate_in_thread(iter_chunks(stream_documents(), content_type=content_type))
+            summary_output, processing_stats = run_coroutine_sync(
+                summarize_chunk_stream(chunk_stream, llm, content_type, prompt, strategy)
+            )
+            page_count = len(documents)
+            title = documents[0].metadata.get("title")
 
-        # Initialize prompt templates and chains
-        if chain_type == "refine":
-            initial_prompt = PromptTemplate.from_template(primary_template)
-            refine_prompt = PromptTemplate.from_template(secondary_template)
+            print(f"Created {processing_stats['chunks_created']} chunks for processing "
+                  f"using {processing_stats['chain_type_used']} "
+                  f"(~{processing_stats['llm_calls_estimated']} LLM calls)")
 
-            chain = load_summarize_chain(
-                llm,
-                chain_type=chain_type,
-                question_prompt=initial_prompt,
-                refine_prompt=refine_prompt,
-            )
-        else:  # map_reduce
-            map_prompt = PromptTemplate.from_template(primary_template)
-            combine_prompt = PromptTemplate.from_template(secondary_template)
-
-            chain = load_summarize_chain(
-                llm,
-                chain_type=chain_type,
-                map_prompt=map_prompt,
-                combine_prompt=combine_prompt
-            )
+        # Extract content metadata
+        doc_metadata = {
+            "title": title or os.path.basename(content_url),
+            "url": content_url,
+            "content_type": content_type,
+            "page_count": page_count,
+            "content_hash": documents[0].metadata.get("content_hash") if documents else None,
+            "uploaded_at": datetime.datetime.utcnow()
+        }
 
-        # 7. Process document with improved batching
-        summary_output = process_document_in_chunks(
-            chunks, chain, prompt, max_chunks_per_batch=max_batch_size, chain_type=chain_type
-        )
+        summary_type = "custom" if prompt else "standard"
 
         # 8. IMPROVED: Smart length adjustment
         word_count = len(summary_output.split())
@@ -553,8 +1133,8 @@ def summarize_content(content_url: str, user_id: str, prompt: str = None, summar
 
         target_min, target_max = target_ranges.get(summary_length, target_ranges["medium"])
 
-        # Only adjust if significantly outside target range (20% tolerance)
-        if word_count < target_min * 0.8 or word_count > target_max * 1.2:
+        # Only adjust if significantly outside target range (20% tolerance); cached summaries already were
+        if not cached_summary and (word_count < target_min * 0.8 or word_count > target_max * 1.2):
             adjustment_prompt = f"""Adjust this summary to {target_min}-{target_max} words while preserving all key information:
 
 {summary_output}
@@ -576,27 +1156,40 @@ Adjusted summary:"""
 
         if existing_doc:
             document_id = existing_doc["_id"]
+
+            # Keep the recorded content hash in sync with the bytes we just loaded
+            content_hash = doc_metadata["content_hash"]
+            if content_hash and existing_doc.get("content_hash") != content_hash:
+                docs_collection.update_one({"_id": document_id}, {"$set": {"content_hash": content_hash}})
         else:
             document_result = docs_collection.insert_one(doc_metadata)
             document_id = document_result.inserted_id
 
+        # Share the new summary with later requests for the same content and request
+        if cached_summary:
+            summary_cache_id = cached_summary["_id"]
+        elif cache_key and processing_stats.get("chunks_created") and is_shareable_content(documents):
+            summary_cache_id = cache_summary(cache_key, summary_output, doc_metadata["title"], page_count, processing_stats)
+        else:
+            summary_cache_id = None
+
         # Create summary record
         summary_data = {
             "user_id": user_id,
             "document_id": document_id,
-            "text": summary_output,
             "type": summary_type,
             "prompt_used": prompt,
             "length": summary_length,
             "created_at": datetime.datetime.utcnow(),
             "word_count": len(summary_output.split()),
             "content_type": content_type,
-            "processing_stats": {
-                "chunks_created": len(chunks),
-                "chain_type_used": chain_type,
-                "batch_size_used": max_batch_size
-            }
+            "processing_stats": processing_stats
         }
+        if summary_cache_id:
+            # The text is stored once, in the shared cache entry
+            summary_data["summary_cache_id"] = summary_cache_id
+        else:
+            summary_data["text"] = summary_output
 
         # Insert summary into MongoDB
         summaries_collection = db["summaries"]
@@ -609,7 +1202,7 @@ Adjusted summary:"""
             "document_id": str(document_id),
             "word_count": len(summary_output.split()),
             "content_type": content_type,
-            "chunks_processed": len(chunks)
+            "chunks_processed": processing_stats.get("chunks_created", 0)
         }
 
     except Exception as e:
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Coroutine, Iterable
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the process-wide event loop running on a background thread.
+    Shared async clients (HTTP, Form Recognizer) live on this loop, so sync loaders
+    on worker threads and async callers all reuse the same connection pools.
+
+    Returns:
+        asyncio.AbstractEventLoop: Running background loop
+    """
+    global _background_loop
+
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="async-io", daemon=True)
+                thread.start()
+                _background_loop = loop
+    return _background_loop
+
+
+def run_in_background_loop(coro: Coroutine) -> Any:
+    """
+    Runs a coroutine on the background loop and blocks until it finishes.
+    Must not be called from the background loop itself.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Any: The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result()
+
+
+async def await_in_background_loop(coro: Coroutine) -> Any:
+    """
+    Async variant of run_in_background_loop for code running on another event loop
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Any: The coroutine's result
+    """
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, get_background_loop()))
+
+
+def run_coroutine_sync(coro: Coroutine) -> Any:
+    """
+    Runs a coroutine to completion from synchronous code.
+
+    Uses asyncio.run when no event loop is running in this thread. When called from
+    inside a running loop (e.g. a sync helper used by an async route), the coroutine
+    is run on a fresh loop in a helper thread so the caller's loop is not re-entered.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Any: The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+_END_OF_ITERATION = object()
+
+
+async def iterate_in_thread(iterable: Iterable, max_buffered: int = 0) -> AsyncIterator[Any]:
+    """
+    Consumes a blocking iterable on a helper thread and yields its items to the event loop.
+
+    This lets async code overlap its own awaits (e.g. LLM calls) with a synchronous
+    producer such as a document loader. Exceptions raised by the producer are re-raised
+    in the consumer. If the consumer stops early, the producer stops at its next item.
+
+    Args:
+        iterable: Blocking iterable to consume
+        max_buffered: Maximum number of items produced ahead of the consumer (0 = unbounded)
+
+    Yields:
+        Any: Items of the iterable in order
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = threading.Event()
+    slots = threading.Semaphore(max_buffered) if max_buffered > 0 else None
+
+    def produce():
+        try:
+            for item in iterable:
+                if slots:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                if stop.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            loop.call_soon_threadsafe(queue.put_nowait, (_END_OF_ITERATION, None))
+        except BaseException as e:
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, (_END_OF_ITERATION, e))
+
+    producer = threading.Thread(target=produce, name="iterate-in-thread", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is _END_OF_ITERATION:
+                return
+            if slots:
+                slots.release()
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,373 @@
+import os
+import asyncio
+import inspect
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient, BlobClient
+from dotenv import load_dotenv
+from urllib.parse import urlparse
+from app.utils.async_utils import await_in_background_loop
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Blob client pool settings (can be set via env variables)
+BLOB_POOL_MAXSIZE = int(os.getenv("BLOB_POOL_MAXSIZE", "32"))  # Keep-alive connections per storage host
+BLOB_CLIENT_CACHE_SIZE = int(os.getenv("BLOB_CLIENT_CACHE_SIZE", "16"))  # Distinct connection strings / accounts
+
+# Blob download settings: blobs larger than one chunk are fetched as concurrent ranged reads
+BLOB_DOWNLOAD_MAX_CONCURRENCY = int(os.getenv("BLOB_DOWNLOAD_MAX_CONCURRENCY", "8"))
+BLOB_DOWNLOAD_CHUNK_SIZE = int(os.getenv("BLOB_DOWNLOAD_CHUNK_SIZE_MB", "4")) * 1024 * 1024
+
+# Client options applied to every blob client we create
+BLOB_CLIENT_OPTIONS = {
+    "max_single_get_size": BLOB_DOWNLOAD_CHUNK_SIZE,
+    "max_chunk_get_size": BLOB_DOWNLOAD_CHUNK_SIZE
+}
+
+# Called with (bytes downloaded so far, total bytes or None); may be a coroutine function in async paths
+ProgressCallback = Callable[[int, Optional[int]], Any]
+
+# Hosts that serve path-style blob URLs (http://host:port/<account>/<container>/<blob>), e.g. Azurite
+BLOB_EMULATOR_HOSTS = {
+    host.strip().lower()
+    for host in os.getenv("AZURE_STORAGE_EMULATOR_HOSTS", "127.0.0.1:10000,localhost:10000,azurite:10000").split(",")
+    if host.strip()
+}
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+# Async clients and their aiohttp session live on the shared background loop
+_async_session = None
+_async_clients: Dict[str, object] = {}
+
+
+def _get_http_session() -> requests.Session:
+    """
+    Returns the process-wide requests session shared by every sync blob client,
+    so TLS connections to the storage account are kept alive between requests
+
+    Returns:
+        requests.Session: Shared pooled session
+    """
+    global _http_session
+
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=BLOB_CLIENT_CACHE_SIZE, pool_maxsize=BLOB_POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def _get_transport() -> RequestsTransport:
+    """Returns a transport on the shared session that does not close it with the client"""
+    return RequestsTransport(session=_get_http_session(), session_owner=False)
+
+
+@lru_cache(maxsize=BLOB_CLIENT_CACHE_SIZE)
+def get_blob_service_client(connection_string: str) -> BlobServiceClient:
+    """
+    Returns the shared BlobServiceClient for a connection string.
+    Uses LRU cache so connection and auth setup happen once per storage account.
+
+    Args:
+        connection_string: Azure Storage connection string
+
+    Returns:
+        BlobServiceClient: Shared client on the pooled session
+    """
+    return BlobServiceClient.from_connection_string(
+        connection_string, transport=_get_transport(), **BLOB_CLIENT_OPTIONS
+    )
+
+
+def get_blob_client_from_url(blob_url: str) -> BlobClient:
+    """
+    Creates a blob client for a full blob URL (e.g. with a SAS token) on the pooled session
+
+    Args:
+        blob_url: Full blob URL, including any SAS query string
+
+    Returns:
+        BlobClient: Blob client sharing the pooled connections
+    """
+    return BlobClient.from_blob_url(blob_url, transport=_get_transport(), **BLOB_CLIENT_OPTIONS)
+
+
+def is_blob_storage_url(url: str) -> bool:
+    """
+    Checks if a URL points at Azure Blob Storage or a local storage emulator
+
+    Args:
+        url: URL to check
+
+    Returns:
+        bool: True if the URL is a blob storage URL
+    """
+    parsed_url = urlparse(url)
+    if parsed_url.scheme not in ('http', 'https'):
+        return False
+    return '.blob.core.windows.net' in parsed_url.netloc or parsed_url.netloc.lower() in BLOB_EMULATOR_HOSTS
+
+
+def parse_blob_url(blob_url: str) -> Tuple[str, str]:
+    """
+    Splits a blob storage URL into container and blob name
+
+    Args:
+        blob_url: Azure Storage or emulator URL of the blob
+
+    Returns:
+        Tuple[str, str]: Container name and blob name
+
+    Raises:
+        ValueError: If the URL does not contain both container and blob name
+    """
+    parsed_url = urlparse(blob_url)
+    path = parsed_url.path.lstrip('/')
+
+    # Emulator URLs carry the account name as the first path segment
+    if parsed_url.netloc.lower() in BLOB_EMULATOR_HOSTS:
+        path = path.split('/', 1)[1] if '/' in path else ''
+
+    parts = path.split('/', 1)
+    if len(parts) != 2 or not parts[0] or not parts[1]:
+        raise ValueError(f"URL does not contain both container and blob name: {blob_url}")
+    return parts[0], parts[1]
+
+
+def resolve_blob_client(
+        private_url: str,
+        connection_string: str = None,
+        container_name: str = None
+) -> Tuple[BlobClient, str]:
+    """
+    Resolves a full Azure Storage URL or a bare blob name to a blob client and
+    the source string loaders record in document metadata
+
+    Args:
+        private_url: Azure Storage URL or blob name
+        connection_string: Azure Storage connection string (uses .env if not provided)
+        container_name: Name of the Azure Blob container (uses .env if not provided)
+
+    Returns:
+        Tuple[BlobClient, str]: Blob client and source string
+    """
+    if connection_string is None:
+        connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+        if not connection_string:
+            raise ValueError("Azure connection string not provided and not found in environment variables")
+
+    if is_blob_storage_url(private_url):
+        container_name, blob_name = parse_blob_url(private_url)
+        source = private_url
+    else:
+        if container_name is None:
+            container_name = os.getenv("AZURE_STORAGE_CONTAINER_NAME")
+            if not container_name:
+                raise ValueError("Container name not provided and not found in environment variables")
+        blob_name = private_url
+        source = f"azure-blob://{container_name}/{blob_name}"
+
+    return get_blob_service_client(connection_string).get_blob_client(container_name, blob_name), source
+
+
+def download_blob_bytes(
+        blob_client: BlobClient,
+        progress_callback: ProgressCallback = None,
+        max_concurrency: int = None
+) -> bytes:
+    """
+    Downloads a whole blob into memory. Blobs larger than one chunk are fetched as
+    concurrent ranged reads.
+
+    Args:
+        blob_client: Blob client of the blob to download
+        progress_callback: Optional callable receiving (bytes downloaded, total bytes)
+        max_concurrency: Number of parallel range requests (defaults to BLOB_DOWNLOAD_MAX_CONCURRENCY)
+
+    Returns:
+        bytes: Blob content
+    """
+    downloader = blob_client.download_blob(
+        max_concurrency=max_concurrency or BLOB_DOWNLOAD_MAX_CONCURRENCY,
+        progress_hook=progress_callback
+    )
+    return downloader.readall()
+
+
+def download_blob_prefix(blob_client: BlobClient, length: int) -> Tuple[bytes, Optional[str]]:
+    """
+    Reads only the first bytes of a blob with a single range request
+
+    Args:
+        blob_client: Blob client of the blob to read
+        length: Number of leading bytes to read
+
+    Returns:
+        Tuple[bytes, str]: At most length bytes of the blob and its stored Content-Type
+    """
+    downloader = blob_client.download_blob(offset=0, length=length)
+    return downloader.readall(), downloader.properties.content_settings.content_type
+
+
+async def download_blob_bytes_async(
+        blob_client,
+        progress_callback: ProgressCallback = None,
+        max_concurrency: int = None
+) -> bytes:
+    """
+    Async variant of download_blob_bytes for azure.storage.blob.aio blob clients
+
+    Args:
+        blob_client: Async blob client of the blob to download
+        progress_callback: Optional callable or coroutine function receiving (bytes downloaded, total bytes)
+        max_concurrency: Number of parallel range requests (defaults to BLOB_DOWNLOAD_MAX_CONCURRENCY)
+
+    Returns:
+        bytes: Blob content
+    """
+    async def report_progress(current: int, total: Optional[int]) -> None:
+        # The async SDK awaits its hook; accept plain callables as well
+        try:
+            result = progress_callback(current, total)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Blob download progress callback failed: {str(e)}")
+
+    downloader = await blob_client.download_blob(
+        max_concurrency=max_concurrency or BLOB_DOWNLOAD_MAX_CONCURRENCY,
+        progress_hook=report_progress if progress_callback else None
+    )
+    return await downloader.readall()
+
+
+def _get_async_transport():
+    """
+    Returns an aiohttp transport on the shared session; must be called on the background loop.
+    Sync and async callers all download through that loop, so every download shares one pool.
+
+    Returns:
+        AioHttpTransport: Transport that does not close the shared session
+    """
+    import aiohttp
+    from azure.core.pipeline.transport import AioHttpTransport
+
+    global _async_session
+
+    if _async_session is None or _async_session.closed:
+        _async_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=BLOB_POOL_MAXSIZE),
+            trust_env=True
+        )
+    return AioHttpTransport(session=_async_session, session_owner=False)
+
+
+def get_async_blob_service_client(connection_string: str):
+    """
+    Returns the shared async BlobServiceClient for a connection string; must be called on the background loop
+
+    Args:
+        connection_string: Azure Storage connection string
+
+    Returns:
+        azure.storage.blob.aio.BlobServiceClient: Shared async client
+    """
+    from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+
+    client = _async_clients.get(connection_string)
+    if client is None:
+        client = AsyncBlobServiceClient.from_connection_string(
+            connection_string, transport=_get_async_transport(), **BLOB_CLIENT_OPTIONS
+        )
+        _async_clients[connection_string] = client
+    return client
+
+
+def get_async_blob_client_from_url(blob_url: str):
+    """
+    Creates an async blob client for a full blob URL (e.g. with a SAS token) on the
+    shared session; must be called on the background loop
+
+    Args:
+        blob_url: Full blob URL, including any SAS query string
+
+    Returns:
+        azure.storage.blob.aio.BlobClient: Async blob client sharing the pooled connections
+    """
+    from azure.storage.blob.aio import BlobClient as AsyncBlobClient
+
+    return AsyncBlobClient.from_blob_url(blob_url, transport=_get_async_transport(), **BLOB_CLIENT_OPTIONS)
+
+
+async def download_blob_in_background(
+        get_blob_client: Callable[[], Any],
+        progress_callback: ProgressCallback = None,
+        max_concurrency: int = None
+) -> bytes:
+    """
+    Downloads a blob with the shared async clients on the background loop.
+    Progress callbacks are still run on the caller's event loop.
+
+    Args:
+        get_blob_client: Returns the async blob client to download; called on the background loop
+        progress_callback: Optional callable or coroutine function receiving (bytes downloaded, total bytes)
+        max_concurrency: Number of parallel range requests (defaults to BLOB_DOWNLOAD_MAX_CONCURRENCY)
+
+    Returns:
+        bytes: Blob content
+    """
+    caller_loop = asyncio.get_running_loop()
+
+    async def call_progress_callback(current: int, total: Optional[int]) -> None:
+        result = progress_callback(current, total)
+        if inspect.isawaitable(result):
+            await result
+
+    async def forward_progress(current: int, total: Optional[int]) -> None:
+        future = asyncio.run_coroutine_threadsafe(call_progress_callback(current, total), caller_loop)
+        await asyncio.wrap_future(future)
+
+    async def download() -> bytes:
+        return await download_blob_bytes_async(
+            get_blob_client(),
+            progress_callback=forward_progress if progress_callback else None,
+            max_concurrency=max_concurrency
+        )
+
+    return await await_in_background_loop(download())
+
+
+async def close_blob_clients() -> None:
+    """
+    Closes the shared async blob clients and session. Called on application shutdown.
+    """
+    async def close() -> None:
+        global _async_session
+
+        for connection_string in list(_async_clients):
+            client = _async_clients.pop(connection_string)
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing async blob client: {str(e)}")
+
+        if _async_session is not None and not _async_session.closed:
+            await _async_session.close()
+        _async_session = None
+
+    await await_in_background_loop(close())
@@ -0,0 +1,293 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional
+from langchain.schema import Document
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Cache settings (can be set via env variables)
+CONTENT_CACHE_ENABLED = os.getenv("CONTENT_CACHE_ENABLED", "true").lower() == "true"
+CONTENT_CACHE_DIR = os.getenv(
+    "CONTENT_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "ai-service-content-cache")
+)
+CONTENT_CACHE_MAX_MB = int(os.getenv("CONTENT_CACHE_MAX_MB", "1024"))
+
+CACHE_FILE_SUFFIX = ".json.gz"
+
+
+def compute_content_hash(data: bytes) -> str:
+    """
+    Computes the content hash used as the cache key for raw file bytes.
+    MD5 is used so the key matches the Content-MD5 Azure stores for blobs.
+
+    Args:
+        data: Raw bytes of the downloaded file
+
+    Returns:
+        str: Hex encoded MD5 digest of the bytes
+    """
+    return hashlib.md5(data).hexdigest()
+
+
+def get_blob_content_hash(blob_client) -> Optional[str]:
+    """
+    Reads the content hash of an Azure blob from its properties without downloading it
+
+    Args:
+        blob_client: Azure BlobClient for the blob
+
+    Returns:
+        str: Hex encoded MD5 digest of the blob or None if Azure has no MD5 for it
+    """
+    try:
+        properties = blob_client.get_blob_properties()
+        content_md5 = properties.content_settings.content_md5
+        if content_md5:
+            return bytes(content_md5).hex()
+    except Exception as e:
+        logger.debug(f"Could not read Content-MD5 from blob properties: {str(e)}")
+    return None
+
+
+def evict_lru_files(cache_dir: str, max_bytes: int, suffix: str) -> None:
+    """
+    Removes the least recently used cache files (by modification time) until the
+    files with the given suffix in cache_dir fit in max_bytes
+
+    Args:
+        cache_dir: Cache directory
+        max_bytes: Maximum total size of the cache files
+        suffix: File name suffix of the cache entries
+    """
+    try:
+        entries = []
+        total_size = 0
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(suffix):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        if total_size <= max_bytes:
+            return
+
+        # Oldest first
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total_size -= size
+
+        logger.info(f"Evicted cache entries in {cache_dir}, cache size now {total_size} bytes")
+    except Exception as e:
+        logger.warning(f"Error evicting cache entries in {cache_dir}: {str(e)}")
+
+
+class DocumentCache:
+    """
+    Persistent cache of parsed Document lists keyed by content hash.
+
+    Entries are stored as gzip-compressed JSON files in a shared directory so every
+    worker process on the node reuses them. The file modification time is used as
+    the recency marker, and the least recently used entries are evicted once the
+    directory grows above the configured size.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}{CACHE_FILE_SUFFIX}")
+
+    def get(self, content_hash: str) -> Optional[List[Document]]:
+        """
+        Looks up the parsed documents for a content hash
+
+        Args:
+            content_hash: Hash of the raw file bytes
+
+        Returns:
+            List[Document]: Fresh copies of the cached documents or None on a miss
+        """
+        path = self._entry_path(content_hash)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable content cache entry {content_hash}: {str(e)}")
+            self._remove(path)
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return [
+            Document(page_content=entry["page_content"], metadata=entry.get("metadata") or {})
+            for entry in entries
+        ]
+
+    def put(self, content_hash: str, documents: List[Document]) -> None:
+        """
+        Stores parsed documents for a content hash and evicts old entries if needed
+
+        Args:
+            content_hash: Hash of the raw file bytes
+            documents: Parsed documents to store
+        """
+        entries = [
+            {"page_content": doc.page_content, "metadata": doc.metadata or {}}
+            for doc in documents
+        ]
+        path = self._entry_path(content_hash)
+
+        try:
+            # Write to a temporary file first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as raw_file:
+                with gzip.GzipFile(fileobj=raw_file, mode="wb") as gz_file:
+                    gz_file.write(json.dumps(entries, default=str).encode("utf-8"))
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write content cache entry {content_hash}: {str(e)}")
+            if 'temp_path' in locals():
+                self._remove(temp_path)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            evict_lru_files(self.cache_dir, self.max_bytes, CACHE_FILE_SUFFIX)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+_document_cache = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> Optional[DocumentCache]:
+    """
+    Returns the process-wide document cache, or None if caching is disabled
+
+    Returns:
+        DocumentCache: Shared cache instance
+    """
+    global _document_cache
+
+    if not CONTENT_CACHE_ENABLED:
+        return None
+
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                try:
+                    _document_cache = DocumentCache(CONTENT_CACHE_DIR, CONTENT_CACHE_MAX_MB * 1024 * 1024)
+                except Exception as e:
+                    logger.error(f"Could not initialize content cache at {CONTENT_CACHE_DIR}: {str(e)}")
+                    return None
+    return _document_cache
+
+
+def load_with_cache(
+        fetch: Callable[[], bytes],
+        parse: Callable[[bytes], Optional[List[Document]]],
+        content_hash: str = None
+) -> Optional[List[Document]]:
+    """
+    Returns parsed documents for a file, parsing only when the bytes are not cached yet.
+
+    If the content hash is already known (e.g. from blob properties) and cached, the
+    file is not downloaded at all. Otherwise the bytes are fetched and hashed, and the
+    parser only runs on a cache miss. Every returned document carries the hash in its
+    "content_hash" metadata so callers can record it.
+
+    Args:
+        fetch: Callable returning the raw file bytes
+        parse: Callable turning raw file bytes into documents
+        content_hash: Content hash if it is known before downloading
+
+    Returns:
+        List[Document]: Parsed documents or None if parsing fails
+    """
+    documents = list(iter_with_cache(fetch, lambda data: parse(data) or [], content_hash))
+    return documents or None
+
+
+def iter_with_cache(
+        fetch: Callable[[], bytes],
+        parse: Callable[[bytes], Iterable[Document]],
+        content_hash: str = None
+) -> Iterator[Document]:
+    """
+    Streaming variant of load_with_cache: yields documents as the parser produces them
+    and stores the complete list in the cache once parsing finishes.
+
+    Args:
+        fetch: Callable returning the raw file bytes
+        parse: Callable turning raw file bytes into an iterable of documents
+        content_hash: Content hash if it is known before downloading
+
+    Yields:
+        Document: Parsed documents, each with "content_hash" in its metadata
+    """
+    cache = get_document_cache()
+
+    if cache and content_hash:
+        documents = cache.get(content_hash)
+        if documents is not None:
+            logger.info(f"Content cache hit for {content_hash} (download skipped)")
+            yield from documents
+            return
+
+    data = fetch()
+    data_hash = compute_content_hash(data)
+
+    if cache and data_hash != content_hash:
+        documents = cache.get(data_hash)
+        if documents is not None:
+            logger.info(f"Content cache hit for {data_hash}")
+            yield from documents
+            return
+
+    documents = []
+    for doc in parse(data):
+        if not doc.metadata:
+            doc.metadata = {}
+        doc.metadata["content_hash"] = data_hash
+        documents.append(doc)
+        yield doc
+
+    if cache and documents:
+        cache.put(data_hash, documents)
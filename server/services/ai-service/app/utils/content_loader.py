@@ -1,33 +1,197 @@
 import os
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Dict, Any, AsyncIterator, Iterator, Tuple
 from langchain.schema import Document
 from urllib.parse import urlparse
 
 # Import the utility modules for different content types
-from app.utils.pdf_utils import load_pdf_from_private_url, is_pdf_url
-from app.utils.youtube_utils import load_youtube_content, is_youtube_url
-from app.utils.powerpoint_utils import load_pptx_from_private_url, is_powerpoint_url
-from app.utils.webpage_utils import load_webpage_content, is_webpage_url
-from app.utils.handwritten_utils import load_handwritten_from_private_url, is_image_url
+from app.utils.pdf_utils import load_pdf_from_private_url, iter_pdf_from_private_url, is_pdf_url
+from app.utils.youtube_utils import load_youtube_content, iter_youtube_content, is_youtube_url, extract_video_id
+from app.utils.powerpoint_utils import load_pptx_from_private_url, iter_pptx_from_private_url, is_powerpoint_url
+from app.utils.webpage_utils import load_webpage_content, iter_webpage_content, is_webpage_url
+from app.utils.handwritten_utils import (
+    load_handwritten_from_private_url,
+    load_handwritten_bundle,
+    is_image_url,
+    is_image_bundle_url
+)
+from app.utils.async_utils import run_coroutine_sync
+from app.utils.http_utils import http_get_prefix
+from app.utils.blob_utils import resolve_blob_client, download_blob_prefix, is_blob_storage_url
+from app.utils.content_cache import compute_content_hash, get_blob_content_hash
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-def detect_content_type(url: str) -> str:
+# Concurrency settings for loading many URLs at once (can be set via env variables)
+LOAD_MAX_WORKERS = int(os.getenv("LOAD_MAX_WORKERS", "16"))
+LOAD_CONCURRENCY_PER_HOST = int(os.getenv("LOAD_CONCURRENCY_PER_HOST", "6"))
+LOAD_CONCURRENCY_BY_TYPE = {
+    'pdf': int(os.getenv("LOAD_CONCURRENCY_PDF", "4")),
+    'powerpoint': int(os.getenv("LOAD_CONCURRENCY_POWERPOINT", "4")),
+    'youtube': int(os.getenv("LOAD_CONCURRENCY_YOUTUBE", "2")),  # Whisper is CPU-heavy
+    'image': int(os.getenv("LOAD_CONCURRENCY_IMAGE", "2")),  # OCR is CPU-heavy
+    'webpage': int(os.getenv("LOAD_CONCURRENCY_WEBPAGE", "12")),  # I/O-bound
+    'unknown': int(os.getenv("LOAD_CONCURRENCY_UNKNOWN", "4"))
+}
+
+# Content sniffing settings: the first bytes of a URL decide its loader
+CONTENT_SNIFF_ENABLED = os.getenv("CONTENT_SNIFF_ENABLED", "true").lower() == "true"
+CONTENT_SNIFF_BYTES = int(os.getenv("CONTENT_SNIFF_BYTES", "8192"))  # Enough to see the part names of a .pptx
+CONTENT_SNIFF_TIMEOUT = int(os.getenv("CONTENT_SNIFF_TIMEOUT", "10"))
+CONTENT_SNIFF_CACHE_SIZE = int(os.getenv("CONTENT_SNIFF_CACHE_SIZE", "1024"))  # Sniffed URLs kept in memory
+
+SNIFF_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+# Leading bytes of the formats the loaders handle
+IMAGE_SIGNATURES = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"GIF87a", b"GIF89a", b"BM", b"II*\x00", b"MM\x00*")
+ZIP_SIGNATURE = b"PK\x03\x04"
+HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body")
+
+POWERPOINT_MIME_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+MIME_CONTENT_TYPES = {
+    'application/pdf': 'pdf',
+    POWERPOINT_MIME_TYPE: 'powerpoint',
+    'text/html': 'webpage',
+    'application/xhtml+xml': 'webpage'
+}
+
+_loader_executor = None
+_loader_executor_lock = threading.Lock()
+
+_sniff_cache: "OrderedDict[Tuple[str, Optional[str]], Optional[str]]" = OrderedDict()
+_sniff_cache_lock = threading.Lock()
+
+
+def classify_content(head: bytes, mime_type: str = None, url: str = "") -> Optional[str]:
     """
-    Detects the type of content at the specified URL
+    Classifies content by its leading bytes, falling back to the declared MIME type
+
+    Args:
+        head: First bytes of the content
+        mime_type: Content-Type reported by the server or stored on the blob
+        url: URL or blob name of the content (tells ZIP bundles of note photos apart)
+
+    Returns:
+        str: 'pdf', 'powerpoint', 'image' or 'webpage', or None if nothing is conclusive
+    """
+    mime_type = (mime_type or "").split(";")[0].strip().lower()
+
+    # PDF readers accept the header anywhere in the first kilobyte
+    if b"%PDF-" in head[:1024]:
+        return 'pdf'
+    if head.startswith(IMAGE_SIGNATURES) or (head[:4] == b"RIFF" and head[8:12] == b"WEBP"):
+        return 'image'
+    if head.startswith(ZIP_SIGNATURE):
+        # Decks keep their parts under ppt/; other archives are only loadable as note bundles
+        if b"ppt/" in head or mime_type == POWERPOINT_MIME_TYPE:
+            return 'powerpoint'
+        return 'image' if is_image_bundle_url(url) else None
+
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if text.startswith(b"<") and any(marker in text[:1024] for marker in HTML_MARKERS):
+        return 'webpage'
+
+    if mime_type.startswith("image/") and mime_type != "image/svg+xml":
+        return 'image'
+    return MIME_CONTENT_TYPES.get(mime_type)
+
+
+def _fetch_content_head(
+        url: str,
+        connection_string: str = None,
+        container_name: str = None
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Reads the first bytes of a URL or blob and its Content-Type with one range request
+
+    Args:
+        url: URL or blob name of the content
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
+
+    Returns:
+        Tuple[bytes, str]: Leading bytes and declared Content-Type
+    """
+    if url.startswith(('http://', 'https://')) and not is_blob_storage_url(url):
+        response = http_get_prefix(url, CONTENT_SNIFF_BYTES, headers=SNIFF_REQUEST_HEADERS, timeout=CONTENT_SNIFF_TIMEOUT)
+        response.raise_for_status()
+        return response.content, response.headers.get("Content-Type")
+
+    blob_client, _ = resolve_blob_client(url, connection_string, container_name)
+    return download_blob_prefix(blob_client, CONTENT_SNIFF_BYTES)
+
+
+def sniff_content_type(
+        url: str,
+        connection_string: str = None,
+        container_name: str = None
+) -> Optional[str]:
+    """
+    Determines the type of content at a URL from its first bytes. Results are cached
+    by URL, so detection and the loader that follows never re-sniff the same address.
+
+    Args:
+        url: URL or blob name of the content
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
+
+    Returns:
+        str: 'pdf', 'powerpoint', 'image' or 'webpage', or None if the content could not be classified
+    """
+    key = (url, container_name)
+    with _sniff_cache_lock:
+        if key in _sniff_cache:
+            _sniff_cache.move_to_end(key)
+            return _sniff_cache[key]
+
+    try:
+        head, mime_type = _fetch_content_head(url, connection_string, container_name)
+    except Exception as e:
+        # Not cached: the next request may reach the content
+        logger.warning(f"Could not sniff content type of {url}: {str(e)}")
+        return None
+
+    content_type = classify_content(head, mime_type, url)
+    logger.info(f"Sniffed content type {content_type} (Content-Type: {mime_type}) for URL: {url}")
+
+    with _sniff_cache_lock:
+        _sniff_cache[key] = content_type
+        while len(_sniff_cache) > CONTENT_SNIFF_CACHE_SIZE:
+            _sniff_cache.popitem(last=False)
+    return content_type
+
+
+def detect_content_type(url: str, connection_string: str = None, container_name: str = None) -> str:
+    """
+    Detects the type of content at the specified URL. The content's first bytes are
+    sniffed when possible; the URL extension is only used when sniffing is inconclusive.
 
     Args:
         url: URL to check
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
 
     Returns:
         str: Content type identifier ('pdf', 'youtube', 'powerpoint', 'webpage', 'image', 'unknown')
     """
+    if is_youtube_url(url):
+        return 'youtube'
+
+    if CONTENT_SNIFF_ENABLED:
+        sniffed_type = sniff_content_type(url, connection_string, container_name)
+        if sniffed_type:
+            return sniffed_type
+
     if is_pdf_url(url):
         return 'pdf'
-    elif is_youtube_url(url):
-        return 'youtube'
     elif is_powerpoint_url(url):
         return 'powerpoint'
     elif is_image_url(url):
@@ -38,11 +202,82 @@ def detect_content_type(url: str) -> str:
         # Default to webpage for anything else
         return 'unknown'
 
+def _get_file_identity(url: str, connection_string: str = None, container_name: str = None) -> Optional[str]:
+    """
+    Identifies a file without downloading it: the Content-MD5 of a blob, or the strong
+    ETag of a plain HTTP file
+
+    Args:
+        url: URL or blob name of the file
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
+
+    Returns:
+        str: File identity, or None if the storage offers none
+    """
+    if url.startswith(('http://', 'https://')) and not is_blob_storage_url(url):
+        response = http_get_prefix(url, 1, headers=SNIFF_REQUEST_HEADERS, timeout=CONTENT_SNIFF_TIMEOUT)
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        # A weak ETag only promises equivalent content, not the same bytes
+        if not etag or etag.startswith("W/"):
+            return None
+        return "etag:" + compute_content_hash(f"{url}\n{etag}".encode("utf-8"))
+
+    blob_client, _ = resolve_blob_client(url, connection_string, container_name)
+    return get_blob_content_hash(blob_client)
+
+
+def get_content_identity(
+        url: str,
+        content_type: str,
+        connection_string: str = None,
+        container_name: str = None,
+        pages: List[str] = None
+) -> Optional[str]:
+    """
+    Identifies the content behind a URL before it is loaded, for caches that are keyed
+    by what a URL holds rather than by the URL: the video ID of a YouTube link, the
+    Content-MD5 of a blob (or the strong ETag of an HTTP file), or for a bundle of note
+    pages the hash over the identities of its pages
+
+    Args:
+        url: URL or blob name of the content
+        content_type: Type of content ('pdf', 'youtube', 'powerpoint', 'webpage', 'image')
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
+        pages: Image URLs or blob names of a handwritten-notes bundle, in page order
+
+    Returns:
+        str: Content identity, or None if the content cannot be identified without
+             loading it (e.g. webpages)
+    """
+    try:
+        if pages:
+            page_identities = [_get_file_identity(page, connection_string, container_name) for page in pages]
+            if not all(page_identities):
+                return None
+            return "bundle:" + compute_content_hash("\n".join(page_identities).encode("utf-8"))
+
+        if content_type == 'youtube':
+            video_id = extract_video_id(url)
+            return f"youtube:{video_id}" if video_id else None
+
+        if content_type in ('pdf', 'powerpoint', 'image'):
+            return _get_file_identity(url, connection_string, container_name)
+        return None
+
+    except Exception as e:
+        logger.warning(f"Could not identify content of {url}: {str(e)}")
+        return None
+
+
 def load_content(
         url: str,
         content_type: str = None,
         connection_string: str = None,
-        container_name: str = None
+        container_name: str = None,
+        pages: List[str] = None
 ) -> Optional[List[Document]]:
     """
     Loads and processes content from a URL based on the content type
@@ -53,14 +288,24 @@ def load_content(
                       If None, type will be auto-detected
         connection_string: Azure Storage connection string (if applicable)
         container_name: Azure Blob container name (if applicable)
+        pages: Image URLs or blob names of a handwritten-notes bundle, in page order.
+               When given, they are loaded as one document set recorded under url
 
     Returns:
         List[Document]: List of Document objects or None if loading fails
     """
     try:
+        if pages:
+            return load_handwritten_bundle(
+                pages,
+                connection_string=connection_string,
+                container_name=container_name,
+                bundle_source=url
+            )
+
         # Auto-detect content type if not provided
         if not content_type:
-            content_type = detect_content_type(url)
+            content_type = detect_content_type(url, connection_string, container_name)
             logger.info(f"Auto-detected content type: {content_type} for URL: {url}")
 
         # Load content based on type
@@ -87,14 +332,13 @@ def load_content(
         elif content_type == 'webpage':
             return load_webpage_content(url)
         else:
-            # For unknown content types, try webpage loader first, then PDF as fallback
-            logger.warning(f"Unknown content type for {url}, trying webpage loader")
-            webpage_docs = load_webpage_content(url)
+            # Neither the content nor the URL gave a known format: use the one loader
+            # that fits the address instead of downloading it with several
+            if url.startswith(('http://', 'https://')) and not is_blob_storage_url(url):
+                logger.warning(f"Unknown content type for {url}, trying webpage loader")
+                return load_webpage_content(url)
 
-            if webpage_docs:
-                return webpage_docs
-
-            logger.warning(f"Webpage loader failed for {url}, trying PDF loader")
+            logger.warning(f"Unknown content type for {url}, trying PDF loader")
             return load_pdf_from_private_url(
                 private_url=url,
                 connection_string=connection_string,
@@ -106,14 +350,116 @@ def load_content(
         return None
 
 
-def load_multiple_content(
+def iter_content(
+        url: str,
+        content_type: str = None,
+        connection_string: str = None,
+        container_name: str = None,
+        pages: List[str] = None
+) -> Iterator[Document]:
+    """
+    Streaming variant of load_content: yields documents as the loader extracts them,
+    so chunking and summarization can start before the whole file is parsed.
+    Content types without a streaming loader yield the result of load_content.
+
+    Args:
+        url: URL of the content to load
+        content_type: Type of content ('pdf', 'youtube', 'powerpoint', 'webpage', 'image')
+                      If None, type will be auto-detected
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
+        pages: Image URLs or blob names of a handwritten-notes bundle, in page order
+
+    Yields:
+        Document: Loaded documents in source order
+
+    Raises:
+        Exception: If the content cannot be loaded
+    """
+    if pages:
+        # Bundle pages are recognized concurrently, so they are returned together
+        yield from load_content(
+            url,
+            connection_string=connection_string,
+            container_name=container_name,
+            pages=pages
+        ) or []
+        return
+
+    if not content_type:
+        content_type = detect_content_type(url, connection_string, container_name)
+        logger.info(f"Auto-detected content type: {content_type} for URL: {url}")
+
+    if content_type == 'pdf':
+        yield from iter_pdf_from_private_url(
+            private_url=url,
+            connection_string=connection_string,
+            container_name=container_name
+        )
+    elif content_type == 'youtube':
+        yield from iter_youtube_content(url)
+    elif content_type == 'powerpoint':
+        yield from iter_pptx_from_private_url(
+            private_url=url,
+            connection_string=connection_string,
+            container_name=container_name
+        )
+    elif content_type == 'webpage':
+        yield from iter_webpage_content(url)
+    else:
+        yield from load_content(
+            url,
+            content_type=content_type,
+            connection_string=connection_string,
+            container_name=container_name
+        ) or []
+
+
+def _get_load_host(url: str) -> str:
+    """
+    Returns the remote host a URL will be downloaded from, for per-host limits
+
+    Args:
+        url: URL or blob name of the content
+
+    Returns:
+        str: Host name, or 'azure-blob' for bare blob names
+    """
+    host = urlparse(url).netloc.lower()
+    return host if host else 'azure-blob'
+
+
+def _get_loader_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool used to run the blocking loaders
+
+    Returns:
+        ThreadPoolExecutor: Process-wide loader pool
+    """
+    global _loader_executor
+
+    if _loader_executor is None:
+        with _loader_executor_lock:
+            if _loader_executor is None:
+                _loader_executor = ThreadPoolExecutor(
+                    max_workers=LOAD_MAX_WORKERS,
+                    thread_name_prefix="content-loader"
+                )
+    return _loader_executor
+
+
+async def iter_load_multiple_content(
         urls: List[str],
         content_types: List[str] = None,
         connection_string: str = None,
         container_name: str = None
-) -> Dict[str, Any]:
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
     """
-    Loads and processes content from multiple URLs
+    Loads content from multiple URLs concurrently and yields each result as soon as it completes.
+
+    Loads run on a bounded thread pool. Each one first takes a slot for its content
+    type (so CPU-heavy Whisper and OCR loads stay few while webpages fan out) and then
+    a slot for its remote host. Sniffing the type of an untyped URL also takes a host slot.
 
     Args:
         urls: List of URLs to load
@@ -121,39 +467,136 @@ def load_multiple_content(
         connection_string: Azure Storage connection string (if applicable)
         container_name: Azure Blob container name (if applicable)
 
-    Returns:
-        Dict: Dictionary with results for each URL
+    Yields:
+        Tuple[str, Dict]: URL and its result dictionary, in completion order
     """
-    results = {}
-
     if content_types and len(content_types) != len(urls):
-        logger.error("If content_types is provided, it must have the same length as urls")
-        return {"status": "error", "message": "Content types list must match URLs list"}
+        raise ValueError("Content types list must match URLs list")
+
+    loop = asyncio.get_running_loop()
+    executor = _get_loader_executor()
 
-    for i, url in enumerate(urls):
+    # Semaphores are created per call so they belong to the running event loop
+    type_limits = {
+        content_type: asyncio.Semaphore(limit)
+        for content_type, limit in LOAD_CONCURRENCY_BY_TYPE.items()
+    }
+    host_limits = defaultdict(lambda: asyncio.Semaphore(LOAD_CONCURRENCY_PER_HOST))
+
+    async def load_one(url: str, content_type: Optional[str]) -> Tuple[str, Dict[str, Any]]:
         try:
-            content_type = content_types[i] if content_types else None
-            documents = load_content(
-                url=url,
-                content_type=content_type,
-                connection_string=connection_string,
-                container_name=container_name
-            )
+            host_limit = host_limits[_get_load_host(url)]
+
+            resolved_type = content_type
+            if not resolved_type:
+                # Sniffing does a small blocking read of the host, so it runs on the pool under
+                # the host's limit; the slot is released before waiting for a type slot
+                async with host_limit:
+                    resolved_type = await loop.run_in_executor(
+                        executor,
+                        partial(detect_content_type, url, connection_string, container_name)
+                    )
+            type_limit = type_limits.get(resolved_type, type_limits['unknown'])
+
+            async with type_limit:
+                async with host_limit:
+                    documents = await loop.run_in_executor(
+                        executor,
+                        partial(
+                            load_content,
+                            url=url,
+                            content_type=resolved_type,
+                            connection_string=connection_string,
+                            container_name=container_name
+                        )
+                    )
 
-            results[url] = {
+            return url, {
                 "status": "success" if documents else "error",
                 "documents": documents,
                 "document_count": len(documents) if documents else 0,
-                "content_type": content_type or detect_content_type(url)
+                "content_type": resolved_type
             }
 
         except Exception as e:
             logger.error(f"Error loading content from {url}: {str(e)}")
-            results[url] = {
+            return url, {
                 "status": "error",
                 "error_message": str(e),
                 "documents": None,
                 "document_count": 0
             }
 
-    return results
\ No newline at end of file
+    tasks = [
+        asyncio.ensure_future(load_one(url, content_types[i] if content_types else None))
+        for i, url in enumerate(urls)
+    ]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Don't leave loads running if the consumer stops early
+        for task in tasks:
+            task.cancel()
+
+
+async def load_multiple_content_async(
+        urls: List[str],
+        content_types: List[str] = None,
+        connection_string: str = None,
+        container_name: str = None
+) -> Dict[str, Any]:
+    """
+    Loads and processes content from multiple URLs concurrently
+
+    Args:
+        urls: List of URLs to load
+        content_types: List of content types (must match the URLs list)
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
+
+    Returns:
+        Dict: Dictionary with results for each URL
+    """
+    if content_types and len(content_types) != len(urls):
+        logger.error("If content_types is provided, it must have the same length as urls")
+        return {"status": "error", "message": "Content types list must match URLs list"}
+
+    results = {}
+    async for url, result in iter_load_multiple_content(
+            urls,
+            content_types=content_types,
+            connection_string=connection_string,
+            container_name=container_name
+    ):
+        results[url] = result
+
+    return results
+
+
+def load_multiple_content(
+        urls: List[str],
+        content_types: List[str] = None,
+        connection_string: str = None,
+        container_name: str = None
+) -> Dict[str, Any]:
+    """
+    Loads and processes content from multiple URLs concurrently.
+    Blocking wrapper around load_multiple_content_async for synchronous callers.
+
+    Args:
+        urls: List of URLs to load
+        content_types: List of content types (must match the URLs list)
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name (if applicable)
+
+    Returns:
+        Dict: Dictionary with results for each URL
+    """
+    return run_coroutine_sync(load_multiple_content_async(
+        urls,
+        content_types=content_types,
+        connection_string=connection_string,
+        container_name=container_name
+    ))
@@ -95,6 +95,7 @@ def initialize_database():
         collections_to_setup = {
             "documents": [
                 ("url", ASCENDING, {"unique": True}),  # URL is unique
+                ("content_hash", ASCENDING, {}),  # For finding identical uploads under different URLs
                 ("title", TEXT, {}),  # For text search on titles
                 ("uploaded_at", -1, {})  # For sorting by upload date
             ],
@@ -129,6 +130,13 @@ def initialize_database():
             ],
             "study_plans": [
                 ("user_id", ASCENDING, {})
+            ],
+            "youtube_videos": [
+                ("video_id", ASCENDING, {"unique": True})  # Cached metadata and transcripts per video
+            ],
+            "summary_cache": [
+                ("cache_key", ASCENDING, {}),  # Summaries shared across users; regenerated ones get new entries
+                ("expires_at", ASCENDING, {})  # Expired entries are not reused but stay readable for their records
             ]
         }
 
@@ -1,16 +1,29 @@
+import io
 import os
-import tempfile
+import re
+import asyncio
+import zipfile
 import logging
-import requests
-from typing import List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 from langchain.schema import Document
 from PIL import Image
-import pytesseract
-from azure.storage.blob import BlobServiceClient
-from azure.ai.formrecognizer import DocumentAnalysisClient
+from azure.ai.formrecognizer.aio import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
 from urllib.parse import urlparse
+from app.utils.async_utils import run_in_background_loop, await_in_background_loop
+from app.utils.content_cache import load_with_cache, get_blob_content_hash, get_document_cache, compute_content_hash
+from app.utils.http_utils import http_get
+from app.utils.blob_utils import (
+    get_blob_service_client,
+    download_blob_bytes,
+    is_blob_storage_url,
+    parse_blob_url,
+    resolve_blob_client
+)
+from app.utils.ocr_utils import ocr_image, ocr_images
 
 # Load environment variables
 load_dotenv()
@@ -18,9 +31,34 @@ load_dotenv()
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Configure OCR - set Tesseract path if not in PATH
-if os.getenv("TESSERACT_PATH"):
-    pytesseract.pytesseract.tesseract_cmd = os.getenv("TESSERACT_PATH")
+# Bundle settings: a ZIP or list of note photos is downloaded and recognized as one document set
+HANDWRITTEN_BUNDLE_MAX_PAGES = int(os.getenv("HANDWRITTEN_BUNDLE_MAX_PAGES", "200"))
+HANDWRITTEN_BUNDLE_MAX_MB = int(os.getenv("HANDWRITTEN_BUNDLE_MAX_MB", "512"))  # Uncompressed image bytes
+HANDWRITTEN_BUNDLE_WORKERS = int(os.getenv("HANDWRITTEN_BUNDLE_WORKERS", "8"))  # Concurrent downloads / Azure calls
+
+# Azure Form Recognizer settings: pages are analyzed concurrently on one shared async client,
+# and a page whose analysis exceeds the latency budget is recognized with local Tesseract instead
+AZURE_OCR_LATENCY_BUDGET = float(os.getenv("AZURE_OCR_LATENCY_BUDGET_SECONDS", "20"))
+AZURE_OCR_MAX_CONCURRENCY = int(os.getenv("AZURE_OCR_MAX_CONCURRENCY", "8"))  # Analyses in flight at once
+AZURE_OCR_POLLING_INTERVAL = float(os.getenv("AZURE_OCR_POLLING_INTERVAL_SECONDS", "1"))
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']
+
+# Browser-like headers for image downloads from regular websites
+IMAGE_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Cache-Control': 'max-age=0'
+}
+
+_bundle_executor = None
+_bundle_executor_lock = threading.Lock()
+
+# Async Form Recognizer clients by (endpoint, key); they only ever run on the background loop
+_form_recognizer_clients = {}
 
 
 def is_image_url(url: str) -> bool:
@@ -38,14 +76,27 @@ def is_image_url(url: str) -> bool:
 
     # Check the file extension
     path = parsed_url.path.lower()
-    image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']
 
-    return any(path.endswith(ext) for ext in image_extensions)
+    return any(path.endswith(ext) for ext in IMAGE_EXTENSIONS) or is_image_bundle_url(url)
+
+
+def is_image_bundle_url(url: str) -> bool:
+    """
+    Determines if a URL or blob name points at a ZIP bundle of note images
+
+    Args:
+        url: URL or blob name to check
+
+    Returns:
+        bool: True if the URL looks like a ZIP archive
+    """
+    return urlparse(url).path.lower().endswith('.zip')
 
 
 def process_image_with_tesseract(image_path: str) -> Optional[str]:
     """
-    Process an image with Tesseract OCR
+    Process an image with Tesseract OCR. The image is rotated, downscaled, binarized
+    and deskewed first; tall pages are recognized as parallel line bands.
 
     Args:
         image_path: Path to the image file
@@ -55,17 +106,11 @@ def process_image_with_tesseract(image_path: str) -> Optional[str]:
     """
     try:
         # Open the image with PIL
-        image = Image.open(image_path)
-
-        # Use pytesseract to extract text (with optimal settings for handwriting)
-        text = pytesseract.image_to_string(
-            image,
-            lang='eng',  # Can be changed based on language
-            config='--psm 6 --oem 3'  # Page segmentation mode & OCR Engine mode
-        )
+        with Image.open(image_path) as image:
+            text = ocr_image(image)
 
         logger.info(f"Successfully extracted text with Tesseract from {image_path}")
-        return text.strip()
+        return text
 
     except Exception as e:
         logger.error(f"Error extracting text with Tesseract from {image_path}: {str(e)}")
@@ -74,7 +119,8 @@ def process_image_with_tesseract(image_path: str) -> Optional[str]:
 
 def process_image_with_azure(image_path: str) -> Optional[str]:
     """
-    Process an image with Azure Form Recognizer (better for handwriting)
+    Process an image with Azure Form Recognizer (better for handwriting), falling
+    back to Tesseract if it is not configured, fails or exceeds the latency budget
 
     Args:
         image_path: Path to the image file
@@ -83,43 +129,194 @@ def process_image_with_azure(image_path: str) -> Optional[str]:
         str: Extracted text or None if extraction fails
     """
     try:
-        # Get Form Recognizer credentials from environment
-        endpoint = os.getenv("AZURE_FORM_RECOGNIZER_ENDPOINT")
-        key = os.getenv("AZURE_FORM_RECOGNIZER_KEY")
-
-        if not endpoint or not key:
-            logger.warning("Azure Form Recognizer credentials not found, falling back to Tesseract")
-            return process_image_with_tesseract(image_path)
-
-        # Create client
-        document_analysis_client = DocumentAnalysisClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-
         # Read the file content
         with open(image_path, "rb") as f:
             file_content = f.read()
 
-        # Begin analysis (using prebuilt-read model for handwriting)
-        poller = document_analysis_client.begin_analyze_document(
-            "prebuilt-read", file_content
-        )
-        result = poller.result()
-
-        # Extract text from the result
-        extracted_text = ""
-        for page in result.pages:
-            for line in page.lines:
-                extracted_text += line.content + "\n"
+        extracted_text = recognize_images([file_content])[0]
 
-        logger.info(f"Successfully extracted text with Azure Form Recognizer from {image_path}")
-        return extracted_text.strip()
+        logger.info(f"Successfully extracted text from {image_path}")
+        return extracted_text
 
     except Exception as e:
-        logger.error(f"Error with Azure Form Recognizer for {image_path}: {str(e)}")
-        logger.info("Falling back to Tesseract OCR")
-        return process_image_with_tesseract(image_path)
+        logger.error(f"Error extracting text from {image_path}: {str(e)}")
+        return None
+
+
+def _get_form_recognizer_client(endpoint: str, key: str) -> DocumentAnalysisClient:
+    """
+    Returns the shared async Form Recognizer client for an endpoint; must be called
+    on the background loop. The client keeps its connections open between analyses.
+
+    Args:
+        endpoint: Form Recognizer endpoint
+        key: Form Recognizer key
+
+    Returns:
+        DocumentAnalysisClient: Shared async client
+    """
+    client = _form_recognizer_clients.get((endpoint, key))
+    if client is None:
+        client = DocumentAnalysisClient(endpoint=endpoint, credential=AzureKeyCredential(key))
+        _form_recognizer_clients[(endpoint, key)] = client
+    return client
+
+
+async def _analyze_with_azure(data: bytes, endpoint: str, key: str) -> str:
+    """
+    Reads the text of an image with the Azure Form Recognizer prebuilt-read model.
+    Polling for the result is awaited, so other analyses proceed meanwhile.
+
+    Args:
+        data: Raw bytes of the image file
+        endpoint: Form Recognizer endpoint
+        key: Form Recognizer key
+
+    Returns:
+        str: Extracted text (one line per recognized line)
+    """
+    client = _get_form_recognizer_client(endpoint, key)
+
+    # Begin analysis (using prebuilt-read model for handwriting)
+    poller = await client.begin_analyze_document(
+        "prebuilt-read", data, polling_interval=AZURE_OCR_POLLING_INTERVAL
+    )
+    result = await poller.result()
+
+    # Extract text from the result
+    extracted_text = ""
+    for page in result.pages:
+        for line in page.lines:
+            extracted_text += line.content + "\n"
+
+    return extracted_text.strip()
+
+
+def _ocr_image_bytes(pages: List[bytes]) -> List[Optional[str]]:
+    """
+    Recognizes images locally with Tesseract in one batch
+
+    Args:
+        pages: Raw bytes of each image
+
+    Returns:
+        List[Optional[str]]: Extracted text per image (None if it could not be read)
+    """
+    images = []
+    for index, data in enumerate(pages):
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            images.append(image)
+        except Exception as e:
+            logger.error(f"Could not decode image {index + 1}: {str(e)}")
+            images.append(None)
+
+    decoded = [image for image in images if image is not None]
+    texts = iter(ocr_images(decoded)) if decoded else iter([])
+    return [(next(texts) or None) if image is not None else None for image in images]
+
+
+async def _recognize_images_on_loop(pages: List[bytes]) -> List[Optional[str]]:
+    """
+    Recognizes images on the background loop: Azure Form Recognizer analyzes them
+    concurrently, and each page it cannot read within the latency budget is
+    recognized with Tesseract as soon as its budget runs out
+
+    Args:
+        pages: Raw bytes of each image
+
+    Returns:
+        List[Optional[str]]: Extracted text per image (None if nothing was found)
+    """
+    loop = asyncio.get_running_loop()
+    endpoint = os.getenv("AZURE_FORM_RECOGNIZER_ENDPOINT")
+    key = os.getenv("AZURE_FORM_RECOGNIZER_KEY")
+
+    if not endpoint or not key:
+        logger.info("Azure Form Recognizer credentials not found, using Tesseract")
+        return await loop.run_in_executor(_get_bundle_executor(), _ocr_image_bytes, pages)
+
+    limit = asyncio.Semaphore(AZURE_OCR_MAX_CONCURRENCY)
+
+    async def recognize(index: int, data: bytes) -> Optional[str]:
+        try:
+            async with limit:
+                text = await asyncio.wait_for(_analyze_with_azure(data, endpoint, key), AZURE_OCR_LATENCY_BUDGET)
+            if text:
+                return text
+            logger.info(f"Azure Form Recognizer found no text on image {index + 1}, trying Tesseract")
+        except asyncio.TimeoutError:
+            logger.warning(f"Azure Form Recognizer exceeded {AZURE_OCR_LATENCY_BUDGET:.0f}s on image {index + 1}, "
+                           f"falling back to Tesseract")
+        except Exception as e:
+            logger.error(f"Error with Azure Form Recognizer on image {index + 1}: {str(e)}")
+            logger.info("Falling back to Tesseract OCR")
+
+        return (await loop.run_in_executor(_get_bundle_executor(), _ocr_image_bytes, [data]))[0]
+
+    return list(await asyncio.gather(*(recognize(index, data) for index, data in enumerate(pages))))
+
+
+def recognize_images(pages: List[bytes]) -> List[Optional[str]]:
+    """
+    Recognizes the text of several images, trying Azure Form Recognizer before Tesseract.
+    Blocks the calling (worker) thread, not an event loop.
+
+    Args:
+        pages: Raw bytes of each image
+
+    Returns:
+        List[Optional[str]]: Extracted text per image, in input order (None if nothing was found)
+    """
+    return run_in_background_loop(_recognize_images_on_loop(pages))
+
+
+async def recognize_images_async(pages: List[bytes]) -> List[Optional[str]]:
+    """
+    Async variant of recognize_images for code running on an event loop
+
+    Args:
+        pages: Raw bytes of each image
+
+    Returns:
+        List[Optional[str]]: Extracted text per image, in input order (None if nothing was found)
+    """
+    return await await_in_background_loop(_recognize_images_on_loop(pages))
+
+
+async def close_form_recognizer_clients() -> None:
+    """
+    Closes the shared Form Recognizer clients. Called on application shutdown.
+    """
+    async def close_all():
+        for client_key in list(_form_recognizer_clients):
+            client = _form_recognizer_clients.pop(client_key)
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing Form Recognizer client: {str(e)}")
+
+    if _form_recognizer_clients:
+        await await_in_background_loop(close_all())
+
+
+def _extract_text_from_image_bytes(data: bytes) -> Optional[List[Document]]:
+    """
+    Runs OCR over raw image bytes, trying Azure Form Recognizer before Tesseract
+
+    Args:
+        data: Raw bytes of the image file
+
+    Returns:
+        List[Document]: Single-element list with the extracted text or None if no text was found
+    """
+    extracted_text = recognize_images([data])[0]
+
+    if not extracted_text:
+        return None
+
+    return [Document(page_content=extracted_text, metadata={"type": "handwritten_notes"})]
 
 
 def load_handwritten_from_url(image_url: str) -> Optional[List[Document]]:
@@ -133,18 +330,8 @@ def load_handwritten_from_url(image_url: str) -> Optional[List[Document]]:
         List[Document]: List of Document objects or None if processing fails
     """
     try:
-        # Set up headers to mimic a regular browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'image/*,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'max-age=0'
-        }
-
-        # Download the image
-        response = requests.get(image_url, stream=True, headers=headers)
+        # Download the image with headers that mimic a regular browser
+        response = http_get(image_url, headers=IMAGE_REQUEST_HEADERS)
         response.raise_for_status()
 
         # Check content type to ensure it's an image
@@ -152,31 +339,16 @@ def load_handwritten_from_url(image_url: str) -> Optional[List[Document]]:
         if not content_type.startswith('image/'):
             logger.warning(f"Content type does not appear to be an image: {content_type}")
 
-        # Create a temporary file for the image
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-            temp_path = temp_file.name
-            for chunk in response.iter_content(chunk_size=8192):
-                temp_file.write(chunk)
-
-        # Try Azure Form Recognizer first (better for handwriting)
-        extracted_text = process_image_with_azure(temp_path)
-
-        # If Azure fails or returns empty, try Tesseract
-        if not extracted_text:
-            extracted_text = process_image_with_tesseract(temp_path)
-
-        # Clean up temporary file
-        os.unlink(temp_path)
-
-        # If we got text, create a Document
-        if extracted_text:
-            doc = Document(
-                page_content=extracted_text,
-                metadata={
-                    "source": image_url,
-                    "type": "handwritten_notes"
-                }
-            )
+        # OCR the image, reusing the text if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: response.content,
+            parse=_extract_text_from_image_bytes
+        )
+
+        # If we got text, set the source on the Document
+        if documents:
+            doc = documents[0]
+            doc.metadata["source"] = image_url
 
             logger.info(f"Successfully processed handwritten notes from {image_url}")
             return [doc]
@@ -186,12 +358,6 @@ def load_handwritten_from_url(image_url: str) -> Optional[List[Document]]:
 
     except Exception as e:
         logger.error(f"Error processing handwritten notes from {image_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -217,32 +383,22 @@ def load_handwritten_from_storage_url(
                 logger.error("Azure connection string not provided and not found in environment variables")
                 return None
 
-        # Parse the storage URL
-        parsed_url = urlparse(storage_url)
-
-        # Check if it's a valid Azure blob storage URL
-        if not parsed_url.netloc.endswith('.blob.core.windows.net'):
+        # Check if it's a valid Azure blob storage URL (or a local emulator URL)
+        if not is_blob_storage_url(storage_url):
             logger.error(f"URL does not appear to be an Azure Blob Storage URL: {storage_url}")
             return None
 
-        # Extract path components - remove leading slash
-        path = parsed_url.path
-        if path.startswith('/'):
-            path = path[1:]
-
         # Split into container and blob name
-        parts = path.split('/', 1)
-        if len(parts) != 2:
-            logger.error(f"URL does not contain both container and blob name: {storage_url}")
+        try:
+            container_name, blob_name = parse_blob_url(storage_url)
+        except ValueError as e:
+            logger.error(str(e))
             return None
 
-        container_name = parts[0]
-        blob_name = parts[1]
-
         logger.info(f"Parsed URL - Container: {container_name}, Blob: {blob_name}")
 
-        # Create a BlobServiceClient using the connection string
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Get the shared BlobServiceClient for this connection string
+        blob_service_client = get_blob_service_client(connection_string)
 
         # Get the container client
         container_client = blob_service_client.get_container_client(container_name)
@@ -250,35 +406,17 @@ def load_handwritten_from_storage_url(
         # Get the blob client
         blob_client = container_client.get_blob_client(blob_name)
 
-        # Create a temporary file for the image
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-            temp_path = temp_file.name
-
-            # Download the blob content
-            blob_data = blob_client.download_blob()
-
-            # Write the image content to the temporary file
-            temp_file.write(blob_data.readall())
-
-        # Try Azure Form Recognizer first (better for handwriting)
-        extracted_text = process_image_with_azure(temp_path)
-
-        # If Azure fails or returns empty, try Tesseract
-        if not extracted_text:
-            extracted_text = process_image_with_tesseract(temp_path)
-
-        # Clean up temporary file
-        os.unlink(temp_path)
+        # Download and OCR the image, reusing the text if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: download_blob_bytes(blob_client),
+            parse=_extract_text_from_image_bytes,
+            content_hash=get_blob_content_hash(blob_client)
+        )
 
-        # If we got text, create a Document
-        if extracted_text:
-            doc = Document(
-                page_content=extracted_text,
-                metadata={
-                    "source": storage_url,
-                    "type": "handwritten_notes"
-                }
-            )
+        # If we got text, set the source on the Document
+        if documents:
+            doc = documents[0]
+            doc.metadata["source"] = storage_url
 
             logger.info(f"Successfully processed handwritten notes from {storage_url}")
             return [doc]
@@ -288,12 +426,6 @@ def load_handwritten_from_storage_url(
 
     except Exception as e:
         logger.error(f"Error processing handwritten notes from {storage_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -314,8 +446,16 @@ def load_handwritten_from_private_url(
         List[Document]: List of Document objects or None if processing fails
     """
     try:
+        # ZIP bundles of note photos become one document per page
+        if is_image_bundle_url(private_url):
+            return load_handwritten_zip(
+                private_url,
+                connection_string=connection_string,
+                container_name=container_name
+            )
+
         # For full Azure storage URLs, use the storage loader
-        if private_url.startswith('https://') and '.blob.core.windows.net' in private_url:
+        if is_blob_storage_url(private_url):
             return load_handwritten_from_storage_url(
                 storage_url=private_url,
                 connection_string=connection_string
@@ -323,7 +463,7 @@ def load_handwritten_from_private_url(
 
         # For standard HTTP URLs, use the URL loader
         if private_url.startswith('http://') or private_url.startswith('https://'):
-            if '.blob.core.windows.net' not in private_url:
+            if not is_blob_storage_url(private_url):
                 return load_handwritten_from_url(private_url)
 
         # If none of the above, assume it's an Azure blob reference
@@ -338,8 +478,8 @@ def load_handwritten_from_private_url(
             if not container_name:
                 raise ValueError("Container name not provided and not found in environment variables")
 
-        # Create a BlobServiceClient using the connection string
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Get the shared BlobServiceClient for this connection string
+        blob_service_client = get_blob_service_client(connection_string)
 
         # Get the container client
         container_client = blob_service_client.get_container_client(container_name)
@@ -347,35 +487,17 @@ def load_handwritten_from_private_url(
         # Get the blob client (assuming private_url is the blob name)
         blob_client = container_client.get_blob_client(private_url)
 
-        # Create a temporary file for the image
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-            temp_path = temp_file.name
-
-            # Download the blob content
-            blob_data = blob_client.download_blob()
-
-            # Write the image content to the temporary file
-            temp_file.write(blob_data.readall())
-
-        # Try Azure Form Recognizer first (better for handwriting)
-        extracted_text = process_image_with_azure(temp_path)
-
-        # If Azure fails or returns empty, try Tesseract
-        if not extracted_text:
-            extracted_text = process_image_with_tesseract(temp_path)
-
-        # Clean up temporary file
-        os.unlink(temp_path)
+        # Download and OCR the image, reusing the text if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: download_blob_bytes(blob_client),
+            parse=_extract_text_from_image_bytes,
+            content_hash=get_blob_content_hash(blob_client)
+        )
 
-        # If we got text, create a Document
-        if extracted_text:
-            doc = Document(
-                page_content=extracted_text,
-                metadata={
-                    "source": f"azure-blob://{container_name}/{private_url}",
-                    "type": "handwritten_notes"
-                }
-            )
+        # If we got text, set the source on the Document
+        if documents:
+            doc = documents[0]
+            doc.metadata["source"] = f"azure-blob://{container_name}/{private_url}"
 
             logger.info(f"Successfully processed handwritten notes from blob: {private_url}")
             return [doc]
@@ -385,10 +507,263 @@ def load_handwritten_from_private_url(
 
     except Exception as e:
         logger.error(f"Error processing handwritten notes from private URL {private_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
+        return None
+
+
+def _get_bundle_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool for bundle page downloads and local OCR batches
+
+    Returns:
+        ThreadPoolExecutor: Process-wide bundle pool
+    """
+    global _bundle_executor
+
+    if _bundle_executor is None:
+        with _bundle_executor_lock:
+            if _bundle_executor is None:
+                _bundle_executor = ThreadPoolExecutor(
+                    max_workers=HANDWRITTEN_BUNDLE_WORKERS,
+                    thread_name_prefix="handwritten-bundle"
+                )
+    return _bundle_executor
+
+
+def _download_image_bytes(
+        source: str,
+        connection_string: str = None,
+        container_name: str = None
+) -> Tuple[bytes, str]:
+    """
+    Downloads an image (or bundle) from an Azure Storage URL, a web URL or a bare blob name
+
+    Args:
+        source: URL or blob name
+        connection_string: Azure Storage connection string (uses .env if not provided)
+        container_name: Azure Blob container name for bare blob names (uses .env if not provided)
+
+    Returns:
+        Tuple[bytes, str]: File content and the source string recorded in metadata
+    """
+    if not is_blob_storage_url(source) and source.startswith(('http://', 'https://')):
+        response = http_get(source, headers=IMAGE_REQUEST_HEADERS)
+        response.raise_for_status()
+        return response.content, source
+
+    blob_client, resolved_source = resolve_blob_client(source, connection_string, container_name)
+    return download_blob_bytes(blob_client), resolved_source
+
+
+def _natural_sort_key(name: str) -> list:
+    """Sort key that orders page2.jpg before page10.jpg"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def _read_zip_images(data: bytes) -> List[Tuple[str, bytes]]:
+    """
+    Extracts the images of a ZIP bundle in natural file name order
+
+    Args:
+        data: Raw bytes of the ZIP archive
+
+    Returns:
+        List[Tuple[str, bytes]]: File name and bytes of each image
+
+    Raises:
+        ValueError: If the bundle exceeds the page or size limits
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        entries = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith('__MACOSX/')
+            and not os.path.basename(info.filename).startswith('.')
+            and any(info.filename.lower().endswith(ext) for ext in IMAGE_EXTENSIONS)
+        ]
+        entries.sort(key=lambda info: _natural_sort_key(info.filename))
+
+        if len(entries) > HANDWRITTEN_BUNDLE_MAX_PAGES:
+            raise ValueError(f"Bundle has {len(entries)} images, the limit is {HANDWRITTEN_BUNDLE_MAX_PAGES}")
+        if sum(info.file_size for info in entries) > HANDWRITTEN_BUNDLE_MAX_MB * 1024 * 1024:
+            raise ValueError(f"Bundle images exceed {HANDWRITTEN_BUNDLE_MAX_MB} MB uncompressed")
+
+        return [(info.filename, archive.read(info)) for info in entries]
+
+
+def _recognize_pages(pages: List[bytes]) -> List[Optional[str]]:
+    """
+    Runs OCR over the images of a bundle. Pages already in the content cache are
+    not recognized again; the remaining pages go through recognize_images.
+
+    Args:
+        pages: Raw bytes of each page image
+
+    Returns:
+        List[Optional[str]]: Extracted text per page (None if nothing was found)
+    """
+    cache = get_document_cache()
+    hashes = [compute_content_hash(data) for data in pages]
+    texts: List[Optional[str]] = [None] * len(pages)
+
+    if cache:
+        for index, content_hash in enumerate(hashes):
+            cached = cache.get(content_hash)
+            if cached:
+                texts[index] = cached[0].page_content
+
+    pending = [index for index, text in enumerate(texts) if text is None]
+    if pending:
+        for index, text in zip(pending, recognize_images([pages[index] for index in pending])):
+            texts[index] = text
+
+    if cache:
+        for index in pending:
+            if texts[index]:
+                cache.put(hashes[index], [
+                    Document(page_content=texts[index], metadata={"type": "handwritten_notes"})
+                ])
+
+    return [texts[index] and texts[index].strip() for index in range(len(pages))]
+
+
+def _build_page_documents(
+        pages: List[Tuple[str, bytes]],
+        bundle_source: str,
+        page_numbers: List[int] = None,
+        page_count: int = None
+) -> Optional[List[Document]]:
+    """
+    Recognizes the pages of a bundle and builds one Document per page with text.
+    When some pages of the bundle are missing, the documents keep their original page
+    numbers, list the missing pages and carry no bundle hash, since they do not hold
+    the whole bundle.
+
+    Args:
+        pages: Page name (file name or blob path) and image bytes, in page order
+        bundle_source: Source string of the whole bundle
+        page_numbers: Page number of each entry of pages (defaults to 1..len(pages))
+        page_count: Number of pages of the whole bundle (defaults to len(pages))
+
+    Returns:
+        List[Document]: Page documents in page order or None if no page had text
+    """
+    page_numbers = page_numbers or list(range(1, len(pages) + 1))
+    page_count = page_count or len(pages)
+    missing_pages = sorted(set(range(1, page_count + 1)) - set(page_numbers))
+
+    texts = _recognize_pages([data for _, data in pages])
+
+    # Identifies the bundle as a whole; a page hash alone would match a single upload of that page
+    page_hashes = [compute_content_hash(data) for _, data in pages]
+    bundle_hash = compute_content_hash("\n".join(page_hashes).encode("utf-8"))
+
+    documents = []
+    for index, ((page_name, _), text) in enumerate(zip(pages, texts)):
+        if not text:
+            logger.warning(f"No text found on page {page_numbers[index]} ({page_name}) of {bundle_source}")
+            continue
+
+        metadata = {
+            "source": bundle_source,
+            "page": page_numbers[index],
+            "page_count": page_count,
+            "page_name": page_name,
+            "content_hash": page_hashes[index],
+            "type": "handwritten_notes"
+        }
+        if missing_pages:
+            metadata["missing_pages"] = missing_pages
+        else:
+            metadata["bundle_hash"] = bundle_hash
+        documents.append(Document(page_content=text, metadata=metadata))
+
+    logger.info(f"Extracted text from {len(documents)} of {page_count} pages of {bundle_source}")
+    return documents or None
+
+
+def load_handwritten_bundle(
+        sources: List[str],
+        connection_string: str = None,
+        container_name: str = None,
+        bundle_source: str = None
+) -> Optional[List[Document]]:
+    """
+    Processes several handwritten note images (e.g. the photos of a notebook) as one
+    document set. Pages are downloaded and recognized concurrently and returned in the
+    given order, each with its page number in the metadata. Pages that cannot be
+    downloaded are skipped; the others keep their page numbers.
+
+    Args:
+        sources: Image URLs or blob names, in page order
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name for bare blob names (if applicable)
+        bundle_source: Source recorded on the documents (defaults to the first page's source)
+
+    Returns:
+        List[Document]: One Document per page with text, or None if processing fails
+    """
+    try:
+        if not sources:
+            return None
+        if len(sources) > HANDWRITTEN_BUNDLE_MAX_PAGES:
+            logger.error(f"Bundle has {len(sources)} images, the limit is {HANDWRITTEN_BUNDLE_MAX_PAGES}")
+            return None
+
+        def download(source: str) -> Tuple[str, Optional[bytes]]:
             try:
-                os.unlink(temp_path)
-            except:
-                pass
-        return None
\ No newline at end of file
+                data, resolved_source = _download_image_bytes(source, connection_string, container_name)
+                return resolved_source, data
+            except Exception as e:
+                logger.error(f"Failed to download bundle page {source}: {str(e)}")
+                return source, None
+
+        downloads = list(_get_bundle_executor().map(download, sources))
+        page_numbers = [index + 1 for index, (_, data) in enumerate(downloads) if data is not None]
+        if not page_numbers:
+            return None
+        if len(page_numbers) < len(sources):
+            logger.warning(f"Only {len(page_numbers)} of {len(sources)} bundle pages could be downloaded")
+
+        pages = [downloads[number - 1] for number in page_numbers]
+        return _build_page_documents(
+            pages,
+            bundle_source or downloads[0][0],
+            page_numbers=page_numbers,
+            page_count=len(sources)
+        )
+
+    except Exception as e:
+        logger.error(f"Error processing handwritten notes bundle: {str(e)}")
+        return None
+
+
+def load_handwritten_zip(
+        zip_url: str,
+        connection_string: str = None,
+        container_name: str = None
+) -> Optional[List[Document]]:
+    """
+    Processes a ZIP archive of handwritten note images as one document set, with pages
+    in natural file name order
+
+    Args:
+        zip_url: URL or blob name of the ZIP archive
+        connection_string: Azure Storage connection string (if applicable)
+        container_name: Azure Blob container name for bare blob names (if applicable)
+
+    Returns:
+        List[Document]: One Document per page with text, or None if processing fails
+    """
+    try:
+        data, source = _download_image_bytes(zip_url, connection_string, container_name)
+        pages = _read_zip_images(data)
+        if not pages:
+            logger.error(f"No images found in bundle {zip_url}")
+            return None
+
+        logger.info(f"Processing {len(pages)} images from bundle {zip_url}")
+        return _build_page_documents(pages, source)
+
+    except Exception as e:
+        logger.error(f"Error processing handwritten notes bundle {zip_url}: {str(e)}")
+        return None
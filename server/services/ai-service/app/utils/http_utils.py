@@ -0,0 +1,367 @@
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+from dotenv import load_dotenv
+from app.utils.async_utils import get_background_loop
+from app.utils.content_cache import evict_lru_files
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# HTTP client settings (can be set via env variables)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "64"))  # Open connections across all hosts
+HTTP_POOL_SIZE_PER_HOST = int(os.getenv("HTTP_POOL_SIZE_PER_HOST", "8"))
+HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", "60"))
+
+# Conditional-GET response cache settings
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_DIR = os.getenv(
+    "HTTP_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "ai-service-http-cache")
+)
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "512"))
+
+HTTP_CACHE_FILE_SUFFIX = ".http"
+
+# Headers that describe the wire encoding rather than the (already decoded) cached body
+_UNCACHED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+_session = None
+
+
+class HttpResponseCache:
+    """
+    On-disk cache of HTTP response bodies for conditional revalidation.
+
+    Only responses carrying an ETag or Last-Modified validator are stored. Each entry is
+    a single file holding a JSON header line (URL, status, headers) followed by the raw
+    body. Like the document cache, file modification time is the recency marker used
+    for LRU eviction.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}{HTTP_CACHE_FILE_SUFFIX}")
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """
+        Looks up the cached response for a URL
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            Tuple[Dict, bytes]: Cached response headers and body, or None on a miss
+        """
+        path = self._entry_path(url)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline().decode("utf-8"))
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable HTTP cache entry for {url}: {str(e)}")
+            self._remove(path)
+            return None
+
+        if meta.get("url") != url:
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return meta.get("headers") or {}, body
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Stores a response for a URL and evicts old entries if needed
+
+        Args:
+            url: Requested URL
+            headers: Response headers to keep (including the validators)
+            body: Decoded response body
+        """
+        path = self._entry_path(url)
+        meta = json.dumps({"url": url, "headers": headers}).encode("utf-8")
+
+        try:
+            # Write to a temporary file first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(meta + b"\n")
+                f.write(body)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write HTTP cache entry for {url}: {str(e)}")
+            if 'temp_path' in locals():
+                self._remove(temp_path)
+            return
+
+        with self._lock:
+            evict_lru_files(self.cache_dir, self.max_bytes, HTTP_CACHE_FILE_SUFFIX)
+
+    def touch(self, url: str) -> None:
+        """Marks a revalidated entry as recently used"""
+        try:
+            os.utime(self._entry_path(url), None)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpResponseCache]:
+    """
+    Returns the process-wide HTTP response cache, or None if caching is disabled
+
+    Returns:
+        HttpResponseCache: Shared cache instance
+    """
+    global _http_cache
+
+    if not HTTP_CACHE_ENABLED:
+        return None
+
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                try:
+                    _http_cache = HttpResponseCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_MB * 1024 * 1024)
+                except Exception as e:
+                    logger.error(f"Could not initialize HTTP cache at {HTTP_CACHE_DIR}: {str(e)}")
+                    return None
+    return _http_cache
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """
+    Returns the shared client session; must be called on the background loop.
+    Sync loaders (running on worker threads) and async callers all submit their
+    requests to that loop, so every download goes through one connection pool.
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, limit_per_host=HTTP_POOL_SIZE_PER_HOST),
+            trust_env=True
+        )
+    return _session
+
+
+def _is_cacheable(status: int, headers: Dict[str, str]) -> bool:
+    """Checks whether a response carries validators and may be stored"""
+    if status != 200:
+        return False
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return False
+    return bool(headers.get("ETag") or headers.get("Last-Modified"))
+
+
+async def _fetch(url: str, headers: Dict[str, str], timeout: float) -> Tuple[int, str, Dict[str, str], bytes]:
+    """
+    Performs a GET on the shared session, revalidating a cached copy if there is one
+
+    Args:
+        url: URL to fetch
+        headers: Request headers
+        timeout: Total timeout in seconds
+
+    Returns:
+        Tuple: Status code, reason, response headers and body
+    """
+    loop = asyncio.get_running_loop()
+    cache = get_http_cache()
+    cached = await loop.run_in_executor(None, cache.get, url) if cache else None
+
+    request_headers = dict(headers or {})
+    if cached:
+        cached_headers = CaseInsensitiveDict(cached[0])
+        if cached_headers.get("ETag"):
+            request_headers["If-None-Match"] = cached_headers["ETag"]
+        if cached_headers.get("Last-Modified"):
+            request_headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+    session = _get_session()
+    async with session.get(url, headers=request_headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+        if response.status == 304 and cached:
+            logger.info(f"HTTP cache revalidated (304 Not Modified): {url}")
+            await loop.run_in_executor(None, cache.touch, url)
+            return 200, "OK", cached[0], cached[1]
+
+        body = await response.read()
+        response_headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _UNCACHED_HEADERS
+        }
+
+        if cache and _is_cacheable(response.status, CaseInsensitiveDict(response_headers)):
+            await loop.run_in_executor(None, cache.put, url, response_headers, body)
+
+        return response.status, response.reason or "", response_headers, body
+
+
+async def _fetch_prefix(url: str, headers: Dict[str, str], length: int, timeout: float) -> Tuple[int, str, Dict[str, str], bytes]:
+    """
+    Fetches only the first bytes of a URL with a ranged GET on the shared session
+
+    Args:
+        url: URL to fetch
+        headers: Request headers
+        length: Number of leading bytes to read
+        timeout: Total timeout in seconds
+
+    Returns:
+        Tuple: Status code, reason, response headers and at most length bytes of body
+    """
+    request_headers = dict(headers or {})
+    request_headers["Range"] = f"bytes=0-{length - 1}"
+
+    session = _get_session()
+    async with session.get(url, headers=request_headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+        # Servers that ignore Range answer 200 with the whole body; stop reading after the prefix
+        body = b""
+        while len(body) < length:
+            chunk = await response.content.read(length - len(body))
+            if not chunk:
+                break
+            body += chunk
+
+        response_headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _UNCACHED_HEADERS
+        }
+        return response.status, response.reason or "", response_headers, body
+
+
+def _build_response(url: str, result: Tuple[int, str, Dict[str, str], bytes]) -> requests.Response:
+    """Wraps a fetch result in a requests.Response so loaders keep their existing handling"""
+    status, reason, headers, body = result
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = body
+    return response
+
+
+def _translate_error(url: str, error: Exception) -> Exception:
+    """Maps aiohttp errors to the requests exceptions loaders already handle"""
+    if isinstance(error, asyncio.TimeoutError):
+        return requests.Timeout(f"Timed out fetching {url}")
+    if isinstance(error, aiohttp.ClientError):
+        return requests.ConnectionError(f"Error fetching {url}: {str(error)}")
+    return error
+
+
+def http_get(url: str, headers: Dict[str, str] = None, timeout: float = HTTP_TIMEOUT) -> requests.Response:
+    """
+    GETs a URL through the shared pooled HTTP client, revalidating cached copies with
+    If-None-Match / If-Modified-Since so unchanged resources are not downloaded again.
+
+    Args:
+        url: URL to fetch
+        headers: Request headers
+        timeout: Total timeout in seconds
+
+    Returns:
+        requests.Response: Response with the full body loaded
+
+    Raises:
+        requests.RequestException: On connection errors and timeouts
+    """
+    future = asyncio.run_coroutine_threadsafe(_fetch(url, headers, timeout), get_background_loop())
+    try:
+        return _build_response(url, future.result())
+    except Exception as e:
+        raise _translate_error(url, e) from e
+
+
+def http_get_prefix(url: str, length: int, headers: Dict[str, str] = None, timeout: float = HTTP_TIMEOUT) -> requests.Response:
+    """
+    GETs only the first bytes of a URL (Range: bytes=0-length), e.g. to sniff its
+    format before choosing a loader. Prefix responses bypass the response cache.
+
+    Args:
+        url: URL to fetch
+        length: Number of leading bytes to read
+        headers: Request headers
+        timeout: Total timeout in seconds
+
+    Returns:
+        requests.Response: Response whose body holds at most length bytes
+
+    Raises:
+        requests.RequestException: On connection errors and timeouts
+    """
+    future = asyncio.run_coroutine_threadsafe(_fetch_prefix(url, headers, length, timeout), get_background_loop())
+    try:
+        return _build_response(url, future.result())
+    except Exception as e:
+        raise _translate_error(url, e) from e
+
+
+async def http_get_async(url: str, headers: Dict[str, str] = None, timeout: float = HTTP_TIMEOUT) -> requests.Response:
+    """
+    Async variant of http_get for code running on an event loop
+
+    Args:
+        url: URL to fetch
+        headers: Request headers
+        timeout: Total timeout in seconds
+
+    Returns:
+        requests.Response: Response with the full body loaded
+
+    Raises:
+        requests.RequestException: On connection errors and timeouts
+    """
+    future = asyncio.run_coroutine_threadsafe(_fetch(url, headers, timeout), get_background_loop())
+    try:
+        return _build_response(url, await asyncio.wrap_future(future))
+    except Exception as e:
+        raise _translate_error(url, e) from e
+
+
+async def close_http_client() -> None:
+    """
+    Closes the shared HTTP client session. Called on application shutdown.
+    """
+    if _session is None:
+        return
+
+    future = asyncio.run_coroutine_threadsafe(_session.close(), get_background_loop())
+    await asyncio.wrap_future(future)
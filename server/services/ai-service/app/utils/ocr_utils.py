@@ -0,0 +1,362 @@
+import os
+import re
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+import pytesseract
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Configure OCR - set Tesseract path if not in PATH
+if os.getenv("TESSERACT_PATH"):
+    pytesseract.pytesseract.tesseract_cmd = os.getenv("TESSERACT_PATH")
+
+# Preprocessing settings (can be set via env variables)
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", "300"))  # Tesseract is tuned for ~300 DPI text
+OCR_PAGE_LONG_SIDE_INCHES = float(os.getenv("OCR_PAGE_LONG_SIDE_INCHES", "11.7"))  # A4; photos carry no real DPI
+OCR_BINARIZE_WINDOW = int(os.getenv("OCR_BINARIZE_WINDOW", "31"))  # Local threshold window in pixels
+OCR_BINARIZE_OFFSET = int(os.getenv("OCR_BINARIZE_OFFSET", "12"))  # Darker than the local mean by this = ink
+OCR_DESKEW_MAX_ANGLE = float(os.getenv("OCR_DESKEW_MAX_ANGLE", "5"))
+OCR_DESKEW_STEP = float(os.getenv("OCR_DESKEW_STEP", "0.5"))
+
+# Tiled recognition settings: tall pages are cut between text lines and the bands run in parallel
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(max(1, os.cpu_count() or 1))))
+OCR_BAND_HEIGHT = int(os.getenv("OCR_BAND_HEIGHT", "600"))  # Target band height in pixels
+OCR_TESSERACT_LANG = os.getenv("OCR_TESSERACT_LANG", "eng")
+OCR_TESSERACT_CONFIG = os.getenv("OCR_TESSERACT_CONFIG", "--psm 6 --oem 3")  # Page segmentation & engine mode
+
+OCR_ENGINE_POOL_ENABLED = os.getenv("OCR_ENGINE_POOL_ENABLED", "true").lower() == "true"  # Warm tesserocr handles
+
+# Deskew angles are scored on a reduced copy of the page
+DESKEW_SAMPLE_SIZE = 800
+
+_ocr_executor = None
+_ocr_executor_lock = threading.Lock()
+
+
+class TesseractEnginePool:
+    """
+    Process-wide pool of initialized in-process Tesseract engines (tesserocr).
+
+    Unlike pytesseract, which starts a tesseract process and loads the traineddata
+    for every call, each engine is created once and reused. At most `size` engines
+    exist; a recognition checks one out of the idle queue and returns it when done.
+    tesserocr releases the GIL while recognizing, so engines on different threads
+    run in parallel.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_engine() -> Any:
+        """Initializes one engine with the configured language and modes"""
+        from tesserocr import PyTessBaseAPI
+
+        options = {"lang": OCR_TESSERACT_LANG}
+        psm = re.search(r"--psm\s+(\d+)", OCR_TESSERACT_CONFIG)
+        oem = re.search(r"--oem\s+(\d+)", OCR_TESSERACT_CONFIG)
+        if psm:
+            options["psm"] = int(psm.group(1))
+        if oem:
+            options["oem"] = int(oem.group(1))
+        if os.getenv("TESSDATA_PREFIX"):
+            options["path"] = os.getenv("TESSDATA_PREFIX")
+        return PyTessBaseAPI(**options)
+
+    def _grow(self) -> bool:
+        """Creates another engine in the idle queue if the pool is not full yet"""
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+
+        try:
+            self._idle.put(self._create_engine())
+            return True
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def engine(self) -> Iterator[Any]:
+        """
+        Checks an engine out of the pool for the duration of the block
+
+        Yields:
+            tesserocr.PyTessBaseAPI: Initialized engine
+        """
+        try:
+            engine = self._idle.get_nowait()
+        except queue.Empty:
+            self._grow()
+            engine = self._idle.get()
+
+        try:
+            yield engine
+        finally:
+            engine.Clear()
+            self._idle.put(engine)
+
+    def recognize(self, image: Image.Image) -> str:
+        """
+        Recognizes the text of one page or band on a warm engine
+
+        Args:
+            image: Page or band to recognize
+
+        Returns:
+            str: Recognized text
+        """
+        with self.engine() as engine:
+            engine.SetImage(image)
+            return engine.GetUTF8Text()
+
+
+_engine_pool = None
+_engine_pool_lock = threading.Lock()
+
+
+def _limit_tesseract_threads() -> None:
+    """
+    Keeps each Tesseract engine to one OpenMP thread when bands run concurrently.
+
+    OMP_THREAD_LIMIT is read by libtesseract when it loads and inherited by the tesseract
+    processes pytesseract starts, so it has to be in this process's environment. It is
+    set with setdefault (an explicit value is kept) and only once OCR is first used,
+    not when the module is imported.
+    """
+    if OCR_WORKERS > 1:
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+def get_tesseract_pool() -> Optional[TesseractEnginePool]:
+    """
+    Returns the process-wide Tesseract engine pool, or None when tesserocr is not
+    installed (or the pool is disabled) and recognition goes through pytesseract
+
+    Returns:
+        TesseractEnginePool: Shared pool
+    """
+    global _engine_pool
+
+    if not OCR_ENGINE_POOL_ENABLED:
+        return None
+
+    if _engine_pool is None:
+        with _engine_pool_lock:
+            if _engine_pool is None:
+                _limit_tesseract_threads()
+                try:
+                    pool = TesseractEnginePool(OCR_WORKERS)
+                    # Create the first engine now so a broken setup is detected once
+                    pool._grow()
+                    _engine_pool = pool
+                except ImportError:
+                    logger.info("tesserocr not installed, running OCR through pytesseract")
+                    _engine_pool = False
+                except Exception as e:
+                    logger.error(f"Could not initialize Tesseract engine, running OCR through pytesseract: {str(e)}")
+                    _engine_pool = False
+    return _engine_pool or None
+
+
+def _downscale(image: Image.Image) -> Image.Image:
+    """Shrinks the image to the OCR target resolution; smaller images are left alone"""
+    max_long_side = int(OCR_TARGET_DPI * OCR_PAGE_LONG_SIDE_INCHES)
+    long_side = max(image.size)
+    if long_side <= max_long_side:
+        return image
+
+    scale = max_long_side / long_side
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.LANCZOS)
+
+
+def _binarize(gray: Image.Image) -> np.ndarray:
+    """
+    Adaptive threshold against the local mean brightness, which copes with the
+    uneven lighting and shadows of phone photos better than one global threshold
+
+    Args:
+        gray: Grayscale page
+
+    Returns:
+        np.ndarray: Boolean ink mask (True = ink)
+    """
+    local_mean = gray.filter(ImageFilter.BoxBlur(OCR_BINARIZE_WINDOW // 2))
+    pixels = np.asarray(gray, dtype=np.int16)
+    background = np.asarray(local_mean, dtype=np.int16)
+    return pixels < background - OCR_BINARIZE_OFFSET
+
+
+def _estimate_skew(ink: np.ndarray) -> float:
+    """
+    Finds the rotation that makes text lines horizontal: the angle whose row ink
+    profile has the sharpest peaks (lines) and valleys (gaps between lines)
+
+    Args:
+        ink: Boolean ink mask of the page
+
+    Returns:
+        float: Rotation in degrees to apply with Image.rotate
+    """
+    sample = Image.fromarray(ink.astype(np.uint8) * 255)
+    sample.thumbnail((DESKEW_SAMPLE_SIZE, DESKEW_SAMPLE_SIZE))
+
+    def score(angle: float) -> float:
+        rotated = np.asarray(sample.rotate(angle, resample=Image.NEAREST, fillcolor=0), dtype=np.float32)
+        return float(np.square(np.diff(rotated.sum(axis=1))).sum())
+
+    # Stay upright unless some angle is strictly better (e.g. on blank pages)
+    best_angle, best_score = 0.0, score(0.0)
+    for angle in np.arange(-OCR_DESKEW_MAX_ANGLE, OCR_DESKEW_MAX_ANGLE + OCR_DESKEW_STEP / 2, OCR_DESKEW_STEP):
+        angle_score = score(float(angle))
+        if angle_score > best_score:
+            best_angle, best_score = float(angle), angle_score
+    return best_angle
+
+
+def preprocess_image(image: Image.Image) -> Image.Image:
+    """
+    Prepares a photo or scan for Tesseract: applies the EXIF orientation, downscales
+    to the OCR target resolution, converts to grayscale, binarizes and deskews
+
+    Args:
+        image: Image as opened by PIL
+
+    Returns:
+        Image.Image: Black-on-white 8-bit page
+    """
+    image = ImageOps.exif_transpose(image)
+    image = _downscale(image)
+    gray = ImageOps.grayscale(image)
+
+    ink = _binarize(gray)
+    angle = _estimate_skew(ink)
+
+    page = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8))
+    if angle:
+        page = page.rotate(angle, resample=Image.NEAREST, expand=True, fillcolor=255)
+    return page
+
+
+def split_into_bands(page: Image.Image, band_height: int = OCR_BAND_HEIGHT) -> List[Tuple[int, int]]:
+    """
+    Cuts a binarized page into horizontal bands of roughly band_height pixels,
+    placing each cut on the emptiest row near the target so no text line is split
+
+    Args:
+        page: Black-on-white page from preprocess_image
+        band_height: Target band height in pixels
+
+    Returns:
+        List[Tuple[int, int]]: (top, bottom) pixel rows of each band
+    """
+    height = page.height
+    if height <= band_height * 3 // 2:
+        return [(0, height)]
+
+    ink_per_row = (np.asarray(page) < 128).sum(axis=1)
+    search = band_height // 4
+
+    bands = []
+    top = 0
+    while height - top > band_height * 3 // 2:
+        target = top + band_height
+        window = ink_per_row[target - search:target + search]
+        cut = target - search + int(np.argmin(window))
+        bands.append((top, cut))
+        top = cut
+    bands.append((top, height))
+    return bands
+
+
+def _get_ocr_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared pool recognizing bands. Warm tesserocr engines and pytesseract's
+    tesseract processes both run outside the GIL, so threads spread bands across cores.
+
+    Returns:
+        ThreadPoolExecutor: Process-wide OCR pool
+    """
+    global _ocr_executor
+
+    if _ocr_executor is None:
+        with _ocr_executor_lock:
+            if _ocr_executor is None:
+                _limit_tesseract_threads()
+                _ocr_executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr")
+    return _ocr_executor
+
+
+def _recognize(image: Image.Image) -> str:
+    """Runs Tesseract over one page or band, on a warm engine when available"""
+    pool = get_tesseract_pool()
+    if pool is not None:
+        return pool.recognize(image)
+    return pytesseract.image_to_string(image, lang=OCR_TESSERACT_LANG, config=OCR_TESSERACT_CONFIG)
+
+
+def ocr_images(images: List[Image.Image]) -> List[str]:
+    """
+    Preprocesses a batch of images and recognizes their text. Every page is split into
+    line bands and the bands of all pages are recognized in parallel, so a multi-image
+    upload keeps all engines busy.
+
+    Args:
+        images: Images as opened by PIL
+
+    Returns:
+        List[str]: Recognized text of each image, in input order
+    """
+    if not images:
+        return []
+
+    if OCR_WORKERS <= 1:
+        return [_recognize(preprocess_image(image)).strip() for image in images]
+
+    executor = _get_ocr_executor()
+    pages = list(executor.map(preprocess_image, images))
+
+    crops = []
+    page_of_crop = []
+    for page_index, page in enumerate(pages):
+        for top, bottom in split_into_bands(page):
+            crops.append(page.crop((0, top, page.width, bottom)))
+            page_of_crop.append(page_index)
+
+    logger.info(f"Recognizing {len(pages)} page(s) as {len(crops)} bands")
+    texts = [[] for _ in pages]
+    for page_index, text in zip(page_of_crop, executor.map(_recognize, crops)):
+        if text.strip():
+            texts[page_index].append(text.strip())
+    return ["\n".join(page_texts) for page_texts in texts]
+
+
+def ocr_image(image: Image.Image) -> str:
+    """
+    Preprocesses an image and recognizes its text. Tall pages are split into line
+    bands that are recognized in parallel and joined in reading order.
+
+    Args:
+        image: Image as opened by PIL
+
+    Returns:
+        str: Recognized text
+    """
+    return ocr_images([image])[0]
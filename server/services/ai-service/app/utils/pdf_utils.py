@@ -1,14 +1,27 @@
 import os
+import io
 import tempfile
+import threading
+import multiprocessing
 import requests
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
 from langchain_community.document_loaders import PyPDFLoader
+from pypdf import PdfReader
 from langchain.schema import Document
 import logging
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
 from azure.core.exceptions import ResourceNotFoundError, ServiceRequestError
 from dotenv import load_dotenv
-from urllib.parse import urlparse
+from app.utils.content_cache import load_with_cache, iter_with_cache, get_blob_content_hash
+from app.utils.http_utils import http_get
+from app.utils.blob_utils import (
+    resolve_blob_client,
+    get_blob_service_client,
+    download_blob_bytes,
+    is_blob_storage_url,
+    parse_blob_url
+)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,6 +29,240 @@ load_dotenv()
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Page-sharded extraction settings (can be set via env variables)
+PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "200"))  # Smaller PDFs stay in-process
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+PDF_MIN_PAGES_PER_SHARD = int(os.getenv("PDF_MIN_PAGES_PER_SHARD", "25"))
+
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+
+def _parse_pdf_bytes(data: bytes) -> Optional[List[Document]]:
+    """
+    Parses raw PDF bytes straight from memory into one Document per page.
+    Produces the same page text and page metadata as PyPDFLoader without
+    staging the bytes in a temporary file, except for "source", which the
+    callers set to the URL or blob the bytes came from.
+
+    Args:
+        data: Raw bytes of the PDF file
+
+    Returns:
+        List[Document]: List of Document objects, one per page
+    """
+    return list(iter_pdf_pages(data))
+
+
+def iter_pdf_pages(data: bytes) -> Iterator[Document]:
+    """
+    Parses raw PDF bytes from memory and yields one Document per page as soon as it is extracted.
+    Large PDFs are split into page ranges that are extracted in parallel across a
+    process pool; their pages are yielded shard by shard in page order.
+
+    Args:
+        data: Raw bytes of the PDF file
+
+    Yields:
+        Document: One Document per page, in page order
+    """
+    reader = PdfReader(io.BytesIO(data))
+    total_pages = len(reader.pages)
+
+    doc_metadata = _get_pdf_metadata(reader)
+    doc_metadata["total_pages"] = total_pages
+
+    if total_pages >= PDF_PARALLEL_PAGE_THRESHOLD and PDF_EXTRACT_WORKERS > 1:
+        pages = _iter_pages_in_parallel(data, total_pages)
+    else:
+        pages = _iter_pages(reader, 0, total_pages)
+
+    for page_number, (text, label) in enumerate(pages):
+        yield Document(
+            page_content=text,
+            metadata={**doc_metadata, "page": page_number, "page_label": label}
+        )
+
+
+def _get_pdf_metadata(reader: PdfReader) -> dict:
+    """
+    Returns the document information (producer, creator, dates...) the same way PyPDFLoader reports it
+
+    Args:
+        reader: Open PdfReader for the document
+
+    Returns:
+        dict: Document-level metadata with lower-cased keys
+    """
+    metadata = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+    try:
+        for key, value in (reader.metadata or {}).items():
+            metadata[key.lstrip("/").lower()] = str(value)
+    except Exception as e:
+        logger.debug(f"Could not read PDF document information: {str(e)}")
+    return metadata
+
+
+def _iter_pages(reader: PdfReader, start: int, end: int) -> Iterator[Tuple[str, str]]:
+    """
+    Extracts the text and printed page label for a range of pages, one page at a time
+
+    Args:
+        reader: Open PdfReader for the document
+        start: First page index (inclusive)
+        end: Last page index (exclusive)
+
+    Yields:
+        Tuple[str, str]: (text, page label) for each page in order
+    """
+    try:
+        labels = reader.page_labels
+    except Exception:
+        labels = []
+
+    for page_number in range(start, end):
+        label = labels[page_number] if page_number < len(labels) else str(page_number + 1)
+        yield reader.pages[page_number].extract_text().strip(), label
+
+
+def _extract_page_range(path: str, start: int, end: int) -> List[Tuple[str, str]]:
+    """
+    Process pool entry point: opens the PDF in the worker and extracts one page range.
+    Workers get the path of the spilled PDF rather than its bytes, so a large file is
+    not pickled to every shard.
+
+    Args:
+        path: Path of the PDF file
+        start: First page index (inclusive)
+        end: Last page index (exclusive)
+
+    Returns:
+        List[Tuple[str, str]]: (text, page label) for each page in order
+    """
+    return list(_iter_pages(PdfReader(path), start, end))
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool used for page-sharded PDF extraction
+
+    Returns:
+        ProcessPoolExecutor: Process-wide extraction pool
+    """
+    global _pdf_executor
+
+    if _pdf_executor is None:
+        with _pdf_executor_lock:
+            if _pdf_executor is None:
+                # Spawn rather than fork, forking a threaded server process is unsafe
+                _pdf_executor = ProcessPoolExecutor(
+                    max_workers=PDF_EXTRACT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pdf_executor
+
+
+def _iter_pages_in_parallel(data: bytes, total_pages: int) -> Iterator[Tuple[str, str]]:
+    """
+    Splits the page range into one shard per worker, extracts the shards in parallel
+    and yields their pages in page order. The PDF is written to a temporary file once
+    and every shard opens it from there. A shard that fails in the pool is extracted
+    in-process instead.
+
+    Args:
+        data: Raw bytes of the PDF file
+        total_pages: Number of pages in the PDF
+
+    Yields:
+        Tuple[str, str]: (text, page label) for every page in order
+    """
+    global _pdf_executor
+
+    shard_count = min(PDF_EXTRACT_WORKERS, max(1, total_pages // PDF_MIN_PAGES_PER_SHARD))
+    shard_size = -(-total_pages // shard_count)  # Ceiling division
+    ranges = [(start, min(start + shard_size, total_pages)) for start in range(0, total_pages, shard_size)]
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spill_file:
+        spill_file.write(data)
+        path = spill_file.name
+
+    futures = [None] * len(ranges)
+    try:
+        try:
+            executor = _get_pdf_executor()
+            futures = [executor.submit(_extract_page_range, path, start, end) for start, end in ranges]
+        except Exception as e:
+            logger.error(f"Could not start parallel PDF extraction, extracting in-process: {str(e)}")
+
+        # Reassemble the shards in page order
+        for (start, end), future in zip(ranges, futures):
+            pages = None
+            if future is not None:
+                try:
+                    pages = future.result()
+                except BrokenProcessPool as e:
+                    logger.error(f"PDF extraction pool broke, extracting pages {start}-{end} in-process: {str(e)}")
+                    with _pdf_executor_lock:
+                        _pdf_executor = None
+                except Exception as e:
+                    logger.error(f"Parallel extraction of pages {start}-{end} failed, extracting in-process: {str(e)}")
+
+            if pages is None:
+                pages = _extract_page_range(path, start, end)
+
+            yield from pages
+
+        logger.info(f"Extracted {total_pages} PDF pages in {len(ranges)} parallel shards")
+    finally:
+        # Stop shards nobody will read before their file goes away
+        for future in futures:
+            if future is not None:
+                future.cancel()
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove temporary PDF {path}: {str(e)}")
+
+
+def iter_pdf_from_private_url(
+        private_url: str,
+        connection_string: str = None,
+        container_name: str = None
+) -> Iterator[Document]:
+    """
+    Streaming variant of load_pdf_from_private_url: downloads the PDF and yields its
+    pages while the rest of the document is still being extracted.
+
+    Args:
+        private_url: Azure Storage URL, blob name, or plain HTTP(S) URL of the PDF
+        connection_string: Azure Storage connection string
+        container_name: Name of the Azure Blob container
+
+    Yields:
+        Document: One Document per page, in page order
+
+    Raises:
+        Exception: If the PDF cannot be downloaded or parsed
+    """
+    if private_url.startswith(('http://', 'https://')) and not is_blob_storage_url(private_url):
+        response = http_get(private_url)
+        response.raise_for_status()
+        fetch = lambda: response.content
+        content_hash = None
+        source = private_url
+    else:
+        blob_client, source = resolve_blob_client(private_url, connection_string, container_name)
+        fetch = lambda: download_blob_bytes(blob_client)
+        content_hash = get_blob_content_hash(blob_client)
+
+    page_count = 0
+    for doc in iter_with_cache(fetch=fetch, parse=iter_pdf_pages, content_hash=content_hash):
+        doc.metadata["source"] = source
+        page_count += 1
+        yield doc
+
+    logger.info(f"Successfully streamed PDF from {source}: {page_count} pages")
+
 
 def load_pdf_from_storage_url(
         storage_url: str,
@@ -39,32 +286,22 @@ def load_pdf_from_storage_url(
                 logger.error("Azure connection string not provided and not found in environment variables")
                 return None
 
-        # Parse the storage URL
-        parsed_url = urlparse(storage_url)
-
-        # Check if it's a valid Azure blob storage URL
-        if not parsed_url.netloc.endswith('.blob.core.windows.net'):
+        # Check if it's a valid Azure blob storage URL (or a local emulator URL)
+        if not is_blob_storage_url(storage_url):
             logger.error(f"URL does not appear to be an Azure Blob Storage URL: {storage_url}")
             return None
 
-        # Extract path components - remove leading slash
-        path = parsed_url.path
-        if path.startswith('/'):
-            path = path[1:]
-
         # Split into container and blob name
-        parts = path.split('/', 1)
-        if len(parts) != 2:
-            logger.error(f"URL does not contain both container and blob name: {storage_url}")
+        try:
+            container_name, blob_name = parse_blob_url(storage_url)
+        except ValueError as e:
+            logger.error(str(e))
             return None
 
-        container_name = parts[0]
-        blob_name = parts[1]
-
         logger.info(f"Parsed URL - Container: {container_name}, Blob: {blob_name}")
 
-        # Create a BlobServiceClient using the connection string
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Get the shared BlobServiceClient for this connection string
+        blob_service_client = get_blob_service_client(connection_string)
 
         # Get the container client
         container_client = blob_service_client.get_container_client(container_name)
@@ -72,22 +309,15 @@ def load_pdf_from_storage_url(
         # Get the blob client
         blob_client = container_client.get_blob_client(blob_name)
 
-        # Create a temporary file to store the downloaded PDF
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_path = temp_file.name
-
-            # Download the blob content
-            blob_data = blob_client.download_blob()
-
-            # Write the PDF content to the temporary file
-            temp_file.write(blob_data.readall())
-
-        # Load the PDF using PyPDFLoader
-        loader = PyPDFLoader(temp_path)
-        documents = loader.load()
-
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Download and parse the PDF, reusing the parsed pages if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: download_blob_bytes(blob_client),
+            parse=_parse_pdf_bytes,
+            content_hash=get_blob_content_hash(blob_client)
+        )
+        if not documents:
+            logger.error(f"No pages could be extracted from PDF: {blob_name}")
+            return None
 
         # Add metadata to documents
         for doc in documents:
@@ -106,12 +336,6 @@ def load_pdf_from_storage_url(
         return None
     except Exception as e:
         logger.error(f"Error loading PDF from storage URL {storage_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -121,7 +345,7 @@ def load_pdf_from_azure_blob(
         blob_name: str = None
 ) -> Optional[List[Document]]:
     """
-    Downloads a PDF from Azure Blob Storage and loads it using LangChain's PyPDFLoader.
+    Downloads a PDF from Azure Blob Storage and parses it in memory.
 
     Args:
         connection_string: Azure Storage connection string
@@ -151,8 +375,8 @@ def load_pdf_from_azure_blob(
 
         logger.info(f"Loading PDF from Azure Blob - Container: {container_name}, Blob: {blob_name}")
 
-        # Create a BlobServiceClient using the connection string
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Get the shared BlobServiceClient for this connection string
+        blob_service_client = get_blob_service_client(connection_string)
 
         # Get the container client
         container_client = blob_service_client.get_container_client(container_name)
@@ -160,22 +384,15 @@ def load_pdf_from_azure_blob(
         # Get the blob client
         blob_client = container_client.get_blob_client(blob_name)
 
-        # Create a temporary file to store the downloaded PDF
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_path = temp_file.name
-
-            # Download the blob content
-            blob_data = blob_client.download_blob()
-
-            # Write the PDF content to the temporary file
-            temp_file.write(blob_data.readall())
-
-        # Load the PDF using PyPDFLoader
-        loader = PyPDFLoader(temp_path)
-        documents = loader.load()
-
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Download and parse the PDF, reusing the parsed pages if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: download_blob_bytes(blob_client),
+            parse=_parse_pdf_bytes,
+            content_hash=get_blob_content_hash(blob_client)
+        )
+        if not documents:
+            logger.error(f"No pages could be extracted from PDF: {blob_name}")
+            return None
 
         # Add metadata to documents
         for doc in documents:
@@ -194,12 +411,6 @@ def load_pdf_from_azure_blob(
         return None
     except Exception as e:
         logger.error(f"Error loading PDF from Azure Blob {container_name}/{blob_name}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -221,12 +432,16 @@ def load_pdf_from_private_url(
     """
     try:
         # For full storage URLs, use the direct storage URL loader
-        if private_url.startswith('https://') and '.blob.core.windows.net' in private_url:
+        if is_blob_storage_url(private_url):
             return load_pdf_from_storage_url(
                 storage_url=private_url,
                 connection_string=connection_string
             )
 
+        # If it's a regular HTTP URL, use the standard URL loader
+        if private_url.startswith('http://') or private_url.startswith('https://'):
+            return load_pdf_from_url(private_url)
+
         # Use environment variables if not provided
         if connection_string is None:
             connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
@@ -280,7 +495,7 @@ def load_pdf_from_private_url(
 # Keep the original functions for backward compatibility
 def load_pdf_from_url(pdf_url: str) -> Optional[List[Document]]:
     """
-    Downloads a PDF from a URL and loads it using LangChain's PyPDFLoader.
+    Downloads a PDF from a URL and parses it in memory.
 
     Args:
         pdf_url: URL of the PDF to download and process
@@ -306,21 +521,17 @@ def load_pdf_from_url(pdf_url: str) -> Optional[List[Document]]:
         }
 
         # Download the PDF with headers
-        response = requests.get(pdf_url, stream=True, headers=headers)
+        response = http_get(pdf_url, headers=headers)
         response.raise_for_status()  # Raise exception for HTTP errors
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_path = temp_file.name
-            # Write the PDF content to the temporary file
-            for chunk in response.iter_content(chunk_size=8192):
-                temp_file.write(chunk)
-
-        # Load the PDF using PyPDFLoader
-        loader = PyPDFLoader(temp_path)
-        documents = loader.load()
-
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Parse the PDF, reusing the parsed pages if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: response.content,
+            parse=_parse_pdf_bytes
+        )
+        if not documents:
+            logger.error(f"No pages could be extracted from PDF: {pdf_url}")
+            return None
 
         # Add metadata to documents
         for doc in documents:
@@ -336,12 +547,6 @@ def load_pdf_from_url(pdf_url: str) -> Optional[List[Document]]:
         return None
     except Exception as e:
         logger.error(f"Error loading PDF from {pdf_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -1,16 +1,30 @@
+import io
 import requests
 from langchain.schema import Document
 from dotenv import load_dotenv
 import base64
 import logging
-from typing import Dict, List, Optional, Union, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union, Tuple, Iterator
 from pydantic import BaseModel
-import tempfile
 import os
-from azure.storage.blob import BlobServiceClient
 from urllib.parse import urlparse
 from pptx import Presentation
 import asyncio
+from app.utils.content_cache import load_with_cache, iter_with_cache, get_blob_content_hash, compute_content_hash
+from app.utils.http_utils import http_get, http_get_async
+from app.utils.blob_utils import (
+    resolve_blob_client,
+    get_blob_service_client,
+    get_async_blob_service_client,
+    get_async_blob_client_from_url,
+    download_blob_bytes,
+    download_blob_in_background,
+    ProgressCallback,
+    is_blob_storage_url,
+    parse_blob_url
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -23,6 +37,12 @@ load_dotenv()
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Extracted decks kept in memory by content hash, shared by the summarizer and voice-assistant flows
+PPTX_EXTRACT_CACHE_SIZE = int(os.getenv("PPTX_EXTRACT_CACHE_SIZE", "32"))
+
+_extract_cache: "OrderedDict[str, Tuple[List[Document], PresentationExtract]]" = OrderedDict()
+_extract_cache_lock = threading.Lock()
+
 
 def load_pptx_from_storage_url(
         storage_url: str,
@@ -46,32 +66,22 @@ def load_pptx_from_storage_url(
                 logger.error("Azure connection string not provided and not found in environment variables")
                 return None
 
-        # Parse the storage URL
-        parsed_url = urlparse(storage_url)
-
-        # Check if it's a valid Azure blob storage URL
-        if not parsed_url.netloc.endswith('.blob.core.windows.net'):
+        # Check if it's a valid Azure blob storage URL (or a local emulator URL)
+        if not is_blob_storage_url(storage_url):
             logger.error(f"URL does not appear to be an Azure Blob Storage URL: {storage_url}")
             return None
 
-        # Extract path components - remove leading slash
-        path = parsed_url.path
-        if path.startswith('/'):
-            path = path[1:]
-
         # Split into container and blob name
-        parts = path.split('/', 1)
-        if len(parts) != 2:
-            logger.error(f"URL does not contain both container and blob name: {storage_url}")
+        try:
+            container_name, blob_name = parse_blob_url(storage_url)
+        except ValueError as e:
+            logger.error(str(e))
             return None
 
-        container_name = parts[0]
-        blob_name = parts[1]
-
         logger.info(f"Parsed URL - Container: {container_name}, Blob: {blob_name}")
 
-        # Create a BlobServiceClient using the connection string
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Get the shared BlobServiceClient for this connection string
+        blob_service_client = get_blob_service_client(connection_string)
 
         # Get the container client
         container_client = blob_service_client.get_container_client(container_name)
@@ -79,21 +89,12 @@ def load_pptx_from_storage_url(
         # Get the blob client
         blob_client = container_client.get_blob_client(blob_name)
 
-        # Create a temporary file to store the downloaded PowerPoint
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            temp_path = temp_file.name
-
-            # Download the blob content
-            blob_data = blob_client.download_blob()
-
-            # Write the PowerPoint content to the temporary file
-            temp_file.write(blob_data.readall())
-
-        # Process the PowerPoint file
-        documents = extract_text_from_powerpoint(temp_path)
-
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Download and extract the PowerPoint, reusing the slides if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: download_blob_bytes(blob_client),
+            parse=_extract_text_from_powerpoint_bytes,
+            content_hash=get_blob_content_hash(blob_client)
+        )
 
         # Add source metadata to documents
         if documents:
@@ -107,12 +108,6 @@ def load_pptx_from_storage_url(
 
     except Exception as e:
         logger.error(f"Error loading PowerPoint from storage URL {storage_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -139,20 +134,14 @@ def load_pptx_from_url(pptx_url: str) -> Optional[List[Document]]:
         }
 
         # Download the PowerPoint with headers
-        response = requests.get(pptx_url, stream=True, headers=headers)
+        response = http_get(pptx_url, headers=headers)
         response.raise_for_status()  # Raise exception for HTTP errors
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            temp_path = temp_file.name
-            # Write the PowerPoint content to the temporary file
-            for chunk in response.iter_content(chunk_size=8192):
-                temp_file.write(chunk)
-
-        # Process the PowerPoint file
-        documents = extract_text_from_powerpoint(temp_path)
-
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Extract the PowerPoint, reusing the slides if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: response.content,
+            parse=_extract_text_from_powerpoint_bytes
+        )
 
         # Add source metadata to documents
         if documents:
@@ -169,12 +158,6 @@ def load_pptx_from_url(pptx_url: str) -> Optional[List[Document]]:
         return None
     except Exception as e:
         logger.error(f"Error loading PowerPoint from {pptx_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -196,7 +179,7 @@ def load_pptx_from_private_url(
     """
     try:
         # For full storage URLs, use the direct storage URL loader
-        if private_url.startswith('https://') and '.blob.core.windows.net' in private_url:
+        if is_blob_storage_url(private_url):
             return load_pptx_from_storage_url(
                 storage_url=private_url,
                 connection_string=connection_string
@@ -204,7 +187,7 @@ def load_pptx_from_private_url(
 
         # If it's a regular HTTP URL, use the standard URL loader
         if private_url.startswith('http://') or private_url.startswith('https://'):
-            if '.blob.core.windows.net' not in private_url:
+            if not is_blob_storage_url(private_url):
                 return load_pptx_from_url(private_url)
 
         # Use environment variables if not provided
@@ -243,8 +226,8 @@ def load_pptx_from_private_url(
 
         logger.info(f"Extracted blob name: {blob_name} from URL: {private_url}")
 
-        # Create a BlobServiceClient using the connection string
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Get the shared BlobServiceClient for this connection string
+        blob_service_client = get_blob_service_client(connection_string)
 
         # Get the container client
         container_client = blob_service_client.get_container_client(container_name)
@@ -252,21 +235,12 @@ def load_pptx_from_private_url(
         # Get the blob client
         blob_client = container_client.get_blob_client(blob_name)
 
-        # Create a temporary file to store the downloaded PowerPoint
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            temp_path = temp_file.name
-
-            # Download the blob content
-            blob_data = blob_client.download_blob()
-
-            # Write the PowerPoint content to the temporary file
-            temp_file.write(blob_data.readall())
-
-        # Process the PowerPoint file
-        documents = extract_text_from_powerpoint(temp_path)
-
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Download and extract the PowerPoint, reusing the slides if these bytes were seen before
+        documents = load_with_cache(
+            fetch=lambda: download_blob_bytes(blob_client),
+            parse=_extract_text_from_powerpoint_bytes,
+            content_hash=get_blob_content_hash(blob_client)
+        )
 
         # Add source metadata to documents
         if documents:
@@ -280,12 +254,6 @@ def load_pptx_from_private_url(
 
     except Exception as e:
         logger.error(f"Error loading PowerPoint from private URL {private_url}: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         return None
 
 
@@ -301,41 +269,10 @@ def extract_text_from_powerpoint(file_path: str) -> Optional[List[Document]]:
     """
     try:
         # Load the presentation
-        presentation = Presentation(file_path)
-        documents = []
-
-        # Extract text from each slide
-        for slide_index, slide in enumerate(presentation.slides):
-            slide_text = ""
-            slide_notes = ""
-
-            # Extract text from all shapes in the slide
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text:
-                    slide_text += shape.text + "\n"
-
-            # Extract notes
-            if slide.has_notes_slide:
-                notes_slide = slide.notes_slide
-                for note_shape in notes_slide.shapes:
-                    if hasattr(note_shape, "text") and note_shape.text:
-                        slide_notes += note_shape.text + "\n"
-
-            # Create a Document object for this slide
-            if slide_text.strip() or slide_notes.strip():
-                content = f"Slide {slide_index + 1}:\n{slide_text.strip()}"
-                if slide_notes.strip():
-                    content += f"\n\nSlide Notes:\n{slide_notes.strip()}"
-
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "source": file_path,
-                        "slide_number": slide_index + 1,
-                        "type": "powerpoint_slide"
-                    }
-                )
-                documents.append(doc)
+        with open(file_path, "rb") as f:
+            documents, _ = extract_presentation(f.read())
+        for doc in documents:
+            doc.metadata["source"] = file_path
 
         logger.info(f"Successfully extracted {len(documents)} slides from PowerPoint file: {file_path}")
         return documents
@@ -345,6 +282,79 @@ def extract_text_from_powerpoint(file_path: str) -> Optional[List[Document]]:
         return None
 
 
+def iter_powerpoint_slides(data: bytes) -> Iterator[Document]:
+    """
+    Opens raw PowerPoint bytes in memory and yields one Document per slide as it is extracted
+
+    Args:
+        data: Raw bytes of the PowerPoint file
+
+    Yields:
+        Document: Slide text and notes
+    """
+    content_hash = compute_content_hash(data)
+    cached = _get_cached_extract(content_hash)
+    if cached is not None:
+        yield from _copy_documents(cached[0])
+        return
+
+    yield from _walk_presentation(data, content_hash)
+
+
+def iter_pptx_from_private_url(
+        private_url: str,
+        connection_string: str = None,
+        container_name: str = None
+) -> Iterator[Document]:
+    """
+    Streaming variant of load_pptx_from_private_url: yields slides as they are extracted
+
+    Args:
+        private_url: Azure Storage URL, blob name, or plain HTTP(S) URL of the PowerPoint
+        connection_string: Azure Storage connection string
+        container_name: Name of the Azure Blob container
+
+    Yields:
+        Document: One Document per non-empty slide
+
+    Raises:
+        Exception: If the PowerPoint cannot be downloaded or parsed
+    """
+    if private_url.startswith(('http://', 'https://')) and not is_blob_storage_url(private_url):
+        response = http_get(private_url)
+        response.raise_for_status()
+        fetch = lambda: response.content
+        content_hash = None
+        source = private_url
+    else:
+        blob_client, source = resolve_blob_client(private_url, connection_string, container_name)
+        fetch = lambda: download_blob_bytes(blob_client)
+        content_hash = get_blob_content_hash(blob_client)
+
+    for doc in iter_with_cache(fetch=fetch, parse=iter_powerpoint_slides, content_hash=content_hash):
+        doc.metadata["source"] = source
+        yield doc
+
+
+def _extract_text_from_powerpoint_bytes(data: bytes) -> Optional[List[Document]]:
+    """
+    Extracts slide documents from raw PowerPoint bytes.
+
+    Args:
+        data: Raw bytes of the PowerPoint file
+
+    Returns:
+        List[Document]: List of Document objects or None if extraction fails
+    """
+    try:
+        documents, _ = extract_presentation(data)
+        logger.info(f"Successfully extracted {len(documents)} slides from PowerPoint bytes")
+        return documents
+    except Exception as e:
+        logger.error(f"Error extracting text from PowerPoint bytes: {str(e)}")
+        return None
+
+
 def is_powerpoint_url(url: str) -> bool:
     """
     Determines if a URL is likely pointing to a PowerPoint file
@@ -380,99 +390,197 @@ class PresentationExtract(BaseModel):
     total_slides: int
 
 
-def process_powerpoint_file(file_content: bytes) -> PresentationExtract:
+def _iter_slides(presentation: Presentation) -> Iterator[Tuple[Optional[Document], SlideExtract]]:
     """
-    Process PowerPoint file bytes and extract slide content
+    Walks the slides of an opened deck once, yielding for each slide both the Document
+    used for summaries (None for empty slides) and the SlideExtract used by the voice assistant
 
     Args:
-        file_content: Raw bytes of the PowerPoint file
+        presentation: Deck opened by python-pptx
 
-    Returns:
-        PresentationExtract: Structured content from the presentation
+    Yields:
+        Tuple[Document, SlideExtract]: Slide document and structured slide, in slide order
     """
-    try:
-        # Create a temporary file to store the PowerPoint
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            temp_path = temp_file.name
-            temp_file.write(file_content)
-
-        # Extract content from the PowerPoint file
-        presentation = Presentation(temp_path)
-        slides = []
-        presentation_title = "Untitled Presentation"
-
-        # Try to extract presentation title from properties
-        if hasattr(presentation.core_properties, 'title') and presentation.core_properties.title:
-            presentation_title = presentation.core_properties.title
-
-        # Extract text from each slide
-        for slide_idx, slide in enumerate(presentation.slides):
-            slide_title = ""
-            slide_content = ""
-            slide_notes = ""
-
-            # Extract title from first shape if it appears to be a title
-            if slide.shapes.title:
-                slide_title = slide.shapes.title.text
-
-            # Extract text from all shapes in the slide
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text:
-                    # Skip if this is the title we already extracted
-                    if shape.text == slide_title:
-                        continue
+    for slide_idx, slide in enumerate(presentation.slides):
+        slide_title = ""
+        slide_text = ""
+        slide_content = ""
+        slide_notes = ""
+
+        # Extract title from first shape if it appears to be a title
+        if slide.shapes.title:
+            slide_title = slide.shapes.title.text
+
+        # Extract text from all shapes in the slide
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text:
+                slide_text += shape.text + "\n"
+                # The structured extract keeps the title separately
+                if shape.text != slide_title:
                     slide_content += shape.text + "\n"
 
-            # Extract notes
-            if slide.has_notes_slide:
-                notes_slide = slide.notes_slide
-                for note_shape in notes_slide.shapes:
-                    if hasattr(note_shape, "text") and note_shape.text:
-                        slide_notes += note_shape.text + "\n"
-
-            # Create a SlideExtract object
-            slide_extract = SlideExtract(
-                slide_number=slide_idx + 1,
-                title=slide_title,
-                content=slide_content.strip(),
-                notes=slide_notes.strip() if slide_notes.strip() else None
+        # Extract notes
+        if slide.has_notes_slide:
+            notes_slide = slide.notes_slide
+            for note_shape in notes_slide.shapes:
+                if hasattr(note_shape, "text") and note_shape.text:
+                    slide_notes += note_shape.text + "\n"
+
+        # Create a Document object for this slide
+        document = None
+        if slide_text.strip() or slide_notes.strip():
+            content = f"Slide {slide_idx + 1}:\n{slide_text.strip()}"
+            if slide_notes.strip():
+                content += f"\n\nSlide Notes:\n{slide_notes.strip()}"
+
+            document = Document(
+                page_content=content,
+                metadata={
+                    "source": "memory",
+                    "slide_number": slide_idx + 1,
+                    "type": "powerpoint_slide"
+                }
             )
-            slides.append(slide_extract)
 
-        # Clean up the temporary file
-        os.unlink(temp_path)
+        # Create a SlideExtract object
+        yield document, SlideExtract(
+            slide_number=slide_idx + 1,
+            title=slide_title,
+            content=slide_content.strip(),
+            notes=slide_notes.strip() if slide_notes.strip() else None
+        )
+
+
+def _get_presentation_title(presentation: Presentation) -> str:
+    """Returns the title from the deck properties, or a placeholder"""
+    if hasattr(presentation.core_properties, 'title') and presentation.core_properties.title:
+        return presentation.core_properties.title
+    return "Untitled Presentation"
+
+
+def _copy_documents(documents: List[Document]) -> List[Document]:
+    """Copies cached slide documents so callers can modify them"""
+    return [Document(page_content=doc.page_content, metadata=dict(doc.metadata)) for doc in documents]
+
+
+def _get_cached_extract(content_hash: str) -> Optional[Tuple[List[Document], PresentationExtract]]:
+    """Looks up a recently extracted deck and marks it as recently used"""
+    with _extract_cache_lock:
+        cached = _extract_cache.get(content_hash)
+        if cached is not None:
+            _extract_cache.move_to_end(content_hash)
+    if cached is not None:
+        logger.info(f"Reusing extracted PowerPoint {content_hash}")
+    return cached
+
+
+def _cache_extract(content_hash: str, extract: Tuple[List[Document], PresentationExtract]) -> None:
+    """Stores a fully walked deck, evicting the least recently used ones"""
+    with _extract_cache_lock:
+        _extract_cache[content_hash] = extract
+        while len(_extract_cache) > PPTX_EXTRACT_CACHE_SIZE:
+            _extract_cache.popitem(last=False)
+
+
+def _walk_presentation(data: bytes, content_hash: str) -> Iterator[Document]:
+    """
+    Opens a deck from memory and yields its slide Documents as the slides are walked.
+    Once the walk finishes, the Documents and the PresentationExtract are cached.
+
+    Args:
+        data: Raw bytes of the PowerPoint file
+        content_hash: Hash of data, the cache key
+
+    Yields:
+        Document: One Document per non-empty slide, in slide order
+    """
+    presentation = Presentation(io.BytesIO(data))
+    documents = []
+    slides = []
+
+    for document, slide in _iter_slides(presentation):
+        slides.append(slide)
+        if document is not None:
+            documents.append(document)
+            yield Document(page_content=document.page_content, metadata=dict(document.metadata))
+
+    _cache_extract(content_hash, (documents, PresentationExtract(
+        title=_get_presentation_title(presentation),
+        slides=slides,
+        total_slides=len(slides)
+    )))
 
-        return PresentationExtract(
-            title=presentation_title,
-            slides=slides,
-            total_slides=len(slides)
+
+def extract_presentation(data: bytes) -> Tuple[List[Document], PresentationExtract]:
+    """
+    Extracts a PowerPoint deck, reusing the result when the same bytes were extracted
+    recently (e.g. the voice-assistant /process and /setup flows and the summarizer
+    loading one deck). Callers receive copies they are free to modify.
+
+    Args:
+        data: Raw bytes of the PowerPoint file
+
+    Returns:
+        Tuple[List[Document], PresentationExtract]: One Document per non-empty slide and the structured deck
+    """
+    content_hash = compute_content_hash(data)
+    cached = _get_cached_extract(content_hash)
+
+    if cached is None:
+        presentation = Presentation(io.BytesIO(data))
+        walked = list(_iter_slides(presentation))
+        cached = (
+            [document for document, _ in walked if document is not None],
+            PresentationExtract(
+                title=_get_presentation_title(presentation),
+                slides=[slide for _, slide in walked],
+                total_slides=len(walked)
+            )
         )
+        _cache_extract(content_hash, cached)
+
+    documents, presentation_extract = cached
+    return _copy_documents(documents), presentation_extract.model_copy(deep=True)
+
+
+def process_powerpoint_file(file_content: bytes) -> PresentationExtract:
+    """
+    Process PowerPoint file bytes and extract slide content
+
+    Args:
+        file_content: Raw bytes of the PowerPoint file
+
+    Returns:
+        PresentationExtract: Structured content from the presentation
+    """
+    try:
+        _, presentation_extract = extract_presentation(file_content)
+        return presentation_extract
 
     except Exception as e:
         logger.error(f"Error processing PowerPoint file: {str(e)}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         raise
 
-async def process_powerpoint_from_url(powerpoint_url: str) -> PresentationExtract:
+async def process_powerpoint_from_url(
+        powerpoint_url: str,
+        progress_callback: ProgressCallback = None
+) -> PresentationExtract:
     """
     Process PowerPoint from Azure Blob Storage URL
 
     Args:
         powerpoint_url: Azure Blob Storage URL to the PowerPoint file
+        progress_callback: Optional callable or coroutine function receiving
+                           (bytes downloaded, total bytes) during the blob download
 
     Returns:
         PresentationExtract: Structured content from the presentation
     """
     try:
         # Check if the URL is an Azure Blob Storage URL
-        if 'blob.core.windows.net' in powerpoint_url:
+        if is_blob_storage_url(powerpoint_url):
             # Get the PowerPoint file content from Azure Blob Storage
-            file_content = await download_from_azure_blob(powerpoint_url)
+            file_content = await download_from_azure_blob(powerpoint_url, progress_callback=progress_callback)
         else:
             # If it's a regular HTTP URL, use the standard HTTP download
             file_content = await download_from_http(powerpoint_url)
@@ -487,12 +595,14 @@ async def process_powerpoint_from_url(powerpoint_url: str) -> PresentationExtrac
         raise
 
 
-async def download_from_azure_blob(blob_url: str) -> bytes:
+async def download_from_azure_blob(blob_url: str, progress_callback: ProgressCallback = None) -> bytes:
     """
-    Download file from Azure Blob Storage using the URL
+    Download file from Azure Blob Storage using the URL.
+    Large blobs are fetched as concurrent ranged reads.
 
     Args:
         blob_url: Azure Blob Storage URL
+        progress_callback: Optional callable or coroutine function receiving (bytes downloaded, total bytes)
 
     Returns:
         bytes: File content
@@ -506,12 +616,7 @@ async def download_from_azure_blob(blob_url: str) -> bytes:
         account_name = parsed_url.netloc.split('.')[0]
 
         # Extract container name and blob path from the URL path
-        path_parts = parsed_url.path.strip('/').split('/', 1)
-        if len(path_parts) != 2:
-            raise ValueError(f"Invalid Azure Blob URL format: {blob_url}")
-
-        container_name = path_parts[0]
-        blob_name = path_parts[1]
+        container_name, blob_name = parse_blob_url(blob_url)
 
         logger.info(
             f"Downloading from Azure Blob Storage: Account={account_name}, Container={container_name}, Blob={blob_name}")
@@ -519,27 +624,15 @@ async def download_from_azure_blob(blob_url: str) -> bytes:
         # Get connection string from environment or use SAS token from URL
         connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 
-        if connection_string:
-            # Use connection string if available
-            blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-            container_client = blob_service_client.get_container_client(container_name)
-            blob_client = container_client.get_blob_client(blob_name)
-
-            # Download the blob content
-            download_stream = await asyncio.to_thread(blob_client.download_blob)
-            file_content = await asyncio.to_thread(download_stream.readall)
-        else:
+        def get_blob_client():
+            if connection_string:
+                # Use the shared async client for the connection string
+                return get_async_blob_service_client(connection_string).get_blob_client(container_name, blob_name)
             # If no connection string, assume the URL contains a SAS token
-            # Use anonymous access with the full URL
-            blob_service_client = BlobServiceClient(account_url=f"https://{account_name}.blob.core.windows.net")
-            container_client = blob_service_client.get_container_client(container_name)
-            blob_client = container_client.get_blob_client(blob_name)
-
-            # The URL should contain the SAS token for authentication
-            download_stream = await asyncio.to_thread(
-                lambda: blob_client.download_blob(credential=parsed_url.query)
-            )
-            file_content = await asyncio.to_thread(download_stream.readall)
+            return get_async_blob_client_from_url(blob_url)
+
+        # Download on the shared background loop without blocking the event loop
+        file_content = await download_blob_in_background(get_blob_client, progress_callback=progress_callback)
 
         logger.info(f"Successfully downloaded PowerPoint from Azure Blob Storage, size: {len(file_content)} bytes")
         return file_content
@@ -560,69 +653,9 @@ async def process_powerpoint_content(file_content: bytes) -> PresentationExtract
         PresentationExtract: Structured content from the presentation
     """
     try:
-        # Create a temporary file to store the PowerPoint
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            temp_path = temp_file.name
-            temp_file.write(file_content)
-
-        # Process the PowerPoint file
-        try:
-            # Load the presentation
-            presentation = await asyncio.to_thread(Presentation, temp_path)
-
-            slides = []
-            presentation_title = "Untitled Presentation"
-
-            # Try to extract presentation title from properties
-            if hasattr(presentation.core_properties, 'title') and presentation.core_properties.title:
-                presentation_title = presentation.core_properties.title
-
-            # Extract text from each slide
-            for slide_idx, slide in enumerate(presentation.slides):
-                slide_title = ""
-                slide_content = ""
-                slide_notes = ""
-
-                # Extract title from first shape if it appears to be a title
-                if slide.shapes.title:
-                    slide_title = slide.shapes.title.text
-
-                # Extract text from all shapes in the slide
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text:
-                        # Skip if this is the title we already extracted
-                        if shape.text == slide_title:
-                            continue
-                        slide_content += shape.text + "\n"
-
-                # Extract notes
-                if slide.has_notes_slide:
-                    notes_slide = slide.notes_slide
-                    for note_shape in notes_slide.shapes:
-                        if hasattr(note_shape, "text") and note_shape.text:
-                            slide_notes += note_shape.text + "\n"
-
-                # Create a SlideExtract object
-                slide_extract = SlideExtract(
-                    slide_number=slide_idx + 1,
-                    title=slide_title,
-                    content=slide_content.strip(),
-                    notes=slide_notes.strip() if slide_notes.strip() else None
-                )
-                slides.append(slide_extract)
-
-            # Create the presentation extract
-            presentation_extract = PresentationExtract(
-                title=presentation_title,
-                slides=slides,
-                total_slides=len(slides)
-            )
-
-            return presentation_extract
-
-        finally:
-            # Clean up the temporary file
-            os.unlink(temp_path)
+        # Extract off the event loop; python-pptx parsing is CPU-bound
+        _, presentation_extract = await asyncio.to_thread(extract_presentation, file_content)
+        return presentation_extract
 
     except Exception as e:
         logger.error(f"Error processing PowerPoint content: {str(e)}")
@@ -700,14 +733,11 @@ async def download_from_http(url: str) -> bytes:
         bytes: File content
     """
     try:
-        import aiohttp
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise ValueError(f"Failed to download file, status code: {response.status}")
+        response = await http_get_async(url)
+        if response.status_code != 200:
+            raise ValueError(f"Failed to download file, status code: {response.status_code}")
 
-                file_content = await response.read()
+        file_content = response.content
 
         logger.info(f"Successfully downloaded PowerPoint from HTTP URL, size: {len(file_content)} bytes")
         return file_content
@@ -0,0 +1,598 @@
+import os
+import queue
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Configure whisper model (can be set via env variable)
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")  # Options: tiny, base, small, medium, large
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", "1"))  # Warm model copies, i.e. concurrent transcriptions
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "false").lower() == "true"  # Load the models at startup
+
+# Transcription engine: "whisper" (openai-whisper on PyTorch) or "faster-whisper" (CTranslate2)
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "whisper").lower()
+FASTER_WHISPER_COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")  # int8 quantized weights on CPU
+FASTER_WHISPER_BEAM_SIZE = int(os.getenv("FASTER_WHISPER_BEAM_SIZE", "1"))  # 1 = greedy, like whisper's default
+
+TRANSCRIBE_BACKENDS = ("whisper", "faster-whisper")
+
+# Parallel transcription settings: long audio is split on silence and transcribed across processes.
+# Every worker process loads its own model next to the up to WHISPER_WORKERS models of the in-process
+# pool (short audio and fallbacks), so up to TRANSCRIBE_PROCESSES + WHISPER_WORKERS copies are held.
+# The default uses half the cores, fewer for the larger models (~1, 1, 2, 5, 10 GB per copy).
+TRANSCRIBE_PROCESS_LIMITS = {"tiny": 8, "base": 8, "small": 4, "medium": 2, "large": 1}
+TRANSCRIBE_PROCESSES = max(1, int(os.getenv(
+    "TRANSCRIBE_PROCESSES",
+    str(min((os.cpu_count() or 1) // 2, TRANSCRIBE_PROCESS_LIMITS.get(WHISPER_MODEL_SIZE.split(".")[0].split("-")[0], 1)))
+)))
+TRANSCRIBE_PARALLEL_MIN_SECONDS = int(os.getenv("TRANSCRIBE_PARALLEL_MIN_SECONDS", "600"))  # Shorter audio stays in one call
+TRANSCRIBE_SEGMENT_SECONDS = int(os.getenv("TRANSCRIBE_SEGMENT_SECONDS", "300"))  # Target segment length
+VAD_SEARCH_SECONDS = int(os.getenv("VAD_SEARCH_SECONDS", "30"))  # How far from the target a cut may move
+VAD_AGGRESSIVENESS = int(os.getenv("VAD_AGGRESSIVENESS", "2"))  # webrtcvad mode 0-3, if installed
+
+PIPELINE_MAX_BUFFERED_WINDOWS = int(os.getenv("PIPELINE_MAX_BUFFERED_WINDOWS", "8"))  # Decoded windows held ahead
+
+SAMPLE_RATE = 16000  # Whisper works on 16 kHz mono audio
+VAD_FRAME_MS = 30
+
+_transcribe_executor = None
+_transcribe_executor_lock = threading.Lock()
+
+# Model used by a transcription worker process
+_worker_pool = None
+
+
+class FasterWhisperModel:
+    """
+    Whisper model running on CTranslate2 through faster-whisper. transcribe() returns
+    the same "text" / "segments" / "language" structure as openai-whisper's model,
+    so callers do not depend on the backend.
+    """
+
+    def __init__(self, model_size: str, device: str = "cpu", compute_type: str = FASTER_WHISPER_COMPUTE_TYPE,
+                 cpu_threads: int = 0):
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+    def transcribe(self, audio: Any) -> Dict[str, Any]:
+        """
+        Transcribes audio
+
+        Args:
+            audio: Path to an audio file or 16 kHz mono float32 samples
+
+        Returns:
+            Dict: Transcription with "text", "segments" and "language"
+        """
+        segments, info = self.model.transcribe(audio, beam_size=FASTER_WHISPER_BEAM_SIZE)
+
+        # Segments are decoded lazily while iterating
+        result_segments = [
+            {
+                "id": index,
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": segment.tokens,
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob
+            }
+            for index, segment in enumerate(segments)
+        ]
+
+        return {
+            "text": "".join(segment["text"] for segment in result_segments).strip(),
+            "segments": result_segments,
+            "language": info.language
+        }
+
+
+def load_transcription_model(model_size: str, backend: str = TRANSCRIBE_BACKEND, cpu_threads: int = 0) -> Any:
+    """
+    Loads a speech-to-text model for the configured backend
+
+    Args:
+        model_size: Whisper model size (tiny, base, small, medium, large...)
+        backend: "whisper" or "faster-whisper"
+        cpu_threads: CPU threads for the faster-whisper engine (0 uses its default)
+
+    Returns:
+        Model with a whisper-compatible transcribe(audio) method
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "faster-whisper":
+        logger.info(f"Loading faster-whisper model '{model_size}' on cpu ({FASTER_WHISPER_COMPUTE_TYPE})")
+        return FasterWhisperModel(model_size, device="cpu", cpu_threads=cpu_threads)
+
+    if backend == "whisper":
+        import whisper
+        import torch
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        logger.info(f"Loading Whisper model '{model_size}' on {device}")
+        return whisper.load_model(model_size, device=device)
+
+    raise ValueError(f"Unknown transcription backend '{backend}', expected one of {', '.join(TRANSCRIBE_BACKENDS)}")
+
+
+class WhisperModelPool:
+    """
+    Process-wide pool of loaded Whisper models (of the configured backend).
+
+    At most `size` models are ever loaded; each is loaded once, on first demand (or
+    at startup via preload) and then reused. A transcription checks a model out of the
+    idle queue and returns it when done, so concurrent requests wait for a warm model
+    instead of each loading their own copy.
+    """
+
+    def __init__(self, model_size: str, size: int, backend: str = TRANSCRIBE_BACKEND, cpu_threads: int = 0):
+        self.model_size = model_size
+        self.size = max(1, size)
+        self.backend = backend
+        self._idle = queue.Queue()
+        self._loaded = 0
+        self._lock = threading.Lock()
+
+        # Split the CPU threads between the workers so they don't oversubscribe the cores
+        self.cpu_threads = cpu_threads
+        if self.size > 1 and not self.cpu_threads:
+            self.cpu_threads = max(1, (os.cpu_count() or 1) // self.size)
+        if self.cpu_threads and self.backend == "whisper":
+            try:
+                import torch
+                torch.set_num_threads(self.cpu_threads)
+            except ImportError:
+                pass
+
+    def _load_model(self) -> Any:
+        """Loads one copy of the model onto the best available device"""
+        return load_transcription_model(self.model_size, self.backend, self.cpu_threads)
+
+    def _grow(self) -> bool:
+        """Loads another model into the idle queue if the pool is not full yet"""
+        with self._lock:
+            if self._loaded >= self.size:
+                return False
+            self._loaded += 1
+
+        try:
+            self._idle.put(self._load_model())
+            return True
+        except Exception:
+            with self._lock:
+                self._loaded -= 1
+            raise
+
+    def preload(self) -> None:
+        """Loads every model of the pool up front"""
+        while self._grow():
+            pass
+        logger.info(f"Preloaded {self._loaded} {self.backend} model(s) of size '{self.model_size}'")
+
+    @contextmanager
+    def model(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Checks a warm model out of the pool for the duration of the block
+
+        Args:
+            timeout: Seconds to wait for a free model (None waits indefinitely)
+
+        Yields:
+            Loaded Whisper model
+
+        Raises:
+            queue.Empty: If no model became free within the timeout
+        """
+        try:
+            model = self._idle.get_nowait()
+        except queue.Empty:
+            # Load another copy only while below the pool size; otherwise wait for one
+            if not self._grow():
+                logger.info("All Whisper workers busy, waiting for a free model")
+            model = self._idle.get(timeout=timeout)
+
+        try:
+            yield model
+        finally:
+            self._idle.put(model)
+
+
+_whisper_pool = None
+_whisper_pool_lock = threading.Lock()
+
+
+def get_whisper_pool() -> WhisperModelPool:
+    """
+    Returns the process-wide Whisper model pool
+
+    Returns:
+        WhisperModelPool: Shared pool
+    """
+    global _whisper_pool
+
+    if _whisper_pool is None:
+        with _whisper_pool_lock:
+            if _whisper_pool is None:
+                _whisper_pool = WhisperModelPool(WHISPER_MODEL_SIZE, WHISPER_WORKERS)
+    return _whisper_pool
+
+
+def preload_whisper_models() -> None:
+    """
+    Loads the Whisper models at startup when WHISPER_PRELOAD is enabled
+    """
+    if not WHISPER_PRELOAD:
+        return
+
+    try:
+        get_whisper_pool().preload()
+    except Exception as e:
+        logger.error(f"Failed to preload Whisper models: {str(e)}")
+
+
+def _frame_speech_scores(audio: np.ndarray) -> np.ndarray:
+    """
+    Scores every VAD frame of the audio by how likely it contains speech.
+    Uses webrtcvad when it is installed and frame energy otherwise; the scores are
+    smoothed so single quiet frames inside words do not look like pauses.
+
+    Args:
+        audio: 16 kHz mono float32 samples
+
+    Returns:
+        np.ndarray: One score per frame, lower means quieter
+    """
+    frame_length = SAMPLE_RATE * VAD_FRAME_MS // 1000
+    frame_count = len(audio) // frame_length
+    frames = audio[:frame_count * frame_length].reshape(frame_count, frame_length)
+
+    # Frame RMS without materializing a squared copy of the whole audio
+    energy = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+    scores = energy / (energy.max() or 1.0)
+
+    try:
+        import webrtcvad
+
+        vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+        pcm = (np.clip(frames, -1.0, 1.0) * 32767).astype(np.int16)
+        speech = np.fromiter(
+            (vad.is_speech(frame.tobytes(), SAMPLE_RATE) for frame in pcm),
+            dtype=np.float32,
+            count=frame_count
+        )
+        scores = scores + speech
+    except ImportError:
+        pass
+
+    smoothing = np.ones(10, dtype=np.float32) / 10  # ~300 ms
+    return np.convolve(scores, smoothing, mode="same")
+
+
+def split_on_silence(audio: np.ndarray,
+                     segment_seconds: int = TRANSCRIBE_SEGMENT_SECONDS,
+                     search_seconds: int = VAD_SEARCH_SECONDS) -> List[Tuple[int, int]]:
+    """
+    Splits audio into segments of roughly segment_seconds, cutting each one at the
+    quietest point within search_seconds of the target length so cuts fall in pauses
+
+    Args:
+        audio: 16 kHz mono float32 samples
+        segment_seconds: Target segment length in seconds
+        search_seconds: Maximum distance of a cut from the target, in seconds
+
+    Returns:
+        List[Tuple[int, int]]: (start sample, end sample) of each segment, in order
+    """
+    frame_length = SAMPLE_RATE * VAD_FRAME_MS // 1000
+    scores = _frame_speech_scores(audio)
+    frame_count = len(scores)
+
+    segment_frames = segment_seconds * 1000 // VAD_FRAME_MS
+    search_frames = search_seconds * 1000 // VAD_FRAME_MS
+
+    cuts = [0]
+    while frame_count - cuts[-1] > segment_frames + search_frames:
+        target = cuts[-1] + segment_frames
+        window_start = max(cuts[-1] + 1, target - search_frames)
+        window_end = min(frame_count, target + search_frames)
+        cuts.append(window_start + int(np.argmin(scores[window_start:window_end])))
+
+    boundaries = [cut * frame_length for cut in cuts] + [len(audio)]
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(cuts))]
+
+
+def _shift_transcription(result: Dict[str, Any], offset_seconds: float) -> Dict[str, Any]:
+    """Moves the segment (and word) timestamps of a transcription by an offset"""
+    for segment in result.get("segments", []):
+        segment["start"] += offset_seconds
+        segment["end"] += offset_seconds
+        for word in segment.get("words") or []:
+            word["start"] += offset_seconds
+            word["end"] += offset_seconds
+    return result
+
+
+def merge_transcriptions(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Stitches transcriptions of consecutive segments into one transcription
+
+    Args:
+        results: Transcriptions with absolute timestamps, in audio order
+
+    Returns:
+        Dict: Transcription with "text", "segments" and "language" like Whisper's output
+    """
+    segments = []
+    for result in results:
+        for segment in result.get("segments", []):
+            segment["id"] = len(segments)
+            segments.append(segment)
+
+    return {
+        "text": " ".join(result.get("text", "").strip() for result in results if result.get("text", "").strip()),
+        "segments": segments,
+        "language": next((result.get("language") for result in results if result.get("language")), None)
+    }
+
+
+def _transcribe_segment(audio: np.ndarray, offset_seconds: float) -> Dict[str, Any]:
+    """
+    Transcribes one audio segment in a worker process and shifts its timestamps to the
+    position of the segment in the full audio. Each worker keeps its own warm model.
+
+    Args:
+        audio: 16 kHz mono float32 samples of the segment
+        offset_seconds: Start of the segment in the full audio
+
+    Returns:
+        Dict: Transcription of the segment with absolute timestamps
+    """
+    global _worker_pool
+
+    if _worker_pool is None:
+        _worker_pool = WhisperModelPool(
+            WHISPER_MODEL_SIZE, 1, cpu_threads=max(1, (os.cpu_count() or 1) // max(1, TRANSCRIBE_PROCESSES))
+        )
+
+    with _worker_pool.model() as model:
+        return _shift_transcription(model.transcribe(audio), offset_seconds)
+
+
+def _get_transcribe_executor() -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool used for parallel segment transcription
+
+    Returns:
+        ProcessPoolExecutor: Process-wide transcription pool
+    """
+    global _transcribe_executor
+
+    if _transcribe_executor is None:
+        with _transcribe_executor_lock:
+            if _transcribe_executor is None:
+                # Spawn rather than fork, forking a threaded server process is unsafe
+                _transcribe_executor = ProcessPoolExecutor(
+                    max_workers=TRANSCRIBE_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _transcribe_executor
+
+
+def _transcribe_in_process(audio: np.ndarray, offset_seconds: float = 0.0) -> Dict[str, Any]:
+    """Transcribes audio with a warm model from this process's pool"""
+    with get_whisper_pool().model() as model:
+        return _shift_transcription(model.transcribe(audio), offset_seconds)
+
+
+def transcribe_windows(windows: Iterable[Tuple[np.ndarray, float]]) -> Dict[str, Any]:
+    """
+    Transcribes consecutive audio windows and stitches the results in order.
+
+    Windows are consumed as they arrive, so a producer that is still downloading or
+    decoding keeps running while earlier windows are transcribed: with several
+    processes each window is submitted to the pool immediately, otherwise the windows
+    are read ahead on a helper thread. A window that fails in the pool is transcribed
+    in-process instead.
+
+    Args:
+        windows: (16 kHz mono float32 samples, start offset in seconds) of each window
+
+    Returns:
+        Dict: Stitched transcription with absolute timestamps
+    """
+    global _transcribe_executor
+
+    if TRANSCRIBE_PROCESSES <= 1:
+        return merge_transcriptions([
+            _transcribe_in_process(audio, offset_seconds)
+            for audio, offset_seconds in _read_ahead(windows, PIPELINE_MAX_BUFFERED_WINDOWS)
+        ])
+
+    try:
+        executor = _get_transcribe_executor()
+    except Exception as e:
+        logger.error(f"Could not start parallel transcription, transcribing in-process: {str(e)}")
+        executor = None
+
+    submitted = []
+    for audio, offset_seconds in windows:
+        future = None
+        if executor is not None:
+            try:
+                future = executor.submit(_transcribe_segment, audio, offset_seconds)
+            except Exception as e:
+                logger.error(f"Could not submit window at {offset_seconds:.0f}s, transcribing in-process: {str(e)}")
+        submitted.append((audio, offset_seconds, future))
+
+    results = []
+    for audio, offset_seconds, future in submitted:
+        result = None
+        if future is not None:
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                logger.error(f"Transcription pool broke, transcribing window at {offset_seconds:.0f}s in-process: {str(e)}")
+                with _transcribe_executor_lock:
+                    _transcribe_executor = None
+            except Exception as e:
+                logger.error(f"Parallel transcription of window at {offset_seconds:.0f}s failed, "
+                             f"transcribing in-process: {str(e)}")
+
+        if result is None:
+            result = _transcribe_in_process(audio, offset_seconds)
+        results.append(result)
+
+    return merge_transcriptions(results)
+
+
+def _read_ahead(iterable: Iterable, max_buffered: int) -> Iterator:
+    """
+    Consumes a blocking iterable on a helper thread, up to max_buffered items ahead
+    of the caller, and yields its items in order. Producer exceptions are re-raised.
+
+    Args:
+        iterable: Iterable to consume
+        max_buffered: Maximum number of items produced ahead of the consumer
+
+    Yields:
+        Items of the iterable in order
+    """
+    buffer = queue.Queue(maxsize=max(1, max_buffered))
+    stop = threading.Event()
+    end_of_iteration = object()
+
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        buffer.put((item, None), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            buffer.put((end_of_iteration, None))
+        except BaseException as e:
+            buffer.put((end_of_iteration, e))
+
+    producer = threading.Thread(target=produce, name="transcription-read-ahead", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is end_of_iteration:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_silence_windows(chunks: Iterable[np.ndarray],
+                         segment_seconds: int = TRANSCRIBE_SEGMENT_SECONDS,
+                         search_seconds: int = VAD_SEARCH_SECONDS) -> Iterator[Tuple[np.ndarray, float]]:
+    """
+    Streaming variant of split_on_silence: cuts a stream of PCM chunks into windows of
+    roughly segment_seconds at quiet points, yielding each window as soon as enough
+    audio after it has arrived to choose the cut
+
+    Args:
+        chunks: 16 kHz mono float32 sample chunks in order
+        segment_seconds: Target window length in seconds
+        search_seconds: Maximum distance of a cut from the target, in seconds
+
+    Yields:
+        Tuple[np.ndarray, float]: Window samples and the window's start offset in seconds
+    """
+    frame_length = SAMPLE_RATE * VAD_FRAME_MS // 1000
+    needed = (segment_seconds + search_seconds) * SAMPLE_RATE
+    search_start = max(0, segment_seconds - search_seconds) * SAMPLE_RATE
+
+    pending = []
+    pending_length = 0
+    offset_samples = 0
+
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_length += len(chunk)
+
+        while pending_length >= needed:
+            buffer = np.concatenate(pending)
+
+            # Cut at the quietest frame of the search window around the target length
+            scores = _frame_speech_scores(buffer[search_start:needed])
+            cut = search_start + int(np.argmin(scores)) * frame_length
+            cut = max(cut, frame_length)
+
+            yield buffer[:cut], offset_samples / SAMPLE_RATE
+            offset_samples += cut
+            pending = [buffer[cut:]]
+            pending_length = len(pending[0])
+
+    if pending_length:
+        yield np.concatenate(pending), offset_samples / SAMPLE_RATE
+
+
+def load_audio(audio_path: str) -> np.ndarray:
+    """
+    Decodes an audio file to 16 kHz mono float32 samples with the backend's decoder
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        np.ndarray: Audio samples
+    """
+    if TRANSCRIBE_BACKEND == "faster-whisper":
+        from faster_whisper import decode_audio
+        return decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+
+    import whisper
+    return whisper.load_audio(audio_path)
+
+
+def transcribe_file(audio_path: str) -> Dict[str, Any]:
+    """
+    Transcribes an audio file. Long audio is split on silence boundaries and the
+    segments are transcribed in parallel across processes; the segment timestamps in
+    the result are absolute positions in the file either way.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Dict: Whisper-style transcription with "text", "segments" and "language"
+    """
+    if TRANSCRIBE_PROCESSES <= 1:
+        return _transcribe_in_process(audio_path)
+
+    audio = load_audio(audio_path)
+    duration = len(audio) / SAMPLE_RATE
+    if duration < TRANSCRIBE_PARALLEL_MIN_SECONDS:
+        return _transcribe_in_process(audio)
+
+    ranges = split_on_silence(audio)
+    logger.info(f"Transcribing {duration:.0f}s of audio as {len(ranges)} segments "
+                f"across {TRANSCRIBE_PROCESSES} processes")
+    return transcribe_windows((audio[start:end], start / SAMPLE_RATE) for start, end in ranges)
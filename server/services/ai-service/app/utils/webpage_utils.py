@@ -1,12 +1,13 @@
 import os
 import tempfile
+import importlib.util
 import logging
-import requests
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
 from bs4 import BeautifulSoup
 from langchain.schema import Document
 from urllib.parse import urlparse
 from dotenv import load_dotenv
+from app.utils.http_utils import http_get
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +15,24 @@ load_dotenv()
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Largest HTML document (in characters) that is parsed; longer pages are truncated
+WEBPAGE_MAX_HTML_CHARS = int(os.getenv("WEBPAGE_MAX_HTML_CHARS", str(2 * 1024 * 1024)))
+
+# Elements removed before extraction
+PRUNED_TAGS = ("script", "style", "iframe", "nav", "footer", "aside", "noscript", "template", "svg")
+
+# Elements whose text makes up the page sections
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+CONTENT_TAGS = HEADING_TAGS + ('p', 'ul', 'ol', 'blockquote', 'pre')
+
+# Ids that mark the main content container
+MAIN_CONTENT_IDS = ('content', 'main', 'article', 'post')
+MAIN_CONTENT_XPATH = (
+    '(//*[self::article or self::main or self::div or self::section]['
+    + ' or '.join(f'@id="{content_id}"' for content_id in MAIN_CONTENT_IDS)
+    + '])[1]'
+)
+
 
 def is_webpage_url(url: str) -> bool:
     """
@@ -48,6 +67,33 @@ def is_webpage_url(url: str) -> bool:
     return True
 
 
+def _build_section_document(section: Dict[str, str], section_number: int,
+                            metadata: Dict[str, Any]) -> Optional[Document]:
+    """
+    Builds the Document for one page section
+
+    Args:
+        section: Dictionary with the section "heading" and "content"
+        section_number: 1-based position of the section on the page
+        metadata: Page-level metadata to copy onto the section
+
+    Returns:
+        Document: Section document, or None if the section is too short to be useful
+    """
+    # Skip sections with very little content (likely noise)
+    if len(section["content"]) < 50:
+        return None
+
+    section_metadata = metadata.copy()
+    section_metadata["section"] = section_number
+    section_metadata["section_heading"] = section["heading"]
+
+    return Document(
+        page_content=f"{section['heading']}\n\n{section['content'].strip()}",
+        metadata=section_metadata
+    )
+
+
 def load_webpage_content(page_url: str) -> Optional[List[Document]]:
     """
     Loads content from a webpage, processes it, and returns it as Document objects
@@ -59,129 +105,276 @@ def load_webpage_content(page_url: str) -> Optional[List[Document]]:
         List[Document]: List of Document objects or None if loading fails
     """
     try:
-        # Set up headers to mimic a regular browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'max-age=0',
-        }
-
-        # Make the request
-        response = requests.get(page_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        # Check if the content is HTML
-        content_type = response.headers.get('Content-Type', '').lower()
-        if 'text/html' not in content_type and 'application/xhtml+xml' not in content_type:
-            logger.warning(f"Content-Type is not HTML: {content_type}")
-            # If not HTML but we can still parse it, proceed with caution
-            if not response.text or '<html' not in response.text.lower():
-                logger.error(f"Content does not appear to be HTML: {page_url}")
-                return None
-
-        # Parse the HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extract the page title
-        title = soup.title.text.strip() if soup.title else "Untitled Page"
-
-        # Extract metadata
-        metadata = {
-            "source": page_url,
-            "title": title,
-            "type": "webpage"
-        }
-
-        # Extract meta description if available
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and 'content' in meta_desc.attrs:
-            metadata['description'] = meta_desc['content']
-
-        # Extract meta keywords if available
-        meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
-        if meta_keywords and 'content' in meta_keywords.attrs:
-            metadata['keywords'] = meta_keywords['content']
-
-        # Remove script and style elements
-        for script in soup(["script", "style", "iframe", "nav", "footer", "aside"]):
-            script.extract()
-
-        # Process the main content
-        documents = []
-
-        # Extract article or main content if available
-        main_content = soup.find(['article', 'main', 'div', 'section'],
-                                 id=['content', 'main', 'article', 'post'])
-
-        if not main_content:
-            main_content = soup.find(['article', 'main'])
-
-        if not main_content:
-            # Fallback to body if no specific content element found
-            main_content = soup.body
-
-        if main_content:
-            # Process headings and paragraphs to structure the content
-            content_elements = main_content.find_all(
-                ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'blockquote', 'pre'])
-
-            # Group content into logical sections
-            sections = []
-            current_section = {"heading": title, "content": ""}
-
-            for element in content_elements:
-                if element.name.startswith('h') and len(element.text.strip()) > 0:
-                    # If we have content in the current section, add it to sections
-                    if current_section["content"].strip():
-                        sections.append(current_section)
-
-                    # Start a new section
-                    current_section = {"heading": element.text.strip(), "content": ""}
-                elif element.name in ['p', 'ul', 'ol', 'blockquote', 'pre'] and len(element.text.strip()) > 0:
-                    # Add content to the current section
-                    current_section["content"] += element.text.strip() + "\n\n"
-
-            # Add the last section if it has content
-            if current_section["content"].strip():
-                sections.append(current_section)
-
-            # Create documents from sections
-            for i, section in enumerate(sections):
-                # Skip sections with very little content (likely noise)
-                if len(section["content"]) < 50:
-                    continue
-
-                section_metadata = metadata.copy()
-                section_metadata["section"] = i + 1
-                section_metadata["section_heading"] = section["heading"]
-
-                doc = Document(
-                    page_content=f"{section['heading']}\n\n{section['content'].strip()}",
-                    metadata=section_metadata
-                )
-                documents.append(doc)
-
-        # If no sections were created, create a single document with all text
+        documents = list(iter_webpage_content(page_url))
         if not documents:
-            # Get all text
-            text = soup.get_text(separator='\n\n')
-
-            # Clean up the text (remove excessive whitespace)
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            text = '\n\n'.join(lines)
-
-            doc = Document(
-                page_content=text,
-                metadata=metadata
-            )
-            documents.append(doc)
+            return None
 
         logger.info(f"Successfully processed webpage: {page_url} into {len(documents)} document sections")
         return documents
 
     except Exception as e:
         logger.error(f"Error processing webpage {page_url}: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+def iter_webpage_content(page_url: str) -> Iterator[Document]:
+    """
+    Streaming variant of load_webpage_content: yields each section Document as soon as it is built
+
+    Args:
+        page_url: URL of the webpage to load
+
+    Yields:
+        Document: One Document per content section
+
+    Raises:
+        Exception: If the page cannot be fetched or parsed
+    """
+    # Set up headers to mimic a regular browser
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Cache-Control': 'max-age=0',
+    }
+
+    # Make the request
+    response = http_get(page_url, headers=headers, timeout=10)
+    response.raise_for_status()
+
+    # Check if the content is HTML
+    content_type = response.headers.get('Content-Type', '').lower()
+    if 'text/html' not in content_type and 'application/xhtml+xml' not in content_type:
+        logger.warning(f"Content-Type is not HTML: {content_type}")
+        # If not HTML but we can still parse it, proceed with caution
+        if not response.text or '<html' not in response.text.lower():
+            logger.error(f"Content does not appear to be HTML: {page_url}")
+            return
+
+    yield from iter_html_sections(response.text, page_url)
+
+
+def iter_html_sections(html: str, page_url: str) -> Iterator[Document]:
+    """
+    Extracts the main content of an HTML page as section Documents.
+    Uses the lxml extractor when lxml is installed, otherwise BeautifulSoup's html.parser.
+
+    Args:
+        html: HTML of the page
+        page_url: URL of the page (recorded as the document source)
+
+    Yields:
+        Document: One Document per content section, or one Document with all text
+                  if no sections could be found
+    """
+    # Cap the parsed size so huge generated pages cannot stall a worker
+    if len(html) > WEBPAGE_MAX_HTML_CHARS:
+        logger.warning(f"Truncating HTML of {page_url} from {len(html)} to {WEBPAGE_MAX_HTML_CHARS} characters")
+        html = html[:WEBPAGE_MAX_HTML_CHARS]
+
+    if importlib.util.find_spec("lxml") is None:
+        logger.debug("lxml not installed, using html.parser for webpage extraction")
+        yield from _iter_html_sections_bs4(html, page_url)
+        return
+
+    yield from _iter_html_sections_lxml(html, page_url)
+
+
+def _group_sections(elements: Iterable[Tuple[str, str]], title: str,
+                    metadata: Dict[str, Any]) -> Iterator[Document]:
+    """
+    Groups content elements into sections that start at each heading
+
+    Args:
+        elements: (tag name, stripped text) pairs of the content elements in document order
+        title: Page title, used as the heading of content before the first heading
+        metadata: Page-level metadata to copy onto each section
+
+    Yields:
+        Document: Each section as soon as it is complete
+    """
+    section_number = 0
+    heading = title
+    parts = []
+
+    for tag, text in elements:
+        if not text:
+            continue
+
+        if tag in HEADING_TAGS:
+            # If we have content in the current section, emit it
+            if parts:
+                section_number += 1
+                doc = _build_section_document(
+                    {"heading": heading, "content": "\n\n".join(parts) + "\n\n"}, section_number, metadata
+                )
+                if doc:
+                    yield doc
+
+            # Start a new section
+            heading = text
+            parts = []
+        else:
+            # Add content to the current section
+            parts.append(text)
+
+    # Emit the last section if it has content
+    if parts:
+        section_number += 1
+        doc = _build_section_document(
+            {"heading": heading, "content": "\n\n".join(parts) + "\n\n"}, section_number, metadata
+        )
+        if doc:
+            yield doc
+
+
+def _build_full_text_document(texts: Iterable[str], metadata: Dict[str, Any]) -> Document:
+    """
+    Builds a single Document with all text of the page, used when no sections were found
+
+    Args:
+        texts: Text nodes of the page
+        metadata: Page-level metadata
+
+    Returns:
+        Document: Document with the cleaned page text
+    """
+    text = '\n\n'.join(texts)
+
+    # Clean up the text (remove excessive whitespace)
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+
+    return Document(
+        page_content='\n\n'.join(lines),
+        metadata=metadata
+    )
+
+
+def _iter_html_sections_lxml(html: str, page_url: str) -> Iterator[Document]:
+    """
+    Readability-style extractor built on lxml. Comments are dropped by the parser and
+    boilerplate elements are stripped in a single pass before the content is walked.
+
+    Args:
+        html: HTML of the page
+        page_url: URL of the page
+
+    Yields:
+        Document: Section Documents (see iter_html_sections)
+    """
+    import lxml.html
+    from lxml import etree
+
+    parser = lxml.html.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True)
+    try:
+        root = lxml.html.document_fromstring(html.encode("utf-8", errors="replace"), parser=parser)
+    except (etree.ParserError, ValueError) as e:
+        logger.error(f"Could not parse HTML of {page_url}: {str(e)}")
+        return
+
+    # Extract the page title
+    title = (root.findtext('.//title') or '').strip() or "Untitled Page"
+
+    # Extract metadata
+    metadata = {
+        "source": page_url,
+        "title": title,
+        "type": "webpage"
+    }
+
+    # Extract meta description and keywords if available
+    for name in ('description', 'keywords'):
+        values = root.xpath(f'//meta[@name="{name}"]/@content')
+        if values:
+            metadata[name] = values[0]
+
+    # Prune non-content elements before walking the tree
+    etree.strip_elements(root, *PRUNED_TAGS, with_tail=False)
+
+    # Extract article or main content if available
+    main_content = root.xpath(MAIN_CONTENT_XPATH)
+    if not main_content:
+        main_content = root.xpath('(//article | //main)[1]')
+    if not main_content:
+        # Fallback to body if no specific content element found
+        main_content = root.xpath('//body')
+
+    section_count = 0
+    if main_content:
+        elements = (
+            (element.tag, element.text_content().strip())
+            for element in main_content[0].iterdescendants(*CONTENT_TAGS)
+        )
+        for doc in _group_sections(elements, title, metadata):
+            section_count += 1
+            yield doc
+
+    # If no sections were created, create a single document with all text
+    if not section_count:
+        yield _build_full_text_document(root.itertext(), metadata)
+
+
+def _iter_html_sections_bs4(html: str, page_url: str) -> Iterator[Document]:
+    """
+    BeautifulSoup html.parser extractor, used when lxml is not installed
+
+    Args:
+        html: HTML of the page
+        page_url: URL of the page
+
+    Yields:
+        Document: Section Documents (see iter_html_sections)
+    """
+    # Parse the HTML
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract the page title
+    title = soup.title.text.strip() if soup.title else "Untitled Page"
+
+    # Extract metadata
+    metadata = {
+        "source": page_url,
+        "title": title,
+        "type": "webpage"
+    }
+
+    # Extract meta description if available
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc and 'content' in meta_desc.attrs:
+        metadata['description'] = meta_desc['content']
+
+    # Extract meta keywords if available
+    meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
+    if meta_keywords and 'content' in meta_keywords.attrs:
+        metadata['keywords'] = meta_keywords['content']
+
+    # Remove non-content elements
+    for element in soup(list(PRUNED_TAGS)):
+        element.extract()
+
+    # Extract article or main content if available
+    main_content = soup.find(['article', 'main', 'div', 'section'],
+                             id=list(MAIN_CONTENT_IDS))
+
+    if not main_content:
+        main_content = soup.find(['article', 'main'])
+
+    if not main_content:
+        # Fallback to body if no specific content element found
+        main_content = soup.body
+
+    section_count = 0
+    if main_content:
+        elements = (
+            (element.name, element.text.strip())
+            for element in main_content.find_all(list(CONTENT_TAGS))
+        )
+        for doc in _group_sections(elements, title, metadata):
+            section_count += 1
+            yield doc
+
+    # If no sections were created, create a single document with all text
+    if not section_count:
+        yield _build_full_text_document([soup.get_text(separator='\n\n')], metadata)
@@ -1,18 +1,30 @@
 import os
+import shutil
 import tempfile
 import logging
+import datetime
+import threading
+import subprocess
 from urllib.parse import urlparse, parse_qs
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
+import numpy as np
 from langchain.schema import Document
 import googleapiclient.discovery
 import googleapiclient.errors
 import isodate
-import whisper
-import torch
 import requests
 from dotenv import load_dotenv
 import json
 import time
+from app.utils.db_utils import get_mongodb_client
+from app.utils.transcription_utils import (
+    SAMPLE_RATE,
+    TRANSCRIBE_BACKEND,
+    WHISPER_MODEL_SIZE,
+    iter_silence_windows,
+    transcribe_file,
+    transcribe_windows
+)
 
 # Load environment variables
 load_dotenv()
@@ -20,14 +32,23 @@ load_dotenv()
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Configure whisper model (can be set via env variable)
-WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")  # Options: tiny, base, small, medium, large
-
 # YouTube API settings
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 YOUTUBE_API_SERVICE_NAME = "youtube"
 YOUTUBE_API_VERSION = "v3"
 
+# Pipelined transcription: decode the audio stream straight to PCM and transcribe while it downloads
+YOUTUBE_PIPELINED_TRANSCRIPTION = os.getenv("YOUTUBE_PIPELINED_TRANSCRIPTION", "true").lower() == "true"
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+PCM_READ_SECONDS = 10  # Decoded audio handed on per read
+
+# Video cache: metadata and transcripts are stored per video ID in MongoDB
+YOUTUBE_CACHE_ENABLED = os.getenv("YOUTUBE_CACHE_ENABLED", "true").lower() == "true"
+YOUTUBE_INFO_CACHE_HOURS = int(os.getenv("YOUTUBE_INFO_CACHE_HOURS", "24"))  # Metadata (views, likes) goes stale
+
+# Discovery clients are not thread-safe (httplib2), so each loader thread keeps its own
+_youtube_client_local = threading.local()
+
 
 def extract_video_id(youtube_url: str) -> Optional[str]:
     """
@@ -65,11 +86,17 @@ def extract_video_id(youtube_url: str) -> Optional[str]:
 
 def get_youtube_client():
     """
-    Creates and returns a YouTube API client
+    Returns the YouTube API client of the calling thread, building it on first use.
+    The client is reused for later requests on the same thread, so the discovery
+    document is only processed once per loader thread.
 
     Returns:
         Resource: YouTube API client resource
     """
+    youtube = getattr(_youtube_client_local, "client", None)
+    if youtube is not None:
+        return youtube
+
     try:
         if not YOUTUBE_API_KEY:
             logger.error("YouTube API key not found in environment variables")
@@ -81,15 +108,104 @@ def get_youtube_client():
             developerKey=YOUTUBE_API_KEY,
             cache_discovery=False
         )
+        _youtube_client_local.client = youtube
         return youtube
     except Exception as e:
         logger.error(f"Error creating YouTube API client: {str(e)}")
         return None
 
 
+def _get_video_cache_collection():
+    """Returns the MongoDB collection caching video metadata and transcripts"""
+    return get_mongodb_client()["ai_service"]["youtube_videos"]
+
+
+def get_cached_video(video_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Looks up the cache record of a video
+
+    Args:
+        video_id: YouTube video ID
+
+    Returns:
+        Dict: Cache record with "info", "captions" and/or "transcription", or None on a miss
+    """
+    if not YOUTUBE_CACHE_ENABLED:
+        return None
+
+    try:
+        return _get_video_cache_collection().find_one({"video_id": video_id}, {"_id": 0})
+    except Exception as e:
+        logger.warning(f"Could not read video cache for {video_id}: {str(e)}")
+        return None
+
+
+def _update_cached_video(video_id: str, fields: Dict[str, Any]) -> None:
+    """
+    Stores fields in the cache record of a video, creating the record if needed
+
+    Args:
+        video_id: YouTube video ID
+        fields: Top-level fields to set
+    """
+    if not YOUTUBE_CACHE_ENABLED:
+        return
+
+    try:
+        _get_video_cache_collection().update_one(
+            {"video_id": video_id},
+            {"$set": fields, "$setOnInsert": {"created_at": datetime.datetime.utcnow()}},
+            upsert=True
+        )
+    except Exception as e:
+        logger.warning(f"Could not update video cache for {video_id}: {str(e)}")
+
+
+def get_cached_transcription(video_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns a previously stored audio transcription of a video
+
+    Args:
+        video_id: YouTube video ID
+
+    Returns:
+        Dict: Transcription with "text", "segments" and "language", or None on a miss
+    """
+    cached = get_cached_video(video_id)
+    if cached and cached.get("transcription"):
+        logger.info(f"Using cached audio transcription for video {video_id}")
+        return cached["transcription"]
+    return None
+
+
+def cache_transcription(video_id: str, transcription: Dict[str, Any]) -> None:
+    """
+    Stores the audio transcription of a video, keeping the fields used to build
+    documents (segment timestamps and text)
+
+    Args:
+        video_id: YouTube video ID
+        transcription: Whisper-style transcription
+    """
+    _update_cached_video(video_id, {
+        "transcription": {
+            "text": transcription.get("text", ""),
+            "segments": [
+                {"id": segment.get("id"), "start": segment["start"], "end": segment["end"], "text": segment["text"]}
+                for segment in transcription.get("segments", [])
+            ],
+            "language": transcription.get("language"),
+            "backend": TRANSCRIBE_BACKEND,
+            "model": WHISPER_MODEL_SIZE,
+            "created_at": datetime.datetime.utcnow()
+        }
+    })
+
+
 def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
     """
-    Retrieves metadata information about a YouTube video using the Data API
+    Retrieves metadata information about a YouTube video using the Data API.
+    Metadata cached within the last YOUTUBE_INFO_CACHE_HOURS is returned without an API call.
 
     Args:
         video_id: YouTube video ID
@@ -97,6 +213,13 @@ def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dict: Dictionary containing video metadata or None if retrieval fails
     """
+    cached = get_cached_video(video_id)
+    if cached and cached.get("info") and cached.get("info_updated_at"):
+        age = datetime.datetime.utcnow() - cached["info_updated_at"]
+        if age < datetime.timedelta(hours=YOUTUBE_INFO_CACHE_HOURS):
+            logger.info(f"Using cached metadata for video {video_id}")
+            return cached["info"]
+
     try:
         youtube = get_youtube_client()
         if not youtube:
@@ -139,6 +262,7 @@ def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
         }
 
         logger.info(f"Successfully retrieved metadata for video: {video_info['title']}")
+        _update_cached_video(video_id, {"info": video_info, "info_updated_at": datetime.datetime.utcnow()})
         return video_info
 
     except googleapiclient.errors.HttpError as e:
@@ -152,7 +276,8 @@ def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
 
 def get_video_transcript(video_id: str) -> Optional[str]:
     """
-    Attempts to get transcript using YouTube Transcript API
+    Attempts to get transcript using YouTube Transcript API. Fetched captions are
+    cached with their timestamps and served from the cache afterwards.
 
     Args:
         video_id: YouTube video ID
@@ -160,6 +285,11 @@ def get_video_transcript(video_id: str) -> Optional[str]:
     Returns:
         str: Transcript text or None if not available
     """
+    cached = get_cached_video(video_id)
+    if cached and cached.get("captions"):
+        logger.info(f"Using cached transcript for video {video_id}")
+        return cached["captions"]["text"]
+
     try:
         from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 
@@ -174,6 +304,21 @@ def get_video_transcript(video_id: str) -> Optional[str]:
                 if 'text' in chunk:
                     full_transcript += chunk['text'] + " "
 
+            _update_cached_video(video_id, {
+                "captions": {
+                    "text": full_transcript.strip(),
+                    "segments": [
+                        {
+                            "start": chunk.get("start", 0.0),
+                            "end": chunk.get("start", 0.0) + chunk.get("duration", 0.0),
+                            "text": chunk["text"]
+                        }
+                        for chunk in transcript_list if 'text' in chunk
+                    ],
+                    "fetched_at": datetime.datetime.utcnow()
+                }
+            })
+
             return full_transcript.strip()
         except (TranscriptsDisabled, NoTranscriptFound):
             logger.warning(f"No transcript available for video {video_id}")
@@ -287,7 +432,9 @@ def download_audio(video_id: str) -> Optional[str]:
 
 def transcribe_audio(audio_path: str) -> Optional[Dict[str, Any]]:
     """
-    Transcribes the audio file using Whisper
+    Transcribes the audio file using warm Whisper models of the configured backend
+    (TRANSCRIBE_BACKEND: openai-whisper or int8 faster-whisper). Long audio is split on
+    silence and transcribed in parallel, with absolute segment timestamps.
 
     Args:
         audio_path: Path to the audio file
@@ -296,18 +443,14 @@ def transcribe_audio(audio_path: str) -> Optional[Dict[str, Any]]:
         Dict: Dictionary containing the transcription or None if transcription fails
     """
     try:
-        # Load the Whisper model
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        model = whisper.load_model(WHISPER_MODEL_SIZE, device=device)
-
-        # Transcribe the audio
-        result = model.transcribe(audio_path)
+        result = transcribe_file(audio_path)
 
         # Clean up the audio file
         os.remove(audio_path)
         os.rmdir(os.path.dirname(audio_path))
 
-        logger.info(f"Successfully transcribed audio file: {audio_path}")
+        logger.info(f"Successfully transcribed audio file: {audio_path} "
+                    f"({TRANSCRIBE_BACKEND}, model '{WHISPER_MODEL_SIZE}')")
         return result
 
     except Exception as e:
@@ -322,6 +465,101 @@ def transcribe_audio(audio_path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def stream_audio_pcm(video_id: str) -> Iterator[np.ndarray]:
+    """
+    Streams the native audio track of a YouTube video decoded to 16 kHz mono float32 PCM.
+    yt-dlp only resolves the stream URL; ffmpeg downloads and decodes it in one pass,
+    so there is no MP3 re-encode and nothing is written to disk.
+
+    Args:
+        video_id: YouTube video ID
+
+    Yields:
+        np.ndarray: Consecutive chunks of samples, available while the download is running
+
+    Raises:
+        RuntimeError: If the stream cannot be resolved or ffmpeg fails
+    """
+    import yt_dlp
+
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'quiet': True,
+        'no_warnings': True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+
+    stream_url = info.get("url")
+    if not stream_url:
+        raise RuntimeError(f"No audio stream URL resolved for video {video_id}")
+
+    command = [FFMPEG_BINARY, "-nostdin", "-loglevel", "error"]
+    http_headers = info.get("http_headers") or {}
+    if http_headers:
+        command += ["-headers", "".join(f"{name}: {value}\r\n" for name, value in http_headers.items())]
+    command += ["-i", stream_url, "-vn", "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    bytes_per_read = PCM_READ_SECONDS * SAMPLE_RATE * 4
+    remainder = b""
+    try:
+        while True:
+            data = process.stdout.read(bytes_per_read)
+            if not data:
+                break
+
+            # Keep whole float32 samples only
+            data = remainder + data
+            usable = len(data) - len(data) % 4
+            remainder = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype=np.float32)
+
+        stderr = process.stderr.read().decode("utf-8", errors="replace").strip()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed decoding audio for {video_id}: {stderr}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def transcribe_audio_stream(video_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Pipelined alternative to download_audio + transcribe_audio: audio windows are cut
+    on silence and transcribed while the rest of the stream is still downloading
+
+    Args:
+        video_id: YouTube video ID
+
+    Returns:
+        Dict: Dictionary containing the transcription or None if transcription fails
+    """
+    if shutil.which(FFMPEG_BINARY) is None:
+        logger.warning(f"{FFMPEG_BINARY} not found, pipelined transcription unavailable")
+        return None
+
+    try:
+        result = transcribe_windows(iter_silence_windows(stream_audio_pcm(video_id)))
+        if not result.get("segments") and not result.get("text", "").strip():
+            logger.warning(f"Pipelined transcription of {video_id} produced no text")
+            return None
+
+        logger.info(f"Successfully transcribed audio stream of video ID: {video_id} "
+                    f"({TRANSCRIBE_BACKEND}, model '{WHISPER_MODEL_SIZE}')")
+        return result
+
+    except ImportError:
+        logger.warning("yt-dlp not installed, pipelined transcription unavailable")
+        return None
+    except Exception as e:
+        logger.error(f"Pipelined transcription failed for {video_id}: {str(e)}")
+        return None
+
+
 def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
     """
     Processes a YouTube video: gets metadata and transcript,
@@ -333,6 +571,20 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
     Returns:
         List[Document]: List of Document objects or None if processing fails
     """
+    return list(iter_youtube_content(youtube_url))
+
+
+def iter_youtube_content(youtube_url: str) -> Iterator[Document]:
+    """
+    Streaming variant of load_youtube_content: yields each transcript segment
+    Document as soon as it is built. Problems are reported as error Documents.
+
+    Args:
+        youtube_url: YouTube URL in any standard format
+
+    Yields:
+        Document: Transcript segments, followed by the video description
+    """
     try:
         # Extract video ID
         video_id = extract_video_id(youtube_url)
@@ -348,7 +600,8 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                     "type": "youtube_error"
                 }
             )
-            return [doc]
+            yield doc
+            return
 
         # Get video metadata
         video_info = get_video_info(video_id)
@@ -365,10 +618,14 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                     "type": "youtube_error"
                 }
             )
-            return [doc]
+            yield doc
+            return
+
+        # A stored audio transcription makes the caption lookup and download unnecessary
+        cached_transcription = get_cached_transcription(video_id)
 
         # Try to get transcript from YouTube API
-        transcript = get_video_transcript(video_id)
+        transcript = None if cached_transcription else get_video_transcript(video_id)
 
         # If transcript is available, use it directly
         if transcript:
@@ -376,7 +633,7 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
 
             # Create Document objects from transcript
             # For longer transcripts, split into approximately 10-minute segments
-            documents = []
+            document_count = 0
             transcript_length = len(transcript)
 
             # Simple splitting by character count as a rough approximation
@@ -404,7 +661,8 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                             "type": "youtube_transcript"
                         }
                     )
-                    documents.append(doc)
+                    document_count += 1
+                    yield doc
             else:
                 # Short transcript, use it as is
                 doc = Document(
@@ -416,7 +674,8 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                         "type": "youtube_transcript"
                     }
                 )
-                documents.append(doc)
+                document_count += 1
+                yield doc
 
             # Add the video description as an additional document
             if video_info["description"] and len(video_info["description"]) > 100:
@@ -429,18 +688,24 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                         "type": "youtube_description"
                     }
                 )
-                documents.append(doc)
+                document_count += 1
+                yield doc
 
             logger.info(
-                f"Successfully processed YouTube video using transcript: {video_info['title']} into {len(documents)} document chunks")
-            return documents
+                f"Successfully processed YouTube video using transcript: {video_info['title']} into {document_count} document chunks")
+            return
 
         # No transcript available, try downloading and transcribing audio
-        logger.info(f"No transcript available for {video_id}, attempting to download and transcribe audio")
+        if not cached_transcription:
+            logger.info(f"No transcript available for {video_id}, attempting to download and transcribe audio")
 
-        # Download the audio
-        audio_path = download_audio(video_id)
-        if not audio_path:
+        transcription = cached_transcription
+        if not transcription and YOUTUBE_PIPELINED_TRANSCRIPTION:
+            transcription = transcribe_audio_stream(video_id)
+
+        # Otherwise download the audio file
+        audio_path = None if transcription else download_audio(video_id)
+        if not transcription and not audio_path:
             logger.error(f"Failed to download audio for {video_id}")
 
             # Create a fallback document with just the metadata
@@ -459,10 +724,12 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                     "type": "youtube_metadata_only"
                 }
             )
-            return [doc]
+            yield doc
+            return
 
         # Transcribe the audio
-        transcription = transcribe_audio(audio_path)
+        if not transcription:
+            transcription = transcribe_audio(audio_path)
         if not transcription:
             logger.error(f"Failed to transcribe audio for {video_id}")
 
@@ -482,12 +749,17 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                     "type": "youtube_metadata_only"
                 }
             )
-            return [doc]
+            yield doc
+            return
+
+        # Store new transcriptions so the next request for this video skips the audio
+        if transcription is not cached_transcription:
+            cache_transcription(video_id, transcription)
 
         # Create Document objects
         # We'll split the transcription into approximately 10-minute segments
         # based on the timestamps provided by Whisper
-        documents = []
+        document_count = 0
 
         # If transcription has segments, use them for better chunking
         if "segments" in transcription:
@@ -516,7 +788,8 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                                 "type": "youtube_transcript"
                             }
                         )
-                        documents.append(doc)
+                        document_count += 1
+                        yield doc
 
                     # Start a new chunk
                     current_chunk = segment_text
@@ -539,7 +812,8 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                         "type": "youtube_transcript"
                     }
                 )
-                documents.append(doc)
+                document_count += 1
+                yield doc
         else:
             # If no segments, use the full text
             doc = Document(
@@ -551,7 +825,8 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                     "type": "youtube_transcript"
                 }
             )
-            documents.append(doc)
+            document_count += 1
+            yield doc
 
         # Add the video description as an additional document
         if video_info["description"] and len(video_info["description"]) > 100:
@@ -564,11 +839,11 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                     "type": "youtube_description"
                 }
             )
-            documents.append(doc)
+            document_count += 1
+            yield doc
 
         logger.info(
-            f"Successfully processed YouTube video: {video_info['title']} into {len(documents)} document chunks")
-        return documents
+            f"Successfully processed YouTube video: {video_info['title']} into {document_count} document chunks")
 
     except Exception as e:
         logger.error(f"Error processing YouTube video {youtube_url}: {str(e)}")
@@ -581,7 +856,7 @@ def load_youtube_content(youtube_url: str) -> Optional[List[Document]]:
                 "type": "youtube_error"
             }
         )
-        return [doc]
+        yield doc
 
 
 def is_youtube_url(url: str) -> bool:
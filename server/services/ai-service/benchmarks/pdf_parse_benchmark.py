@@ -0,0 +1,167 @@
+"""
+Compares the temporary-file PDF parsing path against the in-memory parser in pdf_utils.
+
+Each mode runs in a fresh process so peak RSS is measured independently.
+
+Usage (from the ai-service directory):
+    python benchmarks/pdf_parse_benchmark.py --pages 300
+    python benchmarks/pdf_parse_benchmark.py --pdf /path/to/textbook.pdf --repeat 5
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+# Make the app package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_sample_pdf(page_count: int, lines_per_page: int = 45) -> bytes:
+    """
+    Builds a text-only PDF with the given number of pages
+
+    Args:
+        page_count: Number of pages to generate
+        lines_per_page: Lines of text on each page
+
+    Returns:
+        bytes: Raw PDF bytes
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+
+    for page_index in range(page_count):
+        lines = [b"BT /F1 10 Tf 50 780 Td 12 TL"]
+        for line_index in range(lines_per_page):
+            text = f"Page {page_index + 1} line {line_index + 1}: the quick brown fox jumps over the lazy dog."
+            lines.append(b"(" + text.encode("latin-1") + b") Tj T*")
+        lines.append(b"ET")
+        stream = b"\n".join(lines)
+
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % page_count
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for object_number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % object_number + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+def parse_with_tempfile(data: bytes):
+    """Previous path: stage the bytes in a temporary file and load it with PyPDFLoader"""
+    from langchain_community.document_loaders import PyPDFLoader
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+        temp_path = temp_file.name
+        temp_file.write(data)
+    try:
+        return PyPDFLoader(temp_path).load()
+    finally:
+        os.unlink(temp_path)
+
+
+def parse_in_memory(data: bytes):
+    """Current path: parse the bytes straight from memory"""
+    from app.utils.pdf_utils import _parse_pdf_bytes
+
+    return _parse_pdf_bytes(data)
+
+
+MODES = {
+    "tempfile": parse_with_tempfile,
+    "memory": parse_in_memory,
+}
+
+
+def run_mode(mode: str, pdf_path: str, repeat: int, results):
+    """Runs one parsing mode in the current (fresh) process and reports its stats"""
+    parse = MODES[mode]
+
+    # Warm up on a one-page PDF so module imports are not counted
+    parse(build_sample_pdf(1))
+
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    page_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        documents = parse(data)
+        timings.append(time.perf_counter() - start)
+        page_count = len(documents)
+
+    results[mode] = {
+        "pages": page_count,
+        "best_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "rss_growth_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before_kb) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark temp-file vs in-memory PDF parsing")
+    parser.add_argument("--pdf", help="PDF to parse (a synthetic PDF is generated if omitted)")
+    parser.add_argument("--pages", type=int, default=300, help="Pages in the synthetic PDF")
+    parser.add_argument("--repeat", type=int, default=3, help="Parses per mode")
+    args = parser.parse_args()
+
+    pdf_path = args.pdf
+    generated = False
+    if not pdf_path:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+            temp_file.write(build_sample_pdf(args.pages))
+            pdf_path = temp_file.name
+            generated = True
+
+    try:
+        size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+        print(f"PDF: {pdf_path} ({size_mb:.1f} MB), {args.repeat} parses per mode")
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Manager().dict()
+        for mode in MODES:
+            process = context.Process(target=run_mode, args=(mode, pdf_path, args.repeat, results))
+            process.start()
+            process.join()
+
+        print(f"{'mode':<10}{'pages':>8}{'best (s)':>12}{'mean (s)':>12}{'peak RSS (MB)':>16}{'RSS growth (MB)':>18}")
+        for mode in MODES:
+            stats = results.get(mode)
+            if not stats:
+                print(f"{mode:<10}  failed, see output above")
+                continue
+            print(f"{mode:<10}{stats['pages']:>8}{stats['best_s']:>12.3f}{stats['mean_s']:>12.3f}"
+                  f"{stats['peak_rss_mb']:>16.1f}{stats['rss_growth_mb']:>18.1f}")
+    finally:
+        if generated:
+            os.unlink(pdf_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Measures the real-time factor (processing time / audio duration) of the transcription
+backends in transcription_utils for each Whisper model size.
+
+An RTF below 1.0 means audio is transcribed faster than it plays. Use a real speech
+recording (--audio) for meaningful numbers: decoding time depends on how much speech
+there is. Without one, a synthetic tone is generated, which only measures the encoder
+and model overhead.
+
+Usage (from the ai-service directory):
+    python benchmarks/transcribe_rtf_benchmark.py --audio talk.mp3
+    python benchmarks/transcribe_rtf_benchmark.py --audio talk.mp3 --models tiny,base,small \\
+        --backends whisper,faster-whisper --seconds 120 --repeat 2
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Make the app package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.transcription_utils import SAMPLE_RATE, TRANSCRIBE_BACKENDS, load_transcription_model
+
+
+def load_sample(audio_path: str, seconds: int) -> np.ndarray:
+    """
+    Decodes the benchmark audio to 16 kHz mono float32, or synthesizes a tone
+
+    Args:
+        audio_path: Audio file to decode (None for a synthetic tone)
+        seconds: Maximum audio length to keep
+
+    Returns:
+        np.ndarray: Audio samples
+    """
+    if not audio_path:
+        t = np.arange(seconds * SAMPLE_RATE, dtype=np.float32) / SAMPLE_RATE
+        return (0.1 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0)).astype(np.float32)
+
+    try:
+        from faster_whisper import decode_audio
+        audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+    except ImportError:
+        import whisper
+        audio = whisper.load_audio(audio_path)
+    return audio[:seconds * SAMPLE_RATE]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcription real-time factor per backend and model size")
+    parser.add_argument("--audio", help="Speech recording to transcribe (a synthetic tone is used if omitted)")
+    parser.add_argument("--seconds", type=int, default=60, help="Audio length to transcribe, in seconds")
+    parser.add_argument("--models", default="tiny,base,small", help="Comma-separated Whisper model sizes")
+    parser.add_argument("--backends", default=",".join(TRANSCRIBE_BACKENDS), help="Comma-separated backends")
+    parser.add_argument("--threads", type=int, default=0, help="CPU threads per model (0 uses the engine default)")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per model (best is reported)")
+    args = parser.parse_args()
+
+    audio = load_sample(args.audio, args.seconds)
+    duration = len(audio) / SAMPLE_RATE
+    print(f"Audio: {duration:.1f}s ({'synthetic tone' if not args.audio else args.audio}), "
+          f"{os.cpu_count()} CPUs, {args.repeat} timed run(s) per model")
+
+    if args.threads:
+        try:
+            import torch
+            torch.set_num_threads(args.threads)
+        except ImportError:
+            pass
+
+    print(f"{'backend':<16}{'model':<10}{'load (s)':>10}{'best (s)':>10}{'RTF':>8}{'segments':>10}")
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        for model_size in [m.strip() for m in args.models.split(",") if m.strip()]:
+            try:
+                start = time.perf_counter()
+                model = load_transcription_model(model_size, backend, args.threads)
+                load_seconds = time.perf_counter() - start
+            except ImportError as e:
+                print(f"{backend:<16}{model_size:<10}  not installed ({e.name})")
+                break
+            except Exception as e:
+                print(f"{backend:<16}{model_size:<10}  failed to load: {str(e)}")
+                continue
+
+            # Warm up on a short slice so one-time initialization is not counted
+            model.transcribe(audio[:5 * SAMPLE_RATE])
+
+            timings = []
+            segment_count = 0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = model.transcribe(audio)
+                timings.append(time.perf_counter() - start)
+                segment_count = len(result.get("segments", []))
+
+            best = min(timings)
+            print(f"{backend:<16}{model_size:<10}{load_seconds:>10.1f}{best:>10.1f}{best / duration:>8.3f}{segment_count:>10}")
+            del model
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Compares the previous html.parser webpage extraction against the lxml extractor in webpage_utils.
+
+Pages are read from a directory of saved HTML files (--corpus). Without one, a synthetic
+corpus of documentation-style pages (navigation, sidebars, scripts and long articles)
+is generated. Throughput is reported in pages per second.
+
+Usage (from the ai-service directory):
+    python benchmarks/webpage_extract_benchmark.py
+    python benchmarks/webpage_extract_benchmark.py --corpus /path/to/saved/pages --repeat 5
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+# Make the app package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = (
+    "data model query index cache request response thread process memory latency throughput "
+    "function class module package install configure deploy server client network protocol"
+).split()
+
+
+def build_sample_page(section_count: int, paragraphs_per_section: int = 6, seed: int = 0) -> str:
+    """
+    Builds a documentation-style HTML page with boilerplate around the article
+
+    Args:
+        section_count: Number of headed sections in the article
+        paragraphs_per_section: Paragraphs (and one list) per section
+        seed: Random seed for the generated text
+
+    Returns:
+        str: HTML of the page
+    """
+    rng = random.Random(seed)
+
+    def sentence(words: int = 18) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    parts = [
+        "<!DOCTYPE html><html><head><title>Reference guide</title>",
+        '<meta name="description" content="Generated reference page">',
+        "<style>body { font-family: sans-serif; }</style>",
+        "<script>window.analytics = {};</script></head><body>",
+        "<nav><ul>" + "".join(f'<li><a href="#s{i}">Section {i}</a></li>' for i in range(section_count)) + "</ul></nav>",
+        '<aside><p>Related pages and advertisements.</p></aside>',
+        '<div id="content"><article>',
+    ]
+    for section_index in range(section_count):
+        parts.append(f'<h2 id="s{section_index}">Section {section_index + 1}</h2>')
+        for _ in range(paragraphs_per_section):
+            parts.append(f"<p>{' '.join(sentence() for _ in range(4))}</p>")
+        parts.append("<ul>" + "".join(f"<li>{sentence(8)}</li>" for _ in range(5)) + "</ul>")
+        parts.append(f"<pre>{sentence(12)}</pre>")
+    parts.append("</article></div><footer><p>Copyright</p></footer>")
+    parts.append("<script>" + "var x = 1;" * 200 + "</script></body></html>")
+    return "".join(parts)
+
+
+def extract_legacy(html: str):
+    """Previous implementation: html.parser, full find_all walk and string concatenation"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.title.text.strip() if soup.title else "Untitled Page"
+    for script in soup(["script", "style", "iframe", "nav", "footer", "aside"]):
+        script.extract()
+
+    main_content = soup.find(['article', 'main', 'div', 'section'], id=['content', 'main', 'article', 'post'])
+    if not main_content:
+        main_content = soup.find(['article', 'main'])
+    if not main_content:
+        main_content = soup.body
+
+    sections = []
+    current_section = {"heading": title, "content": ""}
+    for element in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'blockquote', 'pre']):
+        if element.name.startswith('h') and len(element.text.strip()) > 0:
+            if current_section["content"].strip():
+                sections.append(current_section)
+            current_section = {"heading": element.text.strip(), "content": ""}
+        elif element.name in ['p', 'ul', 'ol', 'blockquote', 'pre'] and len(element.text.strip()) > 0:
+            current_section["content"] += element.text.strip() + "\n\n"
+    if current_section["content"].strip():
+        sections.append(current_section)
+    return [section for section in sections if len(section["content"]) >= 50]
+
+
+def extract_bs4(html: str):
+    """Current html.parser fallback (used when lxml is not installed)"""
+    from app.utils.webpage_utils import _iter_html_sections_bs4
+
+    return list(_iter_html_sections_bs4(html, "benchmark"))
+
+
+def extract_lxml(html: str):
+    """Current lxml extractor"""
+    from app.utils.webpage_utils import _iter_html_sections_lxml
+
+    return list(_iter_html_sections_lxml(html, "benchmark"))
+
+
+MODES = {
+    "legacy": extract_legacy,
+    "bs4": extract_bs4,
+    "lxml": extract_lxml,
+}
+
+
+def load_corpus(corpus_dir: str):
+    """Reads every .html/.htm file in a directory"""
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.lower().endswith((".html", ".htm")):
+            with open(os.path.join(corpus_dir, name), encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark webpage main-content extraction")
+    parser.add_argument("--corpus", help="Directory of saved HTML pages (a synthetic corpus is generated if omitted)")
+    parser.add_argument("--pages", type=int, default=20, help="Pages in the synthetic corpus")
+    parser.add_argument("--sections", type=int, default=60, help="Sections per synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per mode")
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        pages = [build_sample_page(args.sections, seed=seed) for seed in range(args.pages)]
+    if not pages:
+        print("No pages to benchmark")
+        return
+
+    size_mb = sum(len(page) for page in pages) / (1024 * 1024)
+    print(f"Corpus: {len(pages)} pages ({size_mb:.1f} MB), {args.repeat} passes per mode")
+
+    print(f"{'mode':<10}{'sections':>10}{'best (s)':>12}{'pages/sec':>12}")
+    for mode, extract in MODES.items():
+        # Warm up so module imports are not counted
+        extract(pages[0])
+
+        timings = []
+        section_count = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            section_count = sum(len(extract(page)) for page in pages)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print(f"{mode:<10}{section_count:>10}{best:>12.3f}{len(pages) / best:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import pytest
+
+from app.utils.content_loader import classify_content, POWERPOINT_MIME_TYPE
+
+
+@pytest.mark.parametrize("head, mime_type, url, expected", [
+    # Leading bytes decide, whatever the server claims
+    (b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n", "application/octet-stream", "", "pdf"),
+    (b"\r\n" * 100 + b"%PDF-1.4\n", None, "", "pdf"),  # Header within the first kilobyte
+    (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "text/html", "", "image"),
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", None, "", "image"),
+    (b"GIF89a\x01\x00\x01\x00", None, "", "image"),
+    (b"RIFF\x24\x00\x00\x00WEBPVP8 ", None, "", "image"),
+    (b"\xef\xbb\xbf  <!DOCTYPE html><html><head>", None, "", "webpage"),
+    (b"<html lang='en'><body>", "text/plain", "", "webpage"),
+])
+def test_classifies_by_signature(head, mime_type, url, expected):
+    assert classify_content(head, mime_type, url) == expected
+
+
+@pytest.mark.parametrize("head, mime_type, url, expected", [
+    (b"PK\x03\x04\x14\x00\x06\x00[Content_Types].xml...ppt/slides/slide1.xml", None, "", "powerpoint"),
+    (b"PK\x03\x04\x14\x00\x06\x00[Content_Types].xml", POWERPOINT_MIME_TYPE, "", "powerpoint"),
+    (b"PK\x03\x04\x14\x00\x00\x00page1.jpg", "application/zip", "https://host/notes/week1.zip", "image"),
+    (b"PK\x03\x04\x14\x00\x00\x00word/document.xml", "application/zip", "https://host/report.docx", None),
+])
+def test_classifies_zip_archives(head, mime_type, url, expected):
+    assert classify_content(head, mime_type, url) == expected
+
+
+@pytest.mark.parametrize("mime_type, expected", [
+    ("application/pdf", "pdf"),
+    ("text/html; charset=utf-8", "webpage"),
+    ("image/png", "image"),
+    ("image/svg+xml", None),  # Vector images have no pixels to OCR
+    ("application/octet-stream", None),
+    (None, None),
+])
+def test_falls_back_to_mime_type(mime_type, expected):
+    assert classify_content(b"\x00\x01\x02\x03 unrecognized", mime_type) == expected
+
+
+def test_empty_content_is_inconclusive():
+    assert classify_content(b"") is None
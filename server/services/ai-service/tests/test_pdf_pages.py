@@ -0,0 +1,47 @@
+import pytest
+
+from app.utils import pdf_utils
+from benchmarks.pdf_parse_benchmark import build_sample_pdf, parse_with_tempfile
+
+
+def without_source(metadata):
+    return {key: value for key, value in metadata.items() if key != "source"}
+
+
+def test_pages_match_pypdfloader():
+    data = build_sample_pdf(6, lines_per_page=5)
+
+    documents = list(pdf_utils.iter_pdf_pages(data))
+    expected = parse_with_tempfile(data)
+
+    assert [document.page_content for document in documents] == [document.page_content for document in expected]
+    assert [document.metadata for document in documents] == [without_source(document.metadata) for document in expected]
+
+
+def test_pages_are_yielded_in_order_with_labels():
+    documents = list(pdf_utils.iter_pdf_pages(build_sample_pdf(4, lines_per_page=2)))
+
+    assert [document.metadata["page"] for document in documents] == [0, 1, 2, 3]
+    assert [document.metadata["page_label"] for document in documents] == ["1", "2", "3", "4"]
+    assert all(document.metadata["total_pages"] == 4 for document in documents)
+    assert documents[2].page_content.startswith("Page 3 line 1")
+
+
+def test_parallel_extraction_keeps_page_order(monkeypatch):
+    data = build_sample_pdf(30, lines_per_page=2)
+    sequential = list(pdf_utils.iter_pdf_pages(data))
+
+    monkeypatch.setattr(pdf_utils, "PDF_PARALLEL_PAGE_THRESHOLD", 10)
+    monkeypatch.setattr(pdf_utils, "PDF_EXTRACT_WORKERS", 3)
+    monkeypatch.setattr(pdf_utils, "PDF_MIN_PAGES_PER_SHARD", 5)
+    parallel = list(pdf_utils.iter_pdf_pages(data))
+
+    assert [document.page_content for document in parallel] == [document.page_content for document in sequential]
+    assert [document.metadata for document in parallel] == [document.metadata for document in sequential]
+
+
+@pytest.mark.parametrize("page_count", [1, 3])
+def test_parse_pdf_bytes_returns_one_document_per_page(page_count):
+    documents = pdf_utils._parse_pdf_bytes(build_sample_pdf(page_count, lines_per_page=1))
+
+    assert len(documents) == page_count
@@ -0,0 +1,193 @@
+import pytest
+from langchain.schema import Document
+
+from app.models.summary import SummaryStrategy
+from app.services import summarize_service
+from app.utils import content_loader, handwritten_utils
+from app.utils.content_cache import compute_content_hash
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeCollection:
+    """The few pymongo collection methods summarize_content uses"""
+
+    def __init__(self):
+        self.documents = []
+
+    def find_one(self, query):
+        return next((document for document in self.documents
+                     if all(document.get(key) == value for key, value in query.items())), None)
+
+    def insert_one(self, document):
+        document["_id"] = f"id-{len(self.documents)}"
+        self.documents.append(document)
+        return type("InsertOneResult", (), {"inserted_id": document["_id"]})()
+
+    def update_one(self, query, update):
+        pass
+
+
+@pytest.fixture
+def blob_hashes(monkeypatch):
+    """Serves blob Content-MD5s from a dict instead of Azure"""
+    hashes = {}
+    monkeypatch.setattr(content_loader, "resolve_blob_client",
+                        lambda url, connection_string, container_name: (url, url))
+    monkeypatch.setattr(content_loader, "get_blob_content_hash", lambda blob_client: hashes.get(blob_client))
+    return hashes
+
+
+def test_youtube_content_is_identified_by_video_id():
+    assert content_loader.get_content_identity("https://youtu.be/abc123", "youtube") == "youtube:abc123"
+    assert content_loader.get_content_identity("https://www.youtube.com/watch?v=abc123", "youtube") == "youtube:abc123"
+
+
+def test_blob_is_identified_by_content_md5(blob_hashes):
+    blob_hashes["lecture.pdf"] = "5d41402abc4b2a76b9719d911017c592"
+
+    assert content_loader.get_content_identity("lecture.pdf", "pdf") == "5d41402abc4b2a76b9719d911017c592"
+    assert content_loader.get_content_identity("unhashed.pdf", "pdf") is None
+
+
+def test_http_file_is_identified_by_strong_etag_only(monkeypatch):
+    etags = {"https://host/strong.pdf": '"v1"', "https://host/weak.pdf": 'W/"v1"', "https://host/none.pdf": None}
+    monkeypatch.setattr(content_loader, "http_get_prefix",
+                        lambda url, length, headers=None, timeout=None: FakeResponse({"ETag": etags[url]}))
+
+    strong = content_loader.get_content_identity("https://host/strong.pdf", "pdf")
+    assert strong.startswith("etag:")
+    assert content_loader.get_content_identity("https://host/weak.pdf", "pdf") is None
+    assert content_loader.get_content_identity("https://host/none.pdf", "pdf") is None
+
+
+def test_webpages_are_not_identified():
+    assert content_loader.get_content_identity("https://host/article", "webpage") is None
+
+
+def test_bundle_identity_matches_the_loaded_bundle_hash(monkeypatch, blob_hashes):
+    pages = {"notes/page1.jpg": b"first page", "notes/page2.jpg": b"second page"}
+    for name, data in pages.items():
+        blob_hashes[name] = compute_content_hash(data)
+    monkeypatch.setattr(handwritten_utils, "_recognize_pages", lambda images: ["text"] * len(images))
+
+    identity = content_loader.get_content_identity("notes", "image", pages=list(pages))
+    documents = handwritten_utils._build_page_documents(list(pages.items()), "notes")
+
+    assert identity == "bundle:" + documents[0].metadata["bundle_hash"]
+
+
+def test_bundle_with_an_unidentified_page_is_not_identified(blob_hashes):
+    blob_hashes["notes/page1.jpg"] = compute_content_hash(b"first page")
+
+    assert content_loader.get_content_identity("notes", "image", pages=["notes/page1.jpg", "notes/page2.jpg"]) is None
+
+
+@pytest.mark.parametrize("metadata, expected", [
+    ({"content_hash": "h1", "type": "pdf"}, True),
+    ({"video_id": "abc", "type": "youtube_transcript"}, True),
+    ({"type": "youtube_error", "error": "No transcript"}, False),
+    ({"type": "youtube_metadata_only", "video_id": "abc"}, False),
+    ({"type": "handwritten_notes", "page": 1, "missing_pages": [2]}, False),
+])
+def test_only_complete_content_is_shareable(metadata, expected):
+    assert summarize_service.is_shareable_content([Document(page_content="text", metadata=metadata)]) is expected
+
+
+def test_no_documents_are_not_shareable():
+    assert summarize_service.is_shareable_content([]) is False
+
+
+def test_cache_key_normalizes_the_prompt():
+    key = summarize_service.build_summary_cache_key("h1", "  Key   Findings ", "medium", "pdf")
+
+    assert key == summarize_service.build_summary_cache_key("h1", "key findings", "medium", "pdf")
+
+
+def test_cache_key_treats_strategy_enum_and_string_alike():
+    assert (summarize_service.build_summary_cache_key("h1", None, "short", "pdf", SummaryStrategy.REFINE)
+            == summarize_service.build_summary_cache_key("h1", None, "short", "pdf", "refine"))
+    assert (summarize_service.build_summary_cache_key("h1", None, "short", "pdf", None)
+            == summarize_service.build_summary_cache_key("h1", None, "short", "pdf", "auto"))
+
+
+@pytest.mark.parametrize("changed", [
+    ("h2", None, "medium", "pdf", None),
+    ("h1", "methods only", "medium", "pdf", None),
+    ("h1", None, "long", "pdf", None),
+    ("h1", None, "medium", "youtube", None),
+    ("h1", None, "medium", "pdf", "map_reduce"),
+])
+def test_cache_key_changes_with_the_request(changed):
+    assert summarize_service.build_summary_cache_key("h1", None, "medium", "pdf", None) \
+        != summarize_service.build_summary_cache_key(*changed)
+
+
+@pytest.fixture
+def summarize_env(monkeypatch):
+    """Runs summarize_content against in-memory collections, a fake LLM and a recorded summary cache"""
+    collections = {"documents": FakeCollection(), "summaries": FakeCollection()}
+    cache = {"lookups": [], "stores": [], "entries": {}, "loads": []}
+
+    def get_cached_summary(cache_key):
+        cache["lookups"].append(cache_key)
+        return cache["entries"].get(cache_key)
+
+    def cache_summary(cache_key, summary_text, title, page_count, processing_stats):
+        cache["stores"].append(cache_key)
+        cache["entries"][cache_key] = {"_id": f"entry-{len(cache['stores'])}", "text": summary_text,
+                                       "title": title, "page_count": page_count, "processing_stats": {}}
+        return cache["entries"][cache_key]["_id"]
+
+    def iter_content(url, content_type, pages=None):
+        cache["loads"].append(url)
+        # Every page carries its own hash, as bundle pages do
+        for index in range(3):
+            yield Document(page_content=f"Page {index} " * 40, metadata={"content_hash": f"page-hash-{index}"})
+
+    class FakeChain:
+        async def ainvoke(self, inputs):
+            return {"output_text": "summary " * 600}
+
+    class FakeLLM:
+        def predict(self, prompt):
+            return "summary " * 600
+
+    monkeypatch.setattr(summarize_service, "get_mongodb_client", lambda: {"ai_service": collections})
+    monkeypatch.setattr(summarize_service, "get_cached_summary", get_cached_summary)
+    monkeypatch.setattr(summarize_service, "cache_summary", cache_summary)
+    monkeypatch.setattr(summarize_service, "get_content_identity", lambda url, content_type, pages=None: f"md5:{url}")
+    monkeypatch.setattr(summarize_service, "iter_content", iter_content)
+    monkeypatch.setattr(summarize_service, "build_summarize_chain", lambda *args: FakeChain())
+    monkeypatch.setattr(summarize_service, "ChatOpenAI", lambda **kwargs: FakeLLM())
+    return collections, cache
+
+
+def test_summary_is_stored_under_the_key_it_is_looked_up_with(summarize_env):
+    collections, cache = summarize_env
+
+    first = summarize_service.summarize_content("notes.pdf", "alice", content_type="pdf")
+    second = summarize_service.summarize_content("notes.pdf", "bob", content_type="pdf")
+
+    assert first["status"] == second["status"] == "success"
+    assert cache["stores"] == [cache["lookups"][0]]
+    assert cache["lookups"][1] == cache["lookups"][0]
+    assert second["summary"] == first["summary"]
+    assert cache["loads"] == ["notes.pdf"]  # The hit did not load the content again
+
+
+def test_summary_records_point_at_the_shared_entry(summarize_env):
+    collections, cache = summarize_env
+
+    summarize_service.summarize_content("notes.pdf", "alice", content_type="pdf")
+    summarize_service.summarize_content("notes.pdf", "bob", content_type="pdf")
+
+    records = collections["summaries"].documents
+    assert [record["summary_cache_id"] for record in records] == ["entry-1", "entry-1"]
+    assert all("text" not in record for record in records)